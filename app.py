@@ -6,6 +6,9 @@ from datetime import datetime
 import os
 import re
 import sys
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration de la page
 st.set_page_config(
@@ -435,6 +438,12 @@ def render_error(content):
     """Affiche une error box"""
     st.markdown(f'<div class="error-box">{content}</div>', unsafe_allow_html=True)
 
+def categories_configurees():
+    """Catégories déclarées dans config/regles_extraction.json ({clé: {nom, url, type_col}})"""
+    sys.path.append(os.path.dirname(__file__))
+    from regles_extraction import charger_categories
+    return charger_categories()
+
 # ============================================================================
 # PAGE 1: ACCUEIL
 # ============================================================================
@@ -476,27 +485,26 @@ def page_accueil():
     
     render_section("Données disponibles")
     
-    categories_info = {
-        'Vêtements Homme': 'vetements_homme',
-        'Chaussures Homme': 'chaussures_homme',
-        'Vêtements Enfants': 'vetements_enfants',
-        'Chaussures Enfants': 'chaussures_enfants'
-    }
+    categories_info = {config['nom']: cle for cle, config in categories_configurees().items()}
     
-    cols = st.columns(4)
+    cols = st.columns(len(categories_info))
+    
+    # Nombres de lignes lus dans le manifeste, sans ouvrir les CSV
+    sys.path.append(os.path.dirname(__file__))
+    import manifeste
     
     for idx, (nom, fichier_base) in enumerate(categories_info.items()):
         with cols[idx]:
             fichier = f"data/nettoye/{fichier_base}_nettoye.csv"
             
-            if os.path.exists(fichier):
-                try:
-                    df = pd.read_csv(fichier)
-                    st.metric(nom, f"{len(df)}", "Disponible")
-                except:
-                    st.metric(nom, "0", "Erreur")
-            else:
-                st.metric(nom, "0", "Pas de données")
+            try:
+                entree = manifeste.entree_a_jour(fichier_base, fichier)
+                if entree:
+                    st.metric(nom, f"{entree['lignes']}", "Disponible")
+                else:
+                    st.metric(nom, "0", "Pas de données")
+            except:
+                st.metric(nom, "0", "Erreur")
     
     st.markdown("<br><br>", unsafe_allow_html=True)
     
@@ -548,10 +556,7 @@ def page_scraper():
     
     with col1:
         categories_disponibles = {
-            'Vêtements Homme': ('vetements_homme', 'https://sn.coinafrique.com/categorie/vetements-homme'),
-            'Chaussures Homme': ('chaussures_homme', 'https://sn.coinafrique.com/categorie/chaussures-homme'),
-            'Vêtements Enfants': ('vetements_enfants', 'https://sn.coinafrique.com/categorie/vetements-enfants'),
-            'Chaussures Enfants': ('chaussures_enfants', 'https://sn.coinafrique.com/categorie/chaussures-enfants')
+            config['nom']: (cle, config['url']) for cle, config in categories_configurees().items()
         }
         
         categories_selectionnees = st.multiselect(
@@ -569,6 +574,36 @@ def page_scraper():
                 value=5,
                 step=1
             )
+            
+            utiliser_cache = st.checkbox(
+                "Utiliser le cache HTTP",
+                value=True,
+                help="Revalide les pages déjà téléchargées et réutilise les annonces des pages inchangées"
+            )
+            
+            incremental = st.checkbox(
+                "Mode incrémental",
+                value=False,
+                help="Ne collecte que les nouvelles annonces et s'arrête dès qu'une page ne contient presque que des annonces déjà vues"
+            )
+            
+            archiver = st.checkbox(
+                "Archiver les pages téléchargées",
+                value=False,
+                help="Conserve chaque page (compressée) pour ré-extraire les annonces hors ligne avec rejeu_archive.py"
+            )
+            
+            reprendre = st.checkbox(
+                "Reprendre les scrapings interrompus",
+                value=True,
+                help="Une catégorie interrompue (redémarrage, coupure réseau) reprend à la dernière page enregistrée sans re-télécharger les précédentes"
+            )
+            
+            parsing_parallele = st.checkbox(
+                "Parser sur tous les cœurs",
+                value=False,
+                help="Télécharge, parse (pool de processus) et écrit les pages en parallèle plutôt qu'à tour de rôle"
+            )
 
     # Et modifier le calcul des métriques:
     col1, col2, col3 = st.columns(3)
@@ -595,44 +630,87 @@ def page_scraper():
         try:
             sys.path.append(os.path.dirname(__file__))
             from scraper_coinafrique import CoinAfriqueScraper
+            from cache_http import CacheHTTP
+            from points_reprise import PointsReprise
+            from archive_html import ArchiveHTML
+            from entrepot_parquet import EntrepotParquet, PYARROW_DISPONIBLE
+            from base_annonces import BaseAnnonces
             
-            scraper = CoinAfriqueScraper()
+            scraper = CoinAfriqueScraper(
+                cache=CacheHTTP() if utiliser_cache else None,
+                archive=ArchiveHTML() if archiver else None,
+                workers_parsing=(os.cpu_count() or 1) if parsing_parallele else 0,
+                entrepot=EntrepotParquet() if PYARROW_DISPONIBLE else None,
+                base=BaseAnnonces()
+            )
+            reprise = PointsReprise() if reprendre else None
             total = len(categories_selectionnees)
-            resultats = {}
+            noms_fichiers = {categories_disponibles[nom_cat][0]: nom_cat for nom_cat in categories_selectionnees}
             
-            # Dans la boucle de scraping:
-            for idx, nom_cat in enumerate(categories_selectionnees):
-                nom_fichier, url = categories_disponibles[nom_cat]
-                
-                status_text.info(f"Scraping: {nom_cat} - {max_pages} pages...")
-                progress_bar.progress((idx + 0.5) / total)
+            # Les catégories sont scrapées en parallèle dans des threads de travail :
+            # ils publient leur progression dans une file lue ici, car seul le
+            # thread Streamlit peut mettre à jour la page
+            file_progression = queue.Queue()
+            pages_faites = {nom_fichier: 0 for nom_fichier in noms_fichiers}
+            
+            status_text.info(f"Scraping de {total} catégorie(s) en parallèle - {max_pages} pages...")
+            
+            with ThreadPoolExecutor(max_workers=1) as executeur:
+                future = executeur.submit(
+                    scraper.scraper_toutes_categories,
+                    max_pages,
+                    workers=total,
+                    categories=list(noms_fichiers),
+                    callback_progression=lambda cat, page, max_p: file_progression.put((cat, page)),
+                    incremental=incremental,
+                    reprise=reprise
+                )
                 
-                annonces = scraper.scraper_page(url, max_pages)  # max_pages au lieu de max_annonces
-                            
-                if annonces:
-                    df = pd.DataFrame(annonces)
-                    
-                    if 'vetements' in nom_fichier:
-                        df.rename(columns={'type': 'type_habits'}, inplace=True)
-                        colonnes = ['type_habits', 'prix', 'adresse', 'image_lien']
-                    else:
-                        df.rename(columns={'type': 'type_chaussures'}, inplace=True)
-                        colonnes = ['type_chaussures', 'prix', 'adresse', 'image_lien']
-                    
-                    df = df[colonnes]
-                    
-                    fichier = f"data/nettoye/{nom_fichier}_nettoye.csv"
-                    df.to_csv(fichier, index=False, encoding='utf-8-sig')
-                    
-                    resultats[nom_cat] = df
+                while True:
+                    termine = future.done()
+                    while not file_progression.empty():
+                        nom_fichier, page = file_progression.get()
+                        pages_faites[nom_fichier] = max(pages_faites[nom_fichier], page)
+                    progress_bar.progress(min(1.0, sum(pages_faites.values()) / (total * max_pages)))
+                    if termine:
+                        break
+                    time.sleep(0.2)
                 
-                progress_bar.progress((idx + 1) / total)
+                resultats_bruts = future.result()
+            scraper.fermer()
+            scraper.base.fermer()
+            
+            if reprise:
+                stats_reprise = reprise.get_stats()
+                reprise.fermer()
+                if stats_reprise['pages_reprises']:
+                    render_info(
+                        f"<strong>Reprise:</strong> {stats_reprise['pages_reprises']} pages déjà collectées "
+                        f"lors d'un scraping interrompu n'ont pas été re-téléchargées"
+                    )
+            
+            resultats = {noms_fichiers[nom_fichier]: df for nom_fichier, df in resultats_bruts.items()}
             
             status_text.empty()
             progress_bar.empty()
             
             render_success("Scraping terminé avec succès!")
             
+            for hote, stats_rythme in scraper.limiteurs.get_stats().items():
+                render_info(
+                    f"<strong>Rythme ({hote}):</strong> {stats_rythme['debit_courant']} req/s en fin de scraping, "
+                    f"latence moyenne {stats_rythme['latence_moyenne']} s, {stats_rythme['surcharges']} surcharges (429/5xx/timeout), "
+                    f"{stats_rythme['reessais']} réessais, {stats_rythme['abandons']} pages abandonnées"
+                )
+            
+            if scraper.cache:
+                stats_cache = scraper.cache.get_stats()
+                render_info(
+                    f"<strong>Cache HTTP:</strong> {stats_cache['hits_304'] + stats_cache['hits_empreinte']} pages inchangées, "
+                    f"{stats_cache['misses']} pages nouvelles, {stats_cache['parses_evites']} parsings évités, "
+                    f"{stats_cache['octets_economises'] / 1024:,.0f} Ko économisés"
+                )
+            
             st.markdown("<br>", unsafe_allow_html=True)
             
             if resultats:
@@ -701,10 +779,8 @@ def page_importer():
     render_section("Configuration")
     
     categories_map = {
-        'Vêtements Homme': ('vetements', 'vetements_homme'),
-        'Chaussures Homme': ('chaussures', 'chaussures_homme'),
-        'Vêtements Enfants': ('vetements', 'vetements_enfants'),
-        'Chaussures Enfants': ('chaussures', 'chaussures_enfants')
+        config['nom']: ('vetements' if config['type_col'] == 'type_habits' else 'chaussures', cle)
+        for cle, config in categories_configurees().items()
     }
     
     categorie_selectionnee = st.selectbox(
@@ -722,7 +798,12 @@ def page_importer():
     
     if uploaded_file:
         try:
-            df_brut = pd.read_csv(uploaded_file)
+            sys.path.append(os.path.dirname(__file__))
+            from nettoyage_donnees import NettoyeurDonnees
+            
+            # Le fichier est parcouru par blocs : la mémoire utilisée ne
+            # dépend pas de sa taille
+            resume_brut = NettoyeurDonnees().decrire_csv(uploaded_file)
             
             render_success(f"Fichier chargé: {uploaded_file.name}")
             
@@ -731,13 +812,13 @@ def page_importer():
             render_section("Données brutes")
             
             col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Lignes", len(df_brut))
-            col2.metric("Colonnes", len(df_brut.columns))
-            col3.metric("Doublons", df_brut.duplicated().sum())
-            col4.metric("Valeurs manquantes", df_brut.isnull().sum().sum())
+            col1.metric("Lignes", resume_brut['lignes'])
+            col2.metric("Colonnes", resume_brut['colonnes'])
+            col3.metric("Doublons", resume_brut['doublons'])
+            col4.metric("Valeurs manquantes", resume_brut['valeurs_manquantes'])
             
             with st.expander("Aperçu", expanded=True):
-                st.dataframe(df_brut.head(15), use_container_width=True)
+                st.dataframe(resume_brut['apercu'], use_container_width=True)
             
             st.markdown("<br>", unsafe_allow_html=True)
             
@@ -747,15 +828,44 @@ def page_importer():
             
             if nettoyer_btn:
                 try:
-                    sys.path.append(os.path.dirname(__file__))
-                    from nettoyage_donnees import NettoyeurDonnees
+                    import manifeste
+                    from base_annonces import BaseAnnonces
+                    from entrepot_parquet import EntrepotParquet, PYARROW_DISPONIBLE
+                    from schemas_colonnes import SchemasColonnes
                     
-                    nettoyeur = NettoyeurDonnees()
+                    # Un export de même en-tête qu'un import réussi reprend son mapping
+                    nettoyeur = NettoyeurDonnees(schemas=SchemasColonnes())
                     type_cat, nom_fichier = categories_map[categorie_selectionnee]
+                    type_col = categories_configurees()[nom_fichier]['type_col']
+                    fichier_sortie = f"data/nettoye/{nom_fichier}_nettoye.csv"
+                    
+                    # Chaque bloc nettoyé est écrit dans le CSV, ajouté à la base
+                    # du tableau de bord et préparé pour l'entrepôt Parquet
+                    # (partition du jour), sans que le fichier soit chargé en entier
+                    base = BaseAnnonces()
+                    puits = EntrepotParquet().puits(nom_fichier, source='import') if PYARROW_DISPONIBLE else None
+                    if puits:
+                        puits.commencer()
+                    date_observation = time.time()
+                    
+                    def enregistrer_bloc(bloc, numero):
+                        base.upsert_dataframe(nom_fichier, bloc, type_col, date_observation=date_observation)
+                        if puits:
+                            puits.ecrire_dataframe(bloc, numero, type_col)
                     
                     with st.spinner("Nettoyage en cours..."):
-                        df_nettoye = nettoyeur.nettoyer_dataframe(df_brut, type_cat)
-                        stats = nettoyeur.get_stats()
+                        try:
+                            stats = nettoyeur.nettoyer_csv(
+                                uploaded_file, fichier_sortie, type_cat, traiter_bloc=enregistrer_bloc
+                            )
+                            if puits:
+                                puits.valider()
+                            entree = manifeste.mettre_a_jour(nom_fichier, fichier_sortie)
+                            # Le fichier importé remplace la catégorie dans la base
+                            base.retirer_absentes(nom_fichier, date_observation)
+                            base.noter_source(nom_fichier, entree['octets'], entree['mtime'])
+                        finally:
+                            base.fermer()
                     
                     render_success("Nettoyage terminé!")
                     
@@ -785,18 +895,17 @@ def page_importer():
                     st.plotly_chart(fig, use_container_width=True)
                     
                     with st.expander("Données nettoyées", expanded=True):
-                        st.dataframe(df_nettoye.head(20), use_container_width=True)
-                    
-                    fichier_sortie = f"data/nettoye/{nom_fichier}_nettoye.csv"
-                    df_nettoye.to_csv(fichier_sortie, index=False, encoding='utf-8-sig')
+                        st.dataframe(pd.read_csv(fichier_sortie, nrows=20), use_container_width=True)
                     
-                    csv_nettoye = df_nettoye.to_csv(index=False, encoding='utf-8-sig')
+                    def lire_nettoye(fichier=fichier_sortie):
+                        with open(fichier, 'rb') as f:
+                            return f.read()
                     
                     col1, col2, col3 = st.columns([1, 1, 1])
                     with col2:
                         st.download_button(
                             "Télécharger les données nettoyées",
-                            csv_nettoye,
+                            lire_nettoye,
                             f"{nom_fichier}_nettoye.csv",
                             "text/csv",
                             use_container_width=True
@@ -812,12 +921,10 @@ def page_importer():
     
     render_section("Télécharger les données")
     
-    categories = {
-        'vetements_homme': 'Vêtements Homme',
-        'chaussures_homme': 'Chaussures Homme',
-        'vetements_enfants': 'Vêtements Enfants',
-        'chaussures_enfants': 'Chaussures Enfants'
-    }
+    categories = {cle: config['nom'] for cle, config in categories_configurees().items()}
+    
+    sys.path.append(os.path.dirname(__file__))
+    import manifeste
     
     cols = st.columns(2)
     
@@ -827,12 +934,16 @@ def page_importer():
         with cols[idx % 2]:
             if os.path.exists(fichier):
                 try:
-                    df = pd.read_csv(fichier)
-                    csv_data = df.to_csv(index=False, encoding='utf-8-sig')
+                    # Libellé depuis le manifeste ; le fichier n'est lu qu'au clic
+                    entree = manifeste.entree_a_jour(fichier_base, fichier)
+                    
+                    def lire_fichier(fichier=fichier):
+                        with open(fichier, 'rb') as f:
+                            return f.read()
                     
                     st.download_button(
-                        f"{nom_affichage} ({len(df)} annonces)",
-                        csv_data,
+                        f"{nom_affichage} ({entree['lignes']} annonces)",
+                        lire_fichier,
                         f"{fichier_base}_nettoye.csv",
                         "text/csv",
                         key=f"download_existing_{fichier_base}",
@@ -852,41 +963,51 @@ def page_dashboard():
     
     render_header("Tableau de bord", "Visualisez et analysez vos données")
     
-    categories = {
-        'Vêtements Homme': 'vetements_homme',
-        'Chaussures Homme': 'chaussures_homme',
-        'Vêtements Enfants': 'vetements_enfants',
-        'Chaussures Enfants': 'chaussures_enfants'
-    }
+    categories = {config['nom']: cle for cle, config in categories_configurees().items()}
     
     cat_select = st.selectbox("Catégorie", list(categories.keys()))
     
-    fichier = f"data/nettoye/{categories[cat_select]}_nettoye.csv"
-    
-    if not os.path.exists(fichier):
-        render_warning("Aucune donnée disponible pour cette catégorie.")
-        render_info("Utilisez la page 'Scraping' ou 'Import' pour collecter des données.")
-        return
+    cle = categories[cat_select]
+    col_type = categories_configurees()[cle]['type_col']
+    fichier = f"data/nettoye/{cle}_nettoye.csv"
+    
+    sys.path.append(os.path.dirname(__file__))
+    from base_annonces import BaseAnnonces
+    from entrepot_parquet import EntrepotParquet, PYARROW_DISPONIBLE
+    import manifeste
+    
+    # Les agrégations sont exécutées en SQL dans la base des annonces : seuls
+    # les résultats sont chargés, quel que soit le nombre d'annonces
+    base = BaseAnnonces()
+    
+    entree = manifeste.entree_a_jour(cle, fichier)
+    if entree is not None:
+        if base.source(cle) != (entree['octets'], entree['mtime']):
+            # CSV écrit hors de la base (scraping en ligne de commande, rejeu
+            # d'archive, fichier modifié) : la catégorie reprend son contenu
+            with st.spinner("Synchronisation de la base..."):
+                blocs = pd.read_csv(fichier, dtype=str, chunksize=100_000) if entree['lignes'] else []
+                base.remplacer_categorie(cle, blocs, col_type)
+            base.noter_source(cle, entree['octets'], entree['mtime'])
+    elif not base.contient(cle):
+        # Pas de CSV : reprise de l'entrepôt Parquet
+        entrepot = EntrepotParquet() if PYARROW_DISPONIBLE else None
+        if entrepot is not None and cle in entrepot.categories():
+            base.upsert_dataframe(cle, entrepot.charger_categorie(cle, col_type), col_type)
+        else:
+            base.fermer()
+            render_warning("Aucune donnée disponible pour cette catégorie.")
+            render_info("Utilisez la page 'Scraping' ou 'Import' pour collecter des données.")
+            return
     
     try:
-        df = pd.read_csv(fichier)
+        resume = base.resume_prix(cle)
+        total = resume['annonces']
         
-        if len(df) == 0:
+        if total == 0:
             render_warning("Le fichier est vide.")
             return
         
-        # Préparation des données
-        df['prix_num'] = df['prix'].apply(lambda x: 
-            float(re.sub(r'[^\d]', '', str(x))) if 'demande' not in str(x).lower() and re.sub(r'[^\d]', '', str(x)) else None
-        )
-        
-        if 'adresse' in df.columns:
-            df['ville'] = df['adresse'].apply(lambda x: 
-                x.split(',')[0].strip() if isinstance(x, str) and ',' in x else 'Non spécifié'
-            )
-        
-        col_type = 'type_habits' if 'type_habits' in df.columns else 'type_chaussures'
-        
         st.markdown("<br>", unsafe_allow_html=True)
         
         # ========== STATISTIQUES CLÉS ==========
@@ -894,32 +1015,32 @@ def page_dashboard():
         
         col1, col2, col3, col4 = st.columns(4)
         
-        col1.metric("Total annonces", f"{len(df):,}")
-        
-        prix_valides = df['prix_num'].dropna()
+        col1.metric("Total annonces", f"{total:,}")
         
-        if len(prix_valides) > 0:
-            col2.metric("Prix moyen", f"{prix_valides.mean():,.0f} CFA")
-            col3.metric("Prix min", f"{prix_valides.min():,.0f} CFA")
-            col4.metric("Prix max", f"{prix_valides.max():,.0f} CFA")
+        if resume['prix_valides'] > 0:
+            col2.metric("Prix moyen", f"{resume['moyenne']:,.0f} CFA")
+            col3.metric("Prix min", f"{resume['min']:,.0f} CFA")
+            col4.metric("Prix max", f"{resume['max']:,.0f} CFA")
         
         st.markdown("<br>", unsafe_allow_html=True)
         
         # ========== GRAPHIQUES VARIÉS ==========
         render_section("Analyses détaillées")
         
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
             "Répartition géographique",
             "Analyse des prix",
             "Produits populaires",
             "Statistiques avancées",
-            "Données brutes"
+            "Données brutes",
+            "Galerie",
+            "Tendances"
         ])
         
         # TAB 1: Géographie (Pie + Bar)
         with tab1:
-            if 'ville' in df.columns:
-                villes = df['ville'].value_counts().head(10)
+            villes = base.compter_par(cle, 'ville', limite=10)
+            if len(villes) > 0:
                 
                 col1, col2 = st.columns(2)
                 
@@ -957,24 +1078,25 @@ def page_dashboard():
                 ville_stats = pd.DataFrame({
                     'Ville': villes.index,
                     'Nombre': villes.values,
-                    'Pourcentage': (villes.values / len(df) * 100).round(2)
+                    'Pourcentage': (villes.values / total * 100).round(2)
                 })
                 st.dataframe(ville_stats, use_container_width=True, hide_index=True)
         
         # TAB 2: Prix (Histogram + Box + Donut)
         with tab2:
-            if len(prix_valides) > 0:
+            if resume['prix_valides'] > 0:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    # Histogramme
-                    fig_hist = px.histogram(
-                        df.dropna(subset=['prix_num']),
-                        x='prix_num',
-                        nbins=30,
+                    # Histogramme (effectifs par classe calculés en SQL)
+                    histogramme = base.histogramme_prix(cle, nb_classes=30)
+                    fig_hist = px.bar(
+                        x=(histogramme['debut'] + histogramme['fin']) / 2,
+                        y=histogramme['nombre'],
                         title='Distribution des prix',
-                        labels={'prix_num': 'Prix (CFA)'}
+                        labels={'x': 'Prix (CFA)', 'y': 'count'}
                     )
+                    fig_hist.update_layout(bargap=0)
                     fig_hist.update_traces(marker_color='#2563eb')
                     fig_hist.update_layout(
                         height=350,
@@ -984,15 +1106,19 @@ def page_dashboard():
                     st.plotly_chart(fig_hist, use_container_width=True)
                 
                 with col2:
-                    # Box plot
-                    fig_box = px.box(
-                        df.dropna(subset=['prix_num']),
-                        y='prix_num',
-                        title='Boîte à moustaches',
-                        labels={'prix_num': 'Prix (CFA)'}
-                    )
+                    # Box plot (quartiles et moustaches calculés en SQL)
+                    boite = base.boite_prix(cle)
+                    fig_box = go.Figure(go.Box(
+                        q1=[boite['q1']],
+                        median=[boite['mediane']],
+                        q3=[boite['q3']],
+                        lowerfence=[boite['moustache_basse']],
+                        upperfence=[boite['moustache_haute']],
+                        name='Prix (CFA)'
+                    ))
                     fig_box.update_traces(marker_color='#f97316')
                     fig_box.update_layout(
+                        title='Boîte à moustaches',
                         height=350,
                         plot_bgcolor='rgba(0,0,0,0)',
                         paper_bgcolor='rgba(0,0,0,0)'
@@ -1005,10 +1131,7 @@ def page_dashboard():
                 # Créer des tranches de prix
                 bins = [0, 5000, 10000, 20000, 50000, float('inf')]
                 labels = ['0-5K', '5K-10K', '10K-20K', '20K-50K', '50K+']
-                df_prix = df.dropna(subset=['prix_num']).copy()
-                df_prix['tranche'] = pd.cut(df_prix['prix_num'], bins=bins, labels=labels)
-                
-                tranche_counts = df_prix['tranche'].value_counts()
+                tranche_counts = base.tranches_prix(cle, bins, labels)
                 
                 col1, col2 = st.columns([2, 1])
                 
@@ -1028,16 +1151,15 @@ def page_dashboard():
                 
                 with col2:
                     st.markdown("**Statistiques**")
-                    quartiles = prix_valides.quantile([0.25, 0.5, 0.75])
-                    st.metric("Médiane", f"{quartiles[0.5]:,.0f} CFA")
-                    st.metric("Q1 (25%)", f"{quartiles[0.25]:,.0f} CFA")
-                    st.metric("Q3 (75%)", f"{quartiles[0.75]:,.0f} CFA")
-                    st.metric("Écart-type", f"{prix_valides.std():,.0f} CFA")
+                    st.metric("Médiane", f"{boite['mediane']:,.0f} CFA")
+                    st.metric("Q1 (25%)", f"{boite['q1']:,.0f} CFA")
+                    st.metric("Q3 (75%)", f"{boite['q3']:,.0f} CFA")
+                    st.metric("Écart-type", f"{resume['ecart_type'] or 0:,.0f} CFA")
         
         # TAB 3: Produits (Bar horizontal + Donut des catégories)
         with tab3:
-            if col_type in df.columns:
-                top_produits = df[col_type].value_counts().head(15)
+            top_produits = base.compter_par(cle, 'type', limite=15)
+            if len(top_produits) > 0:
                 
                 col1, col2 = st.columns([2, 1])
                 
@@ -1061,7 +1183,7 @@ def page_dashboard():
                 with col2:
                     st.markdown("**Top 10 produits**")
                     for idx, (produit, count) in enumerate(top_produits.head(10).items(), 1):
-                        pourcentage = (count / len(df)) * 100
+                        pourcentage = (count / total) * 100
                         st.write(f"**{idx}. {produit}**")
                         st.progress(pourcentage / 100)
                         st.caption(f"{count} annonces ({pourcentage:.1f}%)")
@@ -1071,8 +1193,8 @@ def page_dashboard():
                 # Graphique de concentration (Donut)
                 st.markdown("**Concentration du marché**")
                 
-                top_5 = df[col_type].value_counts().head(5).sum()
-                autres = len(df) - top_5
+                top_5 = top_produits.head(5).sum()
+                autres = total - top_5
                 
                 fig_concentration = go.Figure(data=[go.Pie(
                     labels=['Top 5 produits', 'Autres produits'],
@@ -1093,10 +1215,9 @@ def page_dashboard():
             with col1:
                 st.markdown("**Analyse des prix par ville**")
                 
-                if 'ville' in df.columns and len(prix_valides) > 0:
+                if resume['prix_valides'] > 0:
                     # Prix moyen par ville (top 10)
-                    df_ville_prix = df.dropna(subset=['prix_num']).groupby('ville')['prix_num'].agg(['mean', 'count']).reset_index()
-                    df_ville_prix = df_ville_prix[df_ville_prix['count'] >= 3].nlargest(10, 'mean')
+                    df_ville_prix = base.prix_par_ville(cle, min_annonces=3, limite=10)
                     
                     fig_ville_prix = px.bar(
                         df_ville_prix,
@@ -1118,8 +1239,9 @@ def page_dashboard():
                 st.markdown("**Distribution des disponibilités**")
                 
                 # Annonces avec/sans prix
-                prix_dispo = len(df[df['prix'] != 'Prix non disponible'])
-                prix_non_dispo = len(df) - prix_dispo
+                disponibilites = base.disponibilites(cle)
+                prix_dispo = disponibilites['prix']
+                prix_non_dispo = total - prix_dispo
                 
                 fig_dispo = go.Figure(data=[go.Pie(
                     labels=['Prix disponible', 'Prix sur demande'],
@@ -1134,8 +1256,8 @@ def page_dashboard():
                 st.plotly_chart(fig_dispo, use_container_width=True)
                 
                 # Annonces avec/sans adresse
-                adresse_dispo = len(df[df['adresse'] != 'Adresse non disponible'])
-                adresse_non_dispo = len(df) - adresse_dispo
+                adresse_dispo = disponibilites['adresse']
+                adresse_non_dispo = total - adresse_dispo
                 
                 fig_adresse = go.Figure(data=[go.Pie(
                     labels=['Adresse disponible', 'Adresse non disponible'],
@@ -1164,14 +1286,14 @@ def page_dashboard():
                     'Taux adresse disponible'
                 ],
                 'Valeur': [
-                    f"{len(df):,}",
-                    f"{prix_valides.mean():,.0f} CFA" if len(prix_valides) > 0 else "N/A",
-                    f"{prix_valides.median():,.0f} CFA" if len(prix_valides) > 0 else "N/A",
-                    f"{prix_valides.std():,.0f} CFA" if len(prix_valides) > 0 else "N/A",
-                    f"{df['ville'].nunique()}" if 'ville' in df.columns else "N/A",
-                    f"{df[col_type].nunique()}",
-                    f"{(prix_dispo/len(df)*100):.1f}%",
-                    f"{(adresse_dispo/len(df)*100):.1f}%"
+                    f"{total:,}",
+                    f"{resume['moyenne']:,.0f} CFA" if resume['prix_valides'] > 0 else "N/A",
+                    f"{base.quantiles_prix(cle, [0.5])[0.5]:,.0f} CFA" if resume['prix_valides'] > 0 else "N/A",
+                    f"{resume['ecart_type']:,.0f} CFA" if resume['ecart_type'] is not None else "N/A",
+                    f"{base.nombre_distinct(cle, 'ville')}",
+                    f"{base.nombre_distinct(cle, 'type')}",
+                    f"{(prix_dispo/total*100):.1f}%",
+                    f"{(adresse_dispo/total*100):.1f}%"
                 ]
             })
             st.dataframe(recap, use_container_width=True, hide_index=True)
@@ -1184,50 +1306,187 @@ def page_dashboard():
                 recherche = st.text_input("Rechercher", placeholder="Nike, Adidas, Dakar...")
             
             with col2:
-                tri_col = st.selectbox("Trier", ['Aucun'] + list(df.columns))
+                tris = {'Aucun': None, col_type: 'type', 'prix': 'prix_num', 'adresse': 'adresse', 'ville': 'ville'}
+                tri_col = st.selectbox("Trier", list(tris))
             
-            df_affiche = df.copy()
+            # Recherche et tri en SQL ; seules les premières lignes sont affichées
+            nb_resultats = base.compter(cle, recherche or None)
             
             if recherche:
-                df_affiche = df_affiche[
-                    df_affiche.astype(str).apply(
-                        lambda row: row.str.contains(recherche, case=False, na=False).any(),
-                        axis=1
-                    )
-                ]
-                render_info(f"{len(df_affiche)} résultats trouvés pour '{recherche}'")
-            
-            if tri_col != 'Aucun':
-                try:
-                    df_affiche = df_affiche.sort_values(tri_col)
-                except:
-                    pass
+                render_info(f"{nb_resultats} résultats trouvés pour '{recherche}'")
             
             st.dataframe(
-                df_affiche.drop(columns=['prix_num', 'ville'], errors='ignore'),
+                base.lire(cle, col_type, recherche=recherche or None, tri=tris[tri_col], limite=1000),
                 use_container_width=True,
                 height=400
             )
             
             col1, col2, col3 = st.columns(3)
-            col1.metric("Affichées", len(df_affiche))
-            col2.metric("Total", len(df))
-            col3.metric("Pourcentage", f"{(len(df_affiche)/len(df)*100):.1f}%")
+            col1.metric("Affichées", min(nb_resultats, 1000))
+            col2.metric("Total", total)
+            col3.metric("Pourcentage", f"{(nb_resultats/total*100):.1f}%")
             
-            csv = df_affiche.drop(columns=['prix_num', 'ville'], errors='ignore').to_csv(
-                index=False, encoding='utf-8-sig'
-            )
+            # L'export complet n'est lu qu'à la demande
+            if st.button("Préparer l'export des données filtrées"):
+                csv = base.lire(cle, col_type, recherche=recherche or None, tri=tris[tri_col]).to_csv(
+                    index=False, encoding='utf-8-sig'
+                )
+                
+                st.download_button(
+                    "Télécharger les données filtrées",
+                    csv,
+                    f"{categories[cat_select]}_filtre.csv",
+                    "text/csv",
+                    use_container_width=True
+                )
+    
+        # TAB 6: Galerie (miniatures servies depuis le cache local)
+        with tab6:
+            if len(base.lire(cle, col_type, avec_image=True, limite=1)) == 0:
+                render_info("Aucune colonne d'image dans ces données.")
+            else:
+                sys.path.append(os.path.dirname(__file__))
+                from cache_images import CacheImages
+                
+                cache_images = CacheImages()
+                
+                col1, col2 = st.columns([3, 1])
+                with col2:
+                    mettre_en_cache = st.button("Mettre en cache les images", use_container_width=True)
+                
+                if mettre_en_cache:
+                    with st.spinner("Téléchargement des images..."):
+                        df_images = base.lire(cle, col_type, avec_image=True)
+                        stats_images = cache_images.telecharger(df_images['image_lien'])
+                    
+                    # Enregistrer les liens cassés dans le fichier nettoyé
+                    if os.path.exists(fichier):
+                        df_annote = cache_images.annoter(pd.read_csv(fichier))
+                        df_annote.to_csv(fichier, index=False, encoding='utf-8-sig')
+                        # Les annotations ne touchent pas les champs de la base
+                        entree = manifeste.mettre_a_jour(cle, fichier, df=df_annote)
+                        base.noter_source(cle, entree['octets'], entree['mtime'])
+                    
+                    render_success(
+                        f"{stats_images['images_distinctes']} images distinctes en cache "
+                        f"({stats_images['octets_stockes'] / 1024:,.0f} Ko), "
+                        f"{stats_images['doublons_contenu']} doublons de contenu, "
+                        f"{stats_images['liens_casses']} liens cassés"
+                    )
+                    col1.metric("Liens d'image cassés", int(cache_images.annoter(df_images)['image_cassee'].sum()))
+                
+                # Premières annonces illustrées, jusqu'à 24 miniatures en cache
+                miniatures = []
+                for _, ligne in base.lire(cle, col_type, avec_image=True, limite=500).iterrows():
+                    chemin = cache_images.chemin_miniature(ligne['image_lien'])
+                    if chemin:
+                        miniatures.append((ligne, chemin))
+                    if len(miniatures) >= 24:
+                        break
+                
+                if not miniatures:
+                    render_info("Aucune miniature en cache. Cliquez sur « Mettre en cache les images ».")
+                
+                cols = st.columns(6)
+                for idx, (ligne, chemin) in enumerate(miniatures):
+                    with cols[idx % 6]:
+                        st.image(chemin, caption=f"{ligne[col_type]} - {ligne['prix']}", use_container_width=True)
+                
+                cache_images.fermer()
+        
+        # TAB 7: Tendances (historique des prix entre scrapings)
+        with tab7:
+            volume = base.volume_historique(cle)
+            durees = base.durees_en_ligne(cle)
             
-            st.download_button(
-                "Télécharger les données filtrées",
-                csv,
-                f"{categories[cat_select]}_filtre.csv",
-                "text/csv",
-                use_container_width=True
+            col1, col2, col3 = st.columns(3)
+            col1.metric(
+                "Annonces suivies", f"{volume['annonces']:,}",
+                help=f"Dont {volume['retirees']:,} retirées de la source, gardées dans l'historique"
             )
+            col2.metric("Changements de prix", f"{volume['changements'] - volume['annonces']:,}")
+            col3.metric("Durée en ligne médiane", f"{durees.median():.0f} jours")
+            
+            medianes = base.mediane_hebdomadaire(cle, nb_types=5)
+            
+            if medianes['semaine'].nunique() < 2:
+                render_info("Les tendances apparaissent après des scrapings sur au moins deux semaines.")
+            else:
+                # Prix médian hebdomadaire des produits les plus fréquents
+                fig_tendance = px.line(
+                    medianes,
+                    x='semaine',
+                    y='mediane',
+                    color='type',
+                    markers=True,
+                    title='Prix médian par semaine (Top 5 produits)',
+                    labels={'semaine': 'Semaine', 'mediane': 'Prix médian (CFA)', 'type': 'Produit'}
+                )
+                fig_tendance.update_layout(
+                    height=400,
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig_tendance, use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("**Dernières baisses de prix**")
+                baisses = base.baisses_prix(cle, limite=20)
+                if len(baisses) == 0:
+                    render_info("Aucune baisse de prix observée.")
+                else:
+                    st.dataframe(
+                        baisses.rename(columns={'type': col_type}),
+                        use_container_width=True,
+                        hide_index=True
+                    )
+            
+            with col2:
+                st.markdown("**Durée en ligne des annonces**")
+                jours = durees.round().value_counts().sort_index()
+                fig_durees = px.bar(
+                    x=jours.index,
+                    y=jours.values,
+                    labels={'x': 'Jours entre première et dernière observation', 'y': 'Annonces'}
+                )
+                fig_durees.update_traces(marker_color='#2563eb')
+                fig_durees.update_layout(
+                    height=350,
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)'
+                )
+                st.plotly_chart(fig_durees, use_container_width=True)
+            
+            # Trajectoire de prix d'une annonce
+            id_annonce = st.text_input("Identifiant d'annonce", placeholder="Ex: 4512873")
+            if id_annonce.strip():
+                trajectoire = base.trajectoire_prix(cle, id_annonce.strip())
+                if len(trajectoire) == 0:
+                    render_warning("Annonce inconnue dans l'historique.")
+                else:
+                    fig_trajectoire = px.line(
+                        trajectoire,
+                        x='date',
+                        y='prix_num',
+                        markers=True,
+                        line_shape='hv',
+                        title=f"Trajectoire de prix de l'annonce {id_annonce.strip()}",
+                        labels={'date': 'Date', 'prix_num': 'Prix (CFA)'}
+                    )
+                    fig_trajectoire.update_layout(
+                        height=350,
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        paper_bgcolor='rgba(0,0,0,0)'
+                    )
+                    st.plotly_chart(fig_trajectoire, use_container_width=True)
     
     except Exception as e:
         render_error(f"Erreur: {str(e)}")
+    
+    finally:
+        base.fermer()
 
 
 
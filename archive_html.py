@@ -0,0 +1,147 @@
+"""
+Archive des pages HTML téléchargées, pour rejeu hors ligne
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, Optional
+
+
+class ArchiveHTML:
+    """
+    Enregistre chaque page téléchargée, compressée, avec son contexte
+
+    Contrairement au cache HTTP (une entrée par URL, évincée au besoin),
+    l'archive conserve toutes les captures : URL, date, statut, en-têtes et
+    corps compressé (zlib). Elle sert d'entrée reproductible pour ré-extraire
+    les annonces après une modification des heuristiques, sans réseau.
+    """
+
+    def __init__(self, chemin: str = 'data/archive/pages.sqlite', niveau_compression: int = 6):
+        """
+        Args:
+            chemin: Fichier SQLite de l'archive
+            niveau_compression: Niveau zlib (1 rapide ... 9 compact)
+        """
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self.niveau_compression = niveau_compression
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.executescript("""
+            CREATE TABLE IF NOT EXISTS captures (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                date_capture REAL NOT NULL,
+                statut INTEGER NOT NULL,
+                entetes TEXT NOT NULL,
+                contenu BLOB NOT NULL,
+                taille INTEGER NOT NULL,
+                taille_compressee INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_captures_url ON captures (url, date_capture);
+        """)
+        self._connexion.commit()
+
+    @staticmethod
+    def decompresser(contenu_compresse: bytes) -> bytes:
+        """Corps HTML d'une capture"""
+        return zlib.decompress(contenu_compresse)
+
+    def enregistrer(self, url: str, contenu: bytes, entetes: Optional[Dict[str, str]] = None, statut: int = 200):
+        """Archive une page (la compression a lieu hors du verrou)"""
+        compresse = zlib.compress(contenu, self.niveau_compression)
+        with self._verrou:
+            self._connexion.execute(
+                "INSERT INTO captures (url, date_capture, statut, entetes, contenu, taille, taille_compressee) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, time.time(), statut, json.dumps(dict(entetes or {})), compresse, len(contenu), len(compresse))
+            )
+            self._connexion.commit()
+
+    def captures(
+        self,
+        prefixe_url: str = '',
+        avant: Optional[float] = None,
+        derniere_seulement: bool = True,
+        avec_contenu: bool = True
+    ) -> Iterator[Dict]:
+        """
+        Parcourt les captures archivées
+
+        Seules les métadonnées sont lues d'un bloc ; chaque corps est lu au
+        moment où sa capture est cédée (ou plus tard avec contenu_compresse),
+        la mémoire ne dépend donc pas du volume des pages archivées.
+
+        Args:
+            prefixe_url: Ne garder que les URL commençant par ce préfixe
+            avant: Ne garder que les captures antérieures à ce timestamp
+            derniere_seulement: Une seule capture par URL, la plus récente
+            avec_contenu: Lire le corps compressé de chaque capture
+
+        Yields:
+            {'id', 'url', 'date_capture', 'statut', 'entetes'} et
+            'contenu_compresse' avec avec_contenu
+        """
+        motif = prefixe_url.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        conditions = "url LIKE ? ESCAPE '\\' AND statut = 200"
+        parametres = [motif]
+        if avant is not None:
+            conditions += " AND date_capture < ?"
+            parametres.append(avant)
+
+        if derniere_seulement:
+            requete = (f"SELECT id, url, MAX(date_capture), statut, entetes FROM captures "
+                       f"WHERE {conditions} GROUP BY url ORDER BY url")
+        else:
+            requete = (f"SELECT id, url, date_capture, statut, entetes FROM captures "
+                       f"WHERE {conditions} ORDER BY url, date_capture")
+
+        with self._verrou:
+            lignes = self._connexion.execute(requete, parametres).fetchall()
+        for id_capture, url, date_capture, statut, entetes in lignes:
+            capture = {
+                'id': id_capture,
+                'url': url,
+                'date_capture': date_capture,
+                'statut': statut,
+                'entetes': json.loads(entetes)
+            }
+            if avec_contenu:
+                capture['contenu_compresse'] = self.contenu_compresse(id_capture)
+            yield capture
+
+    def contenu_compresse(self, id_capture: int) -> bytes:
+        """Corps compressé d'une capture (voir decompresser)"""
+        with self._verrou:
+            return self._connexion.execute(
+                "SELECT contenu FROM captures WHERE id = ?", (id_capture,)
+            ).fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        """Nombre de captures et d'URL, volumes brut et compressé"""
+        with self._verrou:
+            captures, urls, brut, compresse = self._connexion.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT url), COALESCE(SUM(taille), 0), "
+                "COALESCE(SUM(taille_compressee), 0) FROM captures"
+            ).fetchone()
+        return {
+            'captures': captures,
+            'urls': urls,
+            'octets_bruts': brut,
+            'octets_compresses': compresse,
+            'taux_compression': round(brut / compresse, 2) if compresse else 0.0
+        }
+
+    def fermer(self):
+        """Ferme l'archive"""
+        with self._verrou:
+            self._connexion.close()
@@ -0,0 +1,694 @@
+"""
+Base SQLite des annonces et agrégations du tableau de bord
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Champs d'une annonce stockés en plus du type, du prix et de l'adresse
+COLONNES_TEXTE = ['image_lien', 'lien', 'description', 'date_publication', 'vendeur', 'images']
+
+# Colonnes qu'on peut compter ou trier (noms insérés dans le SQL)
+COLONNES_GROUPEMENT = ('ville', 'type')
+COLONNES_TRI = ('type', 'prix_num', 'adresse', 'ville', 'derniere_vue')
+
+
+def prix_numerique(prix) -> Optional[int]:
+    """Prix en CFA d'un texte de prix, comme le tableau de bord le calculait"""
+    texte = str(prix)
+    chiffres = re.sub(r'[^\d]', '', texte)
+    if 'demande' in texte.lower() or not chiffres:
+        return None
+    return int(chiffres)
+
+
+def ville_adresse(adresse) -> str:
+    """Partie de l'adresse avant la virgule ('Non spécifié' sans virgule)"""
+    if isinstance(adresse, str) and ',' in adresse:
+        return adresse.split(',')[0].strip()
+    return 'Non spécifié'
+
+
+class BaseAnnonces:
+    """
+    Annonces de toutes les catégories dans une base SQLite indexée
+
+    Chaque annonce est insérée ou mise à jour par son identifiant (ou, à
+    défaut, par l'empreinte de ses champs pour les imports sans lien) : un
+    nouveau scraping rafraîchit les annonces connues au lieu de les
+    dupliquer. Un scraping complet ou un import remplace la catégorie : les
+    annonces qu'il n'a pas revues sont marquées retirées (retiree_le) et
+    quittent les agrégations du tableau de bord, mais gardent leur
+    historique de prix ; revue plus tard, une annonce redevient active. La
+    table sources note le fichier (taille, date) que reflète chaque catégorie.
+
+    L'historique des prix est encodé en différences : la table annonces
+    garde la première et la dernière observation de chaque annonce, et
+    changements_prix, en ajout seul, reçoit une ligne à la première
+    observation puis une à chaque changement de prix. L'historique croît
+    avec le renouvellement des annonces et non avec le nombre de scrapings.
+
+    Le prix numérique et la ville sont calculés à l'écriture, et les index
+    partiels des annonces actives (catégorie, ville, prix), (catégorie, type)
+    et (catégorie, prix) servent les agrégations du tableau de bord,
+    exécutées en SQL : seuls les résultats remontent en pandas, quel que
+    soit le volume.
+    """
+
+    def __init__(self, chemin: str = 'data/annonces.sqlite'):
+        """
+        Args:
+            chemin: Fichier SQLite de la base
+        """
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        # WAL : le tableau de bord lit pendant qu'un scraping écrit
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.executescript(f"""
+            CREATE TABLE IF NOT EXISTS annonces (
+                categorie TEXT NOT NULL,
+                cle TEXT NOT NULL,
+                id_annonce INTEGER,
+                type TEXT,
+                prix TEXT,
+                prix_num INTEGER,
+                adresse TEXT,
+                ville TEXT NOT NULL,
+                {', '.join(f'{colonne} TEXT' for colonne in COLONNES_TEXTE)},
+                premiere_vue REAL NOT NULL,
+                derniere_vue REAL NOT NULL,
+                retiree_le REAL,
+                PRIMARY KEY (categorie, cle)
+            );
+            CREATE TABLE IF NOT EXISTS changements_prix (
+                categorie TEXT NOT NULL,
+                cle TEXT NOT NULL,
+                date REAL NOT NULL,
+                prix TEXT,
+                prix_num INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_changements_annonce ON changements_prix (categorie, cle, date);
+            CREATE TABLE IF NOT EXISTS sources (
+                categorie TEXT PRIMARY KEY,
+                octets INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            );
+        """)
+        colonnes = {ligne[1] for ligne in self._connexion.execute("PRAGMA table_info(annonces)")}
+        if 'retiree_le' not in colonnes:
+            # Base antérieure aux retraits marqués : ses annonces sont toutes actives
+            self._connexion.execute("ALTER TABLE annonces ADD COLUMN retiree_le REAL")
+        # Index sur toutes les annonces, remplacés par ceux des seules annonces actives
+        self._connexion.executescript("""
+            DROP INDEX IF EXISTS idx_annonces_ville;
+            DROP INDEX IF EXISTS idx_annonces_type;
+            DROP INDEX IF EXISTS idx_annonces_prix;
+            CREATE INDEX IF NOT EXISTS idx_actives_ville ON annonces (categorie, ville, prix_num)
+                WHERE retiree_le IS NULL;
+            CREATE INDEX IF NOT EXISTS idx_actives_type ON annonces (categorie, type)
+                WHERE retiree_le IS NULL;
+            CREATE INDEX IF NOT EXISTS idx_actives_prix ON annonces (categorie, prix_num)
+                WHERE retiree_le IS NULL;
+        """)
+        # Base antérieure à l'historique : le prix actuel devient la première observation
+        self._connexion.execute(
+            "INSERT INTO changements_prix (categorie, cle, date, prix, prix_num) "
+            "SELECT categorie, cle, premiere_vue, prix, prix_num FROM annonces "
+            "WHERE NOT EXISTS (SELECT 1 FROM changements_prix)"
+        )
+        self._connexion.commit()
+        self.stats = {'insertions': 0, 'mises_a_jour': 0, 'changements_prix': 0, 'retraits': 0}
+
+    @staticmethod
+    def cle_annonce(annonce: Dict, type_col: str = 'type') -> str:
+        """Identifiant de l'annonce, ou empreinte de ses champs s'il est inconnu"""
+        id_annonce = annonce.get('id_annonce')
+        if id_annonce is not None:
+            return str(int(id_annonce))
+        champs = [str(annonce.get(c) or '') for c in (type_col, 'prix', 'adresse', 'image_lien')]
+        return 'h' + hashlib.sha1('\x1f'.join(champs).encode('utf-8')).hexdigest()[:16]
+
+    def upsert(
+        self,
+        categorie: str,
+        annonces: List[Dict],
+        type_col: str = 'type',
+        date_observation: Optional[float] = None
+    ) -> int:
+        """
+        Insère ou met à jour des annonces, et note leurs changements de prix
+
+        Args:
+            categorie: Clé de la catégorie
+            annonces: Annonces du scraper ou lignes d'un CSV nettoyé
+            type_col: Clé du type de produit dans les annonces
+            date_observation: Timestamp de l'observation (maintenant par défaut)
+
+        Returns:
+            Nombre d'annonces écrites
+        """
+        if not annonces:
+            return 0
+        maintenant = date_observation if date_observation is not None else time.time()
+        lignes = {}
+        for annonce in annonces:
+            id_annonce = annonce.get('id_annonce')
+            cle = self.cle_annonce(annonce, type_col)
+            lignes[cle] = (
+                categorie,
+                cle,
+                int(id_annonce) if id_annonce is not None else None,
+                annonce.get(type_col),
+                annonce.get('prix'),
+                prix_numerique(annonce['prix']) if annonce.get('prix') is not None else None,
+                annonce.get('adresse'),
+                ville_adresse(annonce.get('adresse')),
+                *[
+                    ' | '.join(valeur) if isinstance(valeur, list) else valeur
+                    for valeur in (annonce.get(colonne) for colonne in COLONNES_TEXTE)
+                ],
+                maintenant,
+                maintenant
+            )
+
+        colonnes = ['categorie', 'cle', 'id_annonce', 'type', 'prix', 'prix_num', 'adresse', 'ville'] \
+            + COLONNES_TEXTE + ['premiere_vue', 'derniere_vue']
+        # Une annonce revue sur une page de liste garde les détails d'un
+        # enrichissement précédent ; une annonce retirée revue redevient active
+        mises_a_jour = ', '.join(
+            f"{colonne} = COALESCE(excluded.{colonne}, {colonne})" if colonne in COLONNES_TEXTE
+            else f"{colonne} = excluded.{colonne}"
+            for colonne in colonnes if colonne not in ('categorie', 'cle', 'premiere_vue')
+        ) + ", retiree_le = NULL"
+        with self._verrou:
+            prix_connus = self._prix_connus(categorie, list(lignes))
+            # Nouvelle annonce ou prix différent de la dernière observation
+            changements = [
+                (categorie, cle, maintenant, ligne[4], ligne[5])
+                for cle, ligne in lignes.items()
+                if cle not in prix_connus or prix_connus[cle] != ligne[4]
+            ]
+            self._connexion.executemany(
+                f"INSERT INTO annonces ({', '.join(colonnes)}) VALUES ({', '.join('?' * len(colonnes))}) "
+                f"ON CONFLICT (categorie, cle) DO UPDATE SET {mises_a_jour}",
+                list(lignes.values())
+            )
+            self._connexion.executemany(
+                "INSERT INTO changements_prix (categorie, cle, date, prix, prix_num) VALUES (?, ?, ?, ?, ?)",
+                changements
+            )
+            self._connexion.commit()
+            self.stats['insertions'] += len(lignes) - len(prix_connus)
+            self.stats['mises_a_jour'] += len(prix_connus)
+            self.stats['changements_prix'] += len(changements) - (len(lignes) - len(prix_connus))
+        return len(lignes)
+
+    def _prix_connus(self, categorie: str, cles: List[str]) -> Dict[str, Optional[str]]:
+        """Prix actuel des annonces déjà présentes parmi `cles`"""
+        prix = {}
+        for debut in range(0, len(cles), 500):
+            lot = cles[debut:debut + 500]
+            prix.update(self._connexion.execute(
+                f"SELECT cle, prix FROM annonces WHERE categorie = ? AND cle IN ({', '.join('?' * len(lot))})",
+                [categorie] + lot
+            ).fetchall())
+        return prix
+
+    def upsert_dataframe(
+        self,
+        categorie: str,
+        df: pd.DataFrame,
+        type_col: str = 'type',
+        date_observation: Optional[float] = None
+    ) -> int:
+        """Insère ou met à jour les lignes d'un DataFrame (CSV nettoyé, entrepôt Parquet)"""
+        df = df.astype(object).where(df.notna(), None)
+        return self.upsert(categorie, df.to_dict('records'), type_col, date_observation)
+
+    def retirer_absentes(self, categorie: str, date_observation: float) -> int:
+        """
+        Marque retirées les annonces qui n'ont pas été observées depuis `date_observation`
+
+        Appelé à la fin d'un scraping complet ou d'un import, dont toutes les
+        annonces portent cette date : les autres ont disparu de la source.
+        Elles restent en base avec leurs changements de prix (historique).
+
+        Returns:
+            Nombre d'annonces nouvellement retirées
+        """
+        with self._verrou:
+            retirees = self._connexion.execute(
+                "UPDATE annonces SET retiree_le = ? "
+                "WHERE categorie = ? AND derniere_vue < ? AND retiree_le IS NULL",
+                (date_observation, categorie, date_observation)
+            ).rowcount
+            self._connexion.commit()
+            self.stats['retraits'] += retirees
+        return retirees
+
+    def remplacer_categorie(self, categorie: str, blocs: Iterable[pd.DataFrame], type_col: str = 'type') -> int:
+        """
+        Remplace les annonces d'une catégorie par celles d'un fichier lu par blocs
+
+        Une ligne sans identifiant (CSV nettoyé) reprend celui de l'annonce
+        de mêmes champs déjà en base, qui garde ainsi son historique de prix.
+
+        Returns:
+            Nombre d'annonces écrites
+        """
+        ids = {
+            self.cle_annonce(dict(zip(('type', 'prix', 'adresse', 'image_lien'), champs))): id_annonce
+            for id_annonce, *champs in self._requete(
+                "SELECT id_annonce, type, prix, adresse, image_lien FROM annonces "
+                "WHERE categorie = ? AND id_annonce IS NOT NULL", (categorie,)
+            )
+        }
+        date_observation = time.time()
+        ecrites = 0
+        for bloc in blocs:
+            annonces = bloc.astype(object).where(bloc.notna(), None).to_dict('records')
+            for annonce in annonces:
+                if annonce.get('id_annonce') is None:
+                    annonce['id_annonce'] = ids.get(self.cle_annonce(annonce, type_col))
+            ecrites += self.upsert(categorie, annonces, type_col, date_observation)
+        self.retirer_absentes(categorie, date_observation)
+        return ecrites
+
+    def source(self, categorie: str) -> Optional[Tuple[int, float]]:
+        """Taille et date du fichier dont la catégorie reflète le contenu (voir noter_source)"""
+        lignes = self._requete("SELECT octets, mtime FROM sources WHERE categorie = ?", (categorie,))
+        return tuple(lignes[0]) if lignes else None
+
+    def noter_source(self, categorie: str, octets: int, mtime: float):
+        """Note que la catégorie est à jour du fichier de cette taille et de cette date"""
+        with self._verrou:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO sources (categorie, octets, mtime) VALUES (?, ?, ?)",
+                (categorie, octets, mtime)
+            )
+            self._connexion.commit()
+
+    def contient(self, categorie: str) -> bool:
+        """La catégorie a-t-elle des annonces dans la base ?"""
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT 1 FROM annonces WHERE categorie = ? LIMIT 1", (categorie,)
+            ).fetchone()
+        return ligne is not None
+
+    def _requete(self, requete: str, parametres: Sequence = ()) -> List[tuple]:
+        with self._verrou:
+            return self._connexion.execute(requete, parametres).fetchall()
+
+    # ------------------------------------------------------------------
+    # Agrégations du tableau de bord
+    # ------------------------------------------------------------------
+
+    def resume_prix(self, categorie: str) -> Dict:
+        """
+        Nombre d'annonces et statistiques des prix
+
+        Returns:
+            {'annonces', 'prix_valides', 'moyenne', 'min', 'max', 'ecart_type'}
+            (écart-type de l'échantillon, comme pandas)
+        """
+        annonces, valides, moyenne, minimum, maximum = self._requete(
+            "SELECT COUNT(*), COUNT(prix_num), AVG(prix_num), MIN(prix_num), MAX(prix_num) "
+            "FROM annonces WHERE categorie = ? AND retiree_le IS NULL", (categorie,)
+        )[0]
+        ecart_type = None
+        if valides > 1:
+            # Deuxième passage sur l'index des prix : somme des carrés des écarts
+            somme = self._requete(
+                "SELECT SUM((prix_num - ?) * (prix_num - ?)) FROM annonces "
+                "WHERE categorie = ? AND retiree_le IS NULL AND prix_num IS NOT NULL", (moyenne, moyenne, categorie)
+            )[0][0]
+            ecart_type = math.sqrt(somme / (valides - 1))
+        return {
+            'annonces': annonces,
+            'prix_valides': valides,
+            'moyenne': moyenne,
+            'min': minimum,
+            'max': maximum,
+            'ecart_type': ecart_type
+        }
+
+    def quantiles_prix(self, categorie: str, niveaux: Sequence[float] = (0.25, 0.5, 0.75)) -> Dict[float, float]:
+        """
+        Quantiles des prix (interpolation linéaire, comme Series.quantile)
+
+        Chaque quantile lit au plus deux prix dans l'index (catégorie, prix).
+        """
+        valides = self._requete(
+            "SELECT COUNT(prix_num) FROM annonces WHERE categorie = ? AND retiree_le IS NULL", (categorie,)
+        )[0][0]
+        quantiles = {}
+        for niveau in niveaux:
+            if not valides:
+                quantiles[niveau] = None
+                continue
+            position = niveau * (valides - 1)
+            rang = int(math.floor(position))
+            voisins = [ligne[0] for ligne in self._requete(
+                "SELECT prix_num FROM annonces WHERE categorie = ? AND retiree_le IS NULL AND prix_num IS NOT NULL "
+                "ORDER BY prix_num LIMIT 2 OFFSET ?", (categorie, rang)
+            )]
+            bas = voisins[0]
+            haut = voisins[1] if len(voisins) > 1 else bas
+            quantiles[niveau] = bas + (haut - bas) * (position - rang)
+        return quantiles
+
+    def boite_prix(self, categorie: str) -> Dict:
+        """
+        Quartiles et moustaches (1,5 × écart interquartile) des prix
+
+        Returns:
+            {'q1', 'mediane', 'q3', 'moustache_basse', 'moustache_haute'},
+            ou {} sans prix
+        """
+        quartiles = self.quantiles_prix(categorie)
+        if quartiles[0.5] is None:
+            return {}
+        ecart = quartiles[0.75] - quartiles[0.25]
+        basse, haute = self._requete(
+            "SELECT (SELECT MIN(prix_num) FROM annonces "
+            "        WHERE categorie = ? AND retiree_le IS NULL AND prix_num >= ?), "
+            "(SELECT MAX(prix_num) FROM annonces "
+            "        WHERE categorie = ? AND retiree_le IS NULL AND prix_num <= ?)",
+            (categorie, quartiles[0.25] - 1.5 * ecart, categorie, quartiles[0.75] + 1.5 * ecart)
+        )[0]
+        return {
+            'q1': quartiles[0.25],
+            'mediane': quartiles[0.5],
+            'q3': quartiles[0.75],
+            'moustache_basse': basse,
+            'moustache_haute': haute
+        }
+
+    def histogramme_prix(self, categorie: str, nb_classes: int = 30) -> pd.DataFrame:
+        """
+        Effectifs des prix par classes de même largeur
+
+        Returns:
+            DataFrame (debut, fin, nombre) : classes [debut, fin[, la dernière
+            incluant le prix maximal
+        """
+        minimum, maximum = self._requete(
+            "SELECT MIN(prix_num), MAX(prix_num) FROM annonces WHERE categorie = ? AND retiree_le IS NULL",
+            (categorie,)
+        )[0]
+        if minimum is None:
+            return pd.DataFrame(columns=['debut', 'fin', 'nombre'])
+        largeur = max((maximum - minimum) / nb_classes, 1)
+        classes = []
+        for classe in range(nb_classes):
+            debut, fin = minimum + classe * largeur, minimum + (classe + 1) * largeur
+            if debut > maximum:
+                break
+            # Plage de l'index (catégorie, prix)
+            nombre = self._requete(
+                "SELECT COUNT(*) FROM annonces "
+                "WHERE categorie = ? AND retiree_le IS NULL AND prix_num >= ? AND prix_num < ?",
+                (categorie, debut, fin if classe < nb_classes - 1 else maximum + 1)
+            )[0][0]
+            classes.append((debut, fin, nombre))
+        return pd.DataFrame(classes, columns=['debut', 'fin', 'nombre'])
+
+    def tranches_prix(self, categorie: str, bornes: Sequence[float], etiquettes: Sequence[str]) -> pd.Series:
+        """
+        Effectifs par tranche de prix, intervalles ]borne, borne suivante] comme pd.cut
+
+        Returns:
+            Series {étiquette: nombre}, par effectif décroissant
+        """
+        # Un comptage par plage de l'index (catégorie, prix) et par tranche
+        effectifs = {}
+        for etiquette, bas, haut in zip(etiquettes, bornes[:-1], bornes[1:]):
+            effectifs[etiquette] = self._requete(
+                "SELECT COUNT(*) FROM annonces "
+                "WHERE categorie = ? AND retiree_le IS NULL AND prix_num > ? AND prix_num <= ?",
+                (categorie, bas, haut if haut != float('inf') else 2 ** 62)
+            )[0][0]
+        return pd.Series(effectifs, name='count').sort_values(ascending=False, kind='stable')
+
+    def compter_par(self, categorie: str, colonne: str, limite: Optional[int] = None) -> pd.Series:
+        """
+        Nombre d'annonces par ville ou par type, comme value_counts
+
+        Args:
+            colonne: 'ville' ou 'type'
+            limite: Nombre de valeurs gardées (les plus fréquentes)
+        """
+        if colonne not in COLONNES_GROUPEMENT:
+            raise ValueError(f"Colonne de groupement inconnue: {colonne}")
+        lignes = self._requete(
+            f"SELECT {colonne}, COUNT(*) AS nombre FROM annonces "
+            f"WHERE categorie = ? AND retiree_le IS NULL AND {colonne} IS NOT NULL "
+            f"GROUP BY {colonne} ORDER BY nombre DESC, {colonne} LIMIT ?",
+            (categorie, limite if limite is not None else -1)
+        )
+        return pd.Series(
+            [nombre for _, nombre in lignes], index=[valeur for valeur, _ in lignes], name='count', dtype='int64'
+        )
+
+    def nombre_distinct(self, categorie: str, colonne: str) -> int:
+        """Nombre de villes ou de types distincts"""
+        if colonne not in COLONNES_GROUPEMENT:
+            raise ValueError(f"Colonne de groupement inconnue: {colonne}")
+        return self._requete(
+            f"SELECT COUNT(DISTINCT {colonne}) FROM annonces WHERE categorie = ? AND retiree_le IS NULL", (categorie,)
+        )[0][0]
+
+    def prix_par_ville(self, categorie: str, min_annonces: int = 3, limite: int = 10) -> pd.DataFrame:
+        """
+        Prix moyen des villes ayant au moins `min_annonces` prix
+
+        Returns:
+            DataFrame (ville, mean, count), par prix moyen décroissant
+        """
+        lignes = self._requete(
+            "SELECT ville, AVG(prix_num) AS moyenne, COUNT(prix_num) AS nombre FROM annonces "
+            "WHERE categorie = ? AND retiree_le IS NULL AND prix_num IS NOT NULL GROUP BY ville HAVING nombre >= ? "
+            "ORDER BY moyenne DESC LIMIT ?",
+            (categorie, min_annonces, limite)
+        )
+        return pd.DataFrame(lignes, columns=['ville', 'mean', 'count'])
+
+    def disponibilites(self, categorie: str) -> Dict[str, int]:
+        """
+        Annonces dont le prix, l'adresse sont renseignés
+
+        « Prix non disponible » n'a pas de prix numérique et « Adresse non
+        disponible » pas de ville : les index restreignent la vérification
+        à ces quelques lignes.
+        """
+        total, sans_prix, sans_adresse = self._requete(
+            "SELECT (SELECT COUNT(*) FROM annonces WHERE categorie = ? AND retiree_le IS NULL), "
+            "(SELECT COUNT(*) FROM annonces WHERE categorie = ? AND retiree_le IS NULL AND prix_num IS NULL "
+            "AND prix = 'Prix non disponible'), "
+            "(SELECT COUNT(*) FROM annonces WHERE categorie = ? AND retiree_le IS NULL AND ville = 'Non spécifié' "
+            "AND adresse = 'Adresse non disponible')",
+            (categorie, categorie, categorie)
+        )[0]
+        return {'prix': total - sans_prix, 'adresse': total - sans_adresse}
+
+    # ------------------------------------------------------------------
+    # Historique des prix
+    # ------------------------------------------------------------------
+
+    def trajectoire_prix(self, categorie: str, id_annonce) -> pd.DataFrame:
+        """
+        Prix successifs d'une annonce
+
+        Args:
+            id_annonce: Identifiant de l'annonce (ou clé d'empreinte)
+
+        Returns:
+            DataFrame (date, prix, prix_num), un point par changement puis un
+            dernier point à la dernière observation ; vide si l'annonce est inconnue
+        """
+        cle = str(id_annonce)
+        with self._verrou:
+            df = pd.read_sql_query(
+                "SELECT date, prix, prix_num FROM changements_prix WHERE categorie = ? AND cle = ? ORDER BY date",
+                self._connexion, params=(categorie, cle)
+            )
+            derniere = self._connexion.execute(
+                "SELECT derniere_vue, prix, prix_num FROM annonces WHERE categorie = ? AND cle = ?", (categorie, cle)
+            ).fetchone()
+        if derniere and len(df) and derniere[0] > df['date'].iloc[-1]:
+            df.loc[len(df)] = derniere
+        df['date'] = pd.to_datetime(df['date'], unit='s')
+        return df
+
+    def baisses_prix(self, categorie: str, limite: int = 20) -> pd.DataFrame:
+        """
+        Dernières baisses de prix, annonces retirées comprises
+
+        Returns:
+            DataFrame (id_annonce, type, ville, date, ancien_prix, nouveau_prix,
+            baisse_pct), de la plus récente à la plus ancienne
+        """
+        with self._verrou:
+            return pd.read_sql_query(
+                "SELECT a.id_annonce, a.type, a.ville, datetime(c.date, 'unixepoch') AS date, "
+                "c.ancien_prix, c.prix_num AS nouveau_prix, "
+                "ROUND(100.0 * (c.ancien_prix - c.prix_num) / c.ancien_prix, 1) AS baisse_pct "
+                "FROM (SELECT categorie, cle, date, prix_num, "
+                "      LAG(prix_num) OVER (PARTITION BY cle ORDER BY date) AS ancien_prix "
+                "      FROM changements_prix WHERE categorie = ?) c "
+                "JOIN annonces a ON a.categorie = c.categorie AND a.cle = c.cle "
+                "WHERE c.prix_num < c.ancien_prix ORDER BY c.date DESC LIMIT ?",
+                self._connexion, params=(categorie, limite)
+            )
+
+    def durees_en_ligne(self, categorie: str) -> pd.Series:
+        """Jours écoulés entre la première et la dernière observation de chaque annonce (retirées comprises)"""
+        lignes = self._requete(
+            "SELECT (derniere_vue - premiere_vue) / 86400.0 FROM annonces WHERE categorie = ?", (categorie,)
+        )
+        return pd.Series([ligne[0] for ligne in lignes], name='jours', dtype='float64')
+
+    def mediane_hebdomadaire(self, categorie: str, nb_types: int = 5) -> pd.DataFrame:
+        """
+        Prix médian par type de produit et par semaine
+
+        Une annonce compte dans chaque semaine (commençant le lundi) où elle
+        a été observée, au dernier prix connu à la fin de la semaine, même
+        si elle a été retirée depuis. Le calcul part des changements de
+        prix : son coût suit le nombre de changements, pas le nombre de
+        scrapings.
+
+        Args:
+            nb_types: Types de produits retenus (les plus fréquents de l'historique)
+
+        Returns:
+            DataFrame (semaine, type, mediane, annonces)
+        """
+        types = [type_produit for (type_produit,) in self._requete(
+            "SELECT type FROM annonces WHERE categorie = ? AND type IS NOT NULL "
+            "GROUP BY type ORDER BY COUNT(*) DESC, type LIMIT ?", (categorie, nb_types)
+        )]
+        if not types:
+            return pd.DataFrame(columns=['semaine', 'type', 'mediane', 'annonces'])
+        with self._verrou:
+            df = pd.read_sql_query(
+                f"SELECT c.cle, a.type, c.date, c.prix_num, a.premiere_vue, a.derniere_vue "
+                f"FROM changements_prix c JOIN annonces a ON a.categorie = c.categorie AND a.cle = c.cle "
+                f"WHERE c.categorie = ? AND a.type IN ({', '.join('?' * len(types))}) ORDER BY c.cle, c.date",
+                self._connexion, params=[categorie] + types
+            )
+        if df.empty:
+            return pd.DataFrame(columns=['semaine', 'type', 'mediane', 'annonces'])
+
+        # Segments [changement, changement suivant ou dernière observation] à prix constant
+        debut = pd.to_datetime(df['date'], unit='s')
+        suivant = df.groupby('cle')['date'].shift(-1)
+        fin = pd.to_datetime(suivant.fillna(df['derniere_vue']), unit='s')
+        semaine_debut = debut.dt.to_period('W-SUN').dt.start_time
+        semaine_fin = fin.dt.to_period('W-SUN').dt.start_time
+        df['semaine'] = [
+            pd.date_range(d, f, freq='W-MON') for d, f in zip(semaine_debut, semaine_fin)
+        ]
+        df['ordre'] = range(len(df))
+        semaines = df.explode('semaine')
+
+        # Dernier prix de chaque annonce dans la semaine
+        semaines = semaines.sort_values('ordre').drop_duplicates(['cle', 'semaine'], keep='last')
+        semaines = semaines.dropna(subset=['prix_num'])
+        resultat = semaines.groupby(['semaine', 'type'])['prix_num'].agg(['median', 'count']).reset_index()
+        return resultat.rename(columns={'median': 'mediane', 'count': 'annonces'})
+
+    def volume_historique(self, categorie: str) -> Dict[str, int]:
+        """Annonces suivies (dont retirées) et lignes de changements de prix"""
+        annonces, retirees, changements = self._requete(
+            "SELECT (SELECT COUNT(*) FROM annonces WHERE categorie = ?), "
+            "(SELECT COUNT(retiree_le) FROM annonces WHERE categorie = ?), "
+            "(SELECT COUNT(*) FROM changements_prix WHERE categorie = ?)",
+            (categorie, categorie, categorie)
+        )[0]
+        return {'annonces': annonces, 'retirees': retirees, 'changements': changements}
+
+    # ------------------------------------------------------------------
+    # Lecture des lignes
+    # ------------------------------------------------------------------
+
+    def _filtre_recherche(self, categorie: str, recherche: Optional[str]):
+        conditions, parametres = "categorie = ? AND retiree_le IS NULL", [categorie]
+        if recherche:
+            motif = '%' + recherche.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            colonnes = ['type', 'prix', 'adresse'] + COLONNES_TEXTE
+            conditions += " AND (" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in colonnes) + ")"
+            parametres += [motif] * len(colonnes)
+        return conditions, parametres
+
+    def compter(self, categorie: str, recherche: Optional[str] = None) -> int:
+        """Nombre d'annonces (contenant `recherche` si fourni, sans casse pour l'ASCII)"""
+        conditions, parametres = self._filtre_recherche(categorie, recherche)
+        return self._requete(f"SELECT COUNT(*) FROM annonces WHERE {conditions}", parametres)[0][0]
+
+    def lire(
+        self,
+        categorie: str,
+        type_col: str = 'type',
+        recherche: Optional[str] = None,
+        tri: Optional[str] = None,
+        limite: Optional[int] = None,
+        avec_image: bool = False
+    ) -> pd.DataFrame:
+        """
+        Annonces d'une catégorie au format du CSV nettoyé
+
+        Args:
+            type_col: Nom donné à la colonne du type de produit
+            recherche: Texte cherché dans tous les champs (LIKE : sans casse pour l'ASCII)
+            tri: Colonne de tri ('type', 'prix_num', 'adresse', 'ville', 'derniere_vue')
+            limite: Nombre maximal de lignes
+            avec_image: Seulement les annonces ayant un lien d'image
+
+        Returns:
+            DataFrame (type_col, prix, adresse, image_lien, puis les champs
+            de détail renseignés)
+        """
+        conditions, parametres = self._filtre_recherche(categorie, recherche)
+        if avec_image:
+            conditions += " AND image_lien IS NOT NULL AND image_lien != ''"
+        if tri is not None and tri not in COLONNES_TRI:
+            raise ValueError(f"Colonne de tri inconnue: {tri}")
+        ordre = f"{tri}, rowid" if tri else "rowid"
+        colonnes = ['type', 'prix', 'adresse'] + COLONNES_TEXTE
+        with self._verrou:
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(colonnes)} FROM annonces WHERE {conditions} ORDER BY {ordre} LIMIT ?",
+                self._connexion,
+                params=parametres + [limite if limite is not None else -1]
+            )
+        df = df.rename(columns={'type': type_col})
+        vides = [c for c in COLONNES_TEXTE[1:] if df[c].isna().all()]
+        return df.drop(columns=vides)
+
+    def get_stats(self) -> Dict:
+        """Annonces actives, catégories et écritures depuis l'ouverture"""
+        annonces, categories = self._requete(
+            "SELECT COUNT(*), COUNT(DISTINCT categorie) FROM annonces WHERE retiree_le IS NULL"
+        )[0]
+        return {'annonces': annonces, 'categories': categories, **self.stats}
+
+    def fermer(self):
+        """Ferme la connexion à la base"""
+        with self._verrou:
+            self._connexion.close()
@@ -0,0 +1,90 @@
+"""
+Détection des colonnes : dispositions d'export et cache des schémas
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Plusieurs dispositions d'un même export synthétique sont soumises à
+detecter_colonnes : en-tête simple, export Web Scraper complet (colonnes
+web-scraper-*, lien et son -href, texte alternatif « image » à côté de
+image-src) et en-têtes anonymes. On vérifie le mapping obtenu, puis on
+mesure la détection d'une disposition nouvelle (échantillon des premières
+lignes) et celle d'une disposition confirmée (cache des schémas), pour deux
+tailles de fichier : aucune des deux ne dépend du nombre de lignes.
+
+Usage:
+    python -m benchmarks.bench_detection_colonnes              # 10 000 et 1 000 000 lignes
+    python -m benchmarks.bench_detection_colonnes 50000 500000
+"""
+
+import logging
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks.bench_nettoyage import generer_export
+from benchmarks.bench_stockage import chronometrer
+from nettoyage_donnees import NettoyeurDonnees
+from schemas_colonnes import SchemasColonnes
+
+ATTENDU = {'type': 'titre', 'prix': 'prix', 'adresse': 'localisation', 'image': 'image-src'}
+
+
+def dispositions(export: pd.DataFrame) -> dict:
+    """{nom: (DataFrame brut, mapping attendu)}"""
+    web_scraper = pd.DataFrame({
+        'web-scraper-order': export['web-scraper-order'],
+        'web-scraper-start-url': export['web-scraper-start-url'],
+        'lien': "Voir l'annonce",
+        'lien-href': "https://sn.coinafrique.com/annonce/vetements/" + export.index.astype(str),
+        'titre': export['Titre'],
+        'prix': export['Prix'],
+        'localisation': export['Localisation'],
+        'image': "Photo de l'annonce",
+        'image-src': export['Image'],
+    })
+    anonymes = {'titre': 'champ1', 'prix': 'champ2', 'localisation': 'champ3', 'image': 'champ4', 'image-src': 'champ5'}
+    return {
+        'simple': (
+            export.drop(columns=['web-scraper-order', 'web-scraper-start-url']),
+            {'type': 'Titre', 'prix': 'Prix', 'adresse': 'Localisation', 'image': 'Image'}
+        ),
+        'web-scraper': (web_scraper, ATTENDU),
+        'anonyme': (
+            web_scraper.rename(columns=anonymes),
+            {role: anonymes[colonne] for role, colonne in ATTENDU.items()}
+        ),
+    }
+
+
+def main():
+    tailles = [int(t) for t in sys.argv[1:]] or [10_000, 1_000_000]
+    logging.disable(logging.INFO)
+
+    print("\n" + "=" * 70)
+    print("BENCHMARK DÉTECTION DES COLONNES - detecter_colonnes")
+    print("=" * 70)
+    print(f"{'Lignes':>10} | {'Disposition':<12} | {'Correcte':>8} | {'nouvelle ms':>11} | {'confirmée ms':>12}")
+    print("-" * 70)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        for nb_lignes in tailles:
+            export = generer_export(nb_lignes)
+            for nom, (df, attendu) in dispositions(export).items():
+                schemas = SchemasColonnes(os.path.join(dossier, f'schemas-{nb_lignes}.json'))
+                nettoyeur = NettoyeurDonnees(schemas=schemas)
+                mapping = nettoyeur.detecter_colonnes(df)
+                assert mapping == attendu, (nom, mapping)
+
+                duree_nouvelle = chronometrer(lambda: NettoyeurDonnees().detecter_colonnes(df))
+                schemas.confirmer(df.columns, mapping)
+                duree_confirmee = chronometrer(lambda: nettoyeur.detecter_colonnes(df))
+                print(f"{len(df):>10,} | {nom:<12} | {'oui':>8} | {duree_nouvelle * 1000:>11.2f} | "
+                      f"{duree_confirmee * 1000:>12.3f}")
+
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Débit de l'enrichissement par pages de détail sur un serveur local
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Mesure le nombre de pages de détail par seconde selon le nombre de
+workers, avec une latence serveur simulée et sans limitation de débit.
+
+Usage: python -m benchmarks.bench_enrichissement
+"""
+
+import logging
+import os
+import tempfile
+
+from benchmarks.serveur_local import ServeurLocal
+from enrichissement import EnrichisseurDetails
+from scraper_coinafrique import CoinAfriqueScraper
+
+WORKERS = [1, 2, 4, 8, 16]
+LATENCE = 0.05
+NB_ANNONCES = 120
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK ENRICHISSEMENT - {NB_ANNONCES} pages, latence {LATENCE * 1000:.0f} ms")
+    print("=" * 60)
+    print(f"{'Workers':>8} | {'Pages/s':>8} | {'Échecs':>6} | Champs remplis")
+    print("-" * 60)
+
+    with ServeurLocal(latence=LATENCE) as serveur, tempfile.TemporaryDirectory() as dossier:
+        for workers in WORKERS:
+            scraper = CoinAfriqueScraper(intervalle_min=0, options_rythme={'debit_max': float('inf')})
+            enrichisseur = EnrichisseurDetails(
+                scraper, workers=workers, chemin=os.path.join(dossier, f"details_{workers}.sqlite")
+            )
+            annonces = [
+                {'lien': f"{serveur.url}/annonce/vetements-homme/chemise-{5_000_000 + i}"}
+                for i in range(NB_ANNONCES)
+            ]
+            enrichisseur.enrichir(annonces)
+            stats = enrichisseur.get_stats()
+            remplis = sum(1 for a in annonces if a['description'] and a['vendeur'] and a['images'])
+            print(f"{workers:>8} | {stats['pages_par_seconde']:>8.1f} | {stats['echecs']:>6} | "
+                  f"{remplis}/{NB_ANNONCES}")
+            enrichisseur.fermer()
+
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
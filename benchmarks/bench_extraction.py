@@ -0,0 +1,75 @@
+"""
+Benchmark de l'extraction des annonces d'une page (scraper_une_page)
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Compare l'extraction historique lien par lien à l'extraction en une passe
+sur des pages synthétiques de taille croissante. L'extraction historique
+produit une annonce par lien (doublons, liens prix pris pour des titres) ;
+chaque annonce de l'extraction en une passe est comparée à la première
+annonce historique de même lien dont le titre n'est pas un prix. Les
+seules différences attendues concernent les cartes sans adresse et les
+adresses sans virgule (« Dakar Sénégal ») : l'extraction historique leur
+attribue l'adresse de la carte suivante.
+
+Usage: python -m benchmarks.bench_extraction
+"""
+
+import time
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from benchmarks.generateur_pages import generer_page
+from scraper_coinafrique import CoinAfriqueScraper, RE_TITRE_PRIX
+
+TAILLES = [10, 25, 50, 100, 200, 400]
+
+
+def mesurer(fonction: Callable, soup: BeautifulSoup, repetitions: int) -> float:
+    """Temps moyen d'un appel (secondes)"""
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction(soup)
+    return (time.perf_counter() - debut) / repetitions
+
+
+def main():
+    scraper = CoinAfriqueScraper()
+
+    print("\n" + "=" * 78)
+    print("BENCHMARK EXTRACTION - scraper_une_page")
+    print("=" * 78)
+    print(f"{'Cartes':>7} | {'Historique (ms)':>15} | {'Une passe (ms)':>14} | "
+          f"{'µs/carte hist.':>14} | {'µs/carte 1 passe':>16} | Identiques")
+    print("-" * 78)
+
+    for nb_cartes in TAILLES:
+        soup = BeautifulSoup(generer_page(nb_cartes, graine=nb_cartes), 'html.parser')
+        repetitions = max(1, 200 // nb_cartes)
+
+        historique = scraper._scraper_une_page_historique(soup)
+        une_passe = scraper.scraper_une_page(soup)
+        reference = {}
+        for annonce in historique:
+            if not RE_TITRE_PRIX.match(annonce['type']):
+                reference.setdefault(annonce['lien'], annonce)
+        identiques = sum(1 for annonce in une_passe if reference.get(annonce['lien']) == annonce)
+
+        t_hist = mesurer(scraper._scraper_une_page_historique, soup, repetitions)
+        t_passe = mesurer(scraper.scraper_une_page, soup, repetitions)
+
+        print(f"{nb_cartes:>7} | {t_hist * 1000:>15.1f} | {t_passe * 1000:>14.1f} | "
+              f"{t_hist / nb_cartes * 1e6:>14.0f} | {t_passe / nb_cartes * 1e6:>16.0f} | "
+              f"{identiques}/{len(une_passe)}")
+
+    print("-" * 78)
+    print("Règles d'extraction (toutes les pages mesurées)")
+    for stats in scraper.regles.get_stats():
+        print(f"  {stats['champ'] + '/' + stats['regle']:<36} {stats['taux_correspondance'] * 100:>5.1f}% "
+              f"({stats['correspondances']}/{stats['evaluations']})  {stats['duree_ms']:>8.1f} ms")
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Nettoyage d'un export Web Scraper : moteur vectorisé ou .apply
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Un export brut synthétique (titres avec espaces parasites, prix « 15 000 F
+CFA » ou « Prix négociable », adresses en casse variable, liens relatifs,
+doublons) est nettoyé par les deux moteurs de nettoyer_dataframe. On
+vérifie que les résultats et les statistiques sont identiques avant de
+comparer les durées.
+
+Usage:
+    python -m benchmarks.bench_nettoyage                    # 10 000, 100 000 et 1 000 000 lignes
+    python -m benchmarks.bench_nettoyage 50000
+"""
+
+import logging
+import random
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.bench_stockage import TYPES, VILLES
+from nettoyage_donnees import NettoyeurDonnees
+
+ETATS = ['neuf', 'occasion', 'homme', 'slim']
+
+
+def generer_export(nb_lignes: int, graine: int = 0) -> pd.DataFrame:
+    """Export brut au format Web Scraper, avec les défauts rencontrés en pratique"""
+    rng = random.Random(graine)
+    lignes = []
+    for i in range(nb_lignes):
+        tirage = rng.random()
+        if tirage < 0.04:
+            prix = rng.choice(["Prix sur demande", "Prix négociable", "Appeler le vendeur"])
+        elif tirage < 0.06:
+            prix = None
+        elif tirage < 0.5:
+            prix = f"{rng.randint(1, 400) * 500:,} F CFA".replace(',', rng.choice([' ', '\xa0', '.']))
+        else:
+            prix = f"  {rng.randint(1, 400) * 500} CFA"
+
+        ville = rng.choice(VILLES)
+        adresse = rng.choice([f"{ville}, Sénégal", f"{ville.upper()},  senegal", f" {ville.lower()} , Senegal"])
+        titre = f"{rng.choice(TYPES)}  {rng.choice(ETATS)}" if rng.random() > 0.02 else rng.choice(["", "Jo"])
+        lignes.append({
+            'web-scraper-order': f"{1700000000 + i}-{i}",
+            'web-scraper-start-url': "https://sn.coinafrique.com/categorie/vetements-homme",
+            'Titre': titre if rng.random() > 0.3 else f"\n{titre}\t",
+            'Prix': prix,
+            'Localisation': adresse if rng.random() > 0.05 else None,
+            'Image': rng.choice(["/img/", "//images.coinafrique.com/", "https://images.coinafrique.com/"])
+                     + f"{rng.randint(0, nb_lignes)}.jpg"
+        })
+    # Pages rescrapées : une partie des lignes apparaît deux fois
+    df = pd.DataFrame(lignes)
+    return pd.concat([df, df.sample(frac=0.05, random_state=graine)], ignore_index=True)
+
+
+def chronometrer_moteur(df: pd.DataFrame, moteur: str):
+    """(durée en secondes, DataFrame nettoyé, statistiques)"""
+    nettoyeur = NettoyeurDonnees()
+    debut = time.perf_counter()
+    resultat = nettoyeur.nettoyer_dataframe(df, 'vetements', moteur=moteur)
+    return time.perf_counter() - debut, resultat, nettoyeur.get_stats()
+
+
+def main():
+    tailles = [int(t) for t in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    logging.disable(logging.INFO)
+
+    print("\n" + "=" * 62)
+    print("BENCHMARK NETTOYAGE - nettoyer_dataframe")
+    print("=" * 62)
+    print(f"{'Lignes':>10} | {'apply s':>9} | {'vectorisé s':>11} | {'Accélération':>12} | {'Identique':>9}")
+    print("-" * 62)
+
+    for nb_lignes in tailles:
+        df = generer_export(nb_lignes)
+        duree_apply, resultat_apply, stats_apply = chronometrer_moteur(df, 'apply')
+        duree_vectorise, resultat_vectorise, stats_vectorise = chronometrer_moteur(df, 'vectorise')
+        identique = resultat_apply.equals(resultat_vectorise) and stats_apply == stats_vectorise
+        assert identique, "Les deux moteurs donnent des résultats différents"
+
+        print(f"{len(df):>10,} | {duree_apply:>9.2f} | {duree_vectorise:>11.2f} | "
+              f"{duree_apply / duree_vectorise:>11.1f}x | {'oui' if identique else 'NON':>9}")
+
+    print("=" * 62 + "\n")
+
+
+if __name__ == "__main__":
+    main()
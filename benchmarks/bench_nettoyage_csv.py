@@ -0,0 +1,95 @@
+"""
+Mémoire du nettoyage d'un gros export : DataFrame entier ou par blocs
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Un export Web Scraper synthétique est écrit sur disque puis nettoyé :
+- memoire : read_csv du fichier entier puis nettoyer_dataframe et to_csv
+  (ancienne page d'import) ;
+- blocs-N : nettoyer_csv avec un budget de N Mo.
+Chaque mesure tourne dans un processus neuf : on relève le pic de mémoire
+résidente (VmHWM, remis à zéro une fois les modules importés) au-delà de
+la mémoire de départ, et on vérifie que les fichiers produits sont
+identiques. Linux uniquement (/proc).
+
+Usage:
+    python -m benchmarks.bench_nettoyage_csv                 # 1 000 000 lignes, budgets 64, 128 et 256 Mo
+    python -m benchmarks.bench_nettoyage_csv 2000000 32 64
+"""
+
+import filecmp
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_nettoyage import generer_export
+from nettoyage_donnees import NettoyeurDonnees
+
+
+def memoire_ko(champ: str) -> int:
+    """Champ mémoire de /proc/self/status (VmRSS, VmHWM) en Ko"""
+    with open('/proc/self/status') as f:
+        for ligne in f:
+            if ligne.startswith(champ + ':'):
+                return int(ligne.split()[1])
+    return 0
+
+
+def mesurer(mode: str, budget_mo: int, fichier_brut: str, fichier_sortie: str, resultats):
+    """Nettoie le fichier dans ce processus ; renvoie (durée, pic en Mo au-delà du départ)"""
+    logging.disable(logging.INFO)
+    # Le pic de mémoire repart de la mémoire actuelle
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    depart = memoire_ko('VmRSS')
+    debut = time.perf_counter()
+    nettoyeur = NettoyeurDonnees()
+    if mode == 'memoire':
+        df = nettoyeur.nettoyer_dataframe(pd.read_csv(fichier_brut, dtype=str), 'vetements')
+        df.to_csv(fichier_sortie, index=False, encoding='utf-8-sig')
+    else:
+        nettoyeur.nettoyer_csv(fichier_brut, fichier_sortie, 'vetements', memoire_max_mo=budget_mo)
+    duree = time.perf_counter() - debut
+    pic = memoire_ko('VmHWM')
+    resultats.put((duree, (pic - depart) / 1024))
+
+
+def main():
+    nb_lignes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    budgets = [int(b) for b in sys.argv[2:]] or [64, 128, 256]
+    contexte = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as dossier:
+        fichier_brut = os.path.join(dossier, 'export.csv')
+        generer_export(nb_lignes).to_csv(fichier_brut, index=False)
+        taille_mo = os.path.getsize(fichier_brut) / 1024 / 1024
+
+        print("\n" + "=" * 60)
+        print(f"BENCHMARK NETTOYAGE CSV - {nb_lignes:,} lignes, {taille_mo:,.0f} Mo")
+        print("=" * 60)
+        print(f"{'Mode':<12} | {'Durée s':>8} | {'Pic Mo':>8} | {'Identique':>9}")
+        print("-" * 60)
+
+        reference = os.path.join(dossier, 'memoire.csv')
+        for mode, budget in [('memoire', 0)] + [('blocs', b) for b in budgets]:
+            sortie = reference if mode == 'memoire' else os.path.join(dossier, f'blocs-{budget}.csv')
+            resultats = contexte.Queue()
+            processus = contexte.Process(target=mesurer, args=(mode, budget, fichier_brut, sortie, resultats))
+            processus.start()
+            duree, pic = resultats.get()
+            processus.join()
+
+            nom = mode if mode == 'memoire' else f"blocs-{budget}"
+            identique = filecmp.cmp(reference, sortie, shallow=False)
+            print(f"{nom:<12} | {duree:>8.2f} | {pic:>8.0f} | {'oui' if identique else 'NON':>9}")
+
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Nettoyage parallèle : passage à l'échelle avec le nombre de processus
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Le même export synthétique est nettoyé par nettoyer_dataframe avec 1, 2,
+4 et 8 processus. Les lignes sont réparties en partitions consécutives,
+nettoyées dans un pool puis recollées ; doublons et lignes invalides sont
+retirés sur l'ensemble. On vérifie que résultat et statistiques sont
+identiques au nettoyage sur un seul processus, et on relève l'accélération
+(bornée par le nombre de cœurs affiché).
+
+Usage:
+    python -m benchmarks.bench_nettoyage_parallele                # 1 000 000 lignes, 1/2/4/8 processus
+    python -m benchmarks.bench_nettoyage_parallele 500000 1 2
+"""
+
+import logging
+import os
+import sys
+
+from benchmarks.bench_nettoyage import generer_export
+from benchmarks.bench_stockage import chronometrer
+from nettoyage_donnees import NettoyeurDonnees
+
+
+def main():
+    nb_lignes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    nombres_workers = [int(w) for w in sys.argv[2:]] or [1, 2, 4, 8]
+    logging.disable(logging.INFO)
+
+    df = generer_export(nb_lignes)
+    reference = NettoyeurDonnees()
+    resultat_reference = reference.nettoyer_dataframe(df, 'vetements', workers=1)
+
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK NETTOYAGE PARALLÈLE - {len(df):,} lignes, {os.cpu_count()} cœur(s)")
+    print("=" * 60)
+    print(f"{'Processus':>9} | {'Durée s':>8} | {'Accélération':>12} | {'Identique':>9}")
+    print("-" * 60)
+
+    durees = {}
+    for workers in nombres_workers:
+        nettoyeur = NettoyeurDonnees()
+        resultat = nettoyeur.nettoyer_dataframe(df, 'vetements', workers=workers)
+        identique = resultat.equals(resultat_reference) and nettoyeur.get_stats() == reference.get_stats()
+        assert identique, f"Résultat différent avec {workers} processus"
+
+        durees[workers] = chronometrer(
+            lambda: NettoyeurDonnees().nettoyer_dataframe(df, 'vetements', workers=workers), repetitions=3
+        )
+        base = durees.get(1, durees[nombres_workers[0]])
+        print(f"{workers:>9} | {durees[workers]:>8.2f} | {base / durees[workers]:>11.2f}x | "
+              f"{'oui' if identique else 'NON':>9}")
+
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
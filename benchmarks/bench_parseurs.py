@@ -0,0 +1,78 @@
+"""
+Comparaison du débit des parseurs HTML sur les mêmes pages sauvegardées
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Chaque combinaison parseur / parsing restreint est chronométrée sur le même
+jeu de pages (parsing + extraction) et ses annonces sont comparées à celles
+de la référence html.parser complet.
+
+Usage:
+    python -m benchmarks.bench_parseurs                 # pages synthétiques
+    python -m benchmarks.bench_parseurs dossier_pages/  # pages .html sauvegardées
+    python -m benchmarks.bench_parseurs data/archive/pages.sqlite  # pages archivées
+"""
+
+import glob
+import os
+import sys
+import time
+from typing import List
+
+from archive_html import ArchiveHTML
+from benchmarks.generateur_pages import generer_page
+from parseurs_html import backends_disponibles
+from scraper_coinafrique import CoinAfriqueScraper
+
+
+def charger_pages(dossier: str = None, nb_pages: int = 20, nb_cartes: int = 60) -> List[bytes]:
+    """Pages .html d'un dossier ou d'une archive, ou pages synthétiques à défaut"""
+    if dossier and dossier.endswith('.sqlite'):
+        archive = ArchiveHTML(dossier)
+        pages = [ArchiveHTML.decompresser(capture['contenu_compresse']) for capture in archive.captures()]
+        archive.fermer()
+        return pages
+    if dossier:
+        fichiers = sorted(glob.glob(os.path.join(dossier, '*.html')))
+        pages = []
+        for fichier in fichiers:
+            with open(fichier, 'rb') as f:
+                pages.append(f.read())
+        return pages
+    return [generer_page(nb_cartes, graine=i).encode('utf-8') for i in range(nb_pages)]
+
+
+def main():
+    pages = charger_pages(sys.argv[1] if len(sys.argv) > 1 else None)
+    if not pages:
+        print("Aucune page à analyser.")
+        return
+
+    reference = CoinAfriqueScraper()
+    annonces_reference = [reference.extraire_annonces(page) for page in pages]
+
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK PARSEURS - {len(pages)} pages")
+    print("=" * 70)
+    print(f"{'Parseur':<14} | {'Restreint':<9} | {'Pages/s':>8} | {'ms/page':>8} | Annonces identiques")
+    print("-" * 70)
+
+    for backend in backends_disponibles():
+        options = [False] if backend in ('html5lib', 'selectolax') else [False, True]
+        for restreindre in options:
+            scraper = CoinAfriqueScraper(parseur=backend, restreindre_parsing=restreindre)
+
+            debut = time.perf_counter()
+            resultats = [scraper.extraire_annonces(page) for page in pages]
+            duree = time.perf_counter() - debut
+
+            identiques = sum(1 for a, b in zip(annonces_reference, resultats) if a == b)
+            print(f"{backend:<14} | {'oui' if restreindre else 'non':<9} | "
+                  f"{len(pages) / duree:>8.1f} | {duree / len(pages) * 1000:>8.1f} | "
+                  f"{identiques}/{len(pages)} pages")
+
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
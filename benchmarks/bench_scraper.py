@@ -0,0 +1,271 @@
+"""
+Suite de benchmarks du scraper sur des pages synthétiques et un serveur local
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Trois mesures, sans jamais solliciter le site réel :
+- scraper_une_page : temps de parsing et d'extraction d'une page selon le
+  nombre de cartes et le parseur ;
+- scraper_page : pages par seconde de bout en bout contre le serveur local,
+  selon la latence, le taux d'erreurs et la concurrence ;
+- scraper_toutes_categories : durée totale de plusieurs catégories selon le
+  nombre de catégories simultanées.
+
+Les résultats sont écrits en JSON dans benchmarks/resultats/<commit>.json
+pour comparer deux commits.
+
+Usage:
+    python -m benchmarks.bench_scraper                    # suite complète
+    python -m benchmarks.bench_scraper --rapide           # tailles réduites
+    python -m benchmarks.bench_scraper --comparer benchmarks/resultats/a1b2c3d.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from benchmarks.generateur_pages import generer_page
+from benchmarks.serveur_local import ServeurLocal
+from parseurs_html import backends_disponibles, construire_soup
+import scraper_coinafrique
+from scraper_coinafrique import CoinAfriqueScraper
+
+DOSSIER_RESULTATS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultats')
+
+# Rythme sans plafond réaliste : on mesure le scraper, pas la politesse envers le site
+OPTIONS_RYTHME = {
+    'debit_min': 5.0,
+    'debit_max': 1000.0,
+    'delai_base': 0.01,
+    'delai_max': 0.1,
+    'budget_reessais': 10_000
+}
+
+# (nom, latence en s, taux d'erreur, concurrence, processus de parsing)
+SCENARIOS_PAGES = [
+    ('sequentiel', 0.01, 0.0, 1, 0),
+    ('concurrent', 0.01, 0.0, 4, 0),
+    ('erreurs_10pct', 0.01, 0.1, 4, 0),
+    ('pipeline', 0.01, 0.0, 4, os.cpu_count() or 1),
+]
+
+
+def informations_environnement() -> Dict:
+    """Commit, date et machine de la mesure"""
+    racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=racine, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        modifie = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=racine, capture_output=True, text=True
+        ).stdout.strip()
+        if modifie:
+            commit += '-modifie'
+    except (OSError, subprocess.CalledProcessError):
+        commit = 'inconnu'
+    return {
+        'commit': commit,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plateforme': platform.platform(),
+        'coeurs': os.cpu_count()
+    }
+
+
+def bench_une_page(tailles: List[int], repetitions: int) -> List[Dict]:
+    """Parsing et extraction d'une page, médiane de `repetitions` mesures"""
+    resultats = []
+    for parseur in backends_disponibles():
+        scraper = CoinAfriqueScraper(parseur=parseur)
+        for nb_cartes in tailles:
+            contenu = generer_page(nb_cartes, graine=nb_cartes).encode('utf-8')
+            durees_parsing, durees_extraction = [], []
+            for _ in range(repetitions):
+                debut = time.perf_counter()
+                soup = construire_soup(contenu, parseur)
+                milieu = time.perf_counter()
+                annonces = scraper.scraper_une_page(soup)
+                fin = time.perf_counter()
+                durees_parsing.append(milieu - debut)
+                durees_extraction.append(fin - milieu)
+
+            parsing = statistics.median(durees_parsing)
+            extraction = statistics.median(durees_extraction)
+            resultats.append({
+                'parseur': parseur,
+                'cartes': nb_cartes,
+                'annonces': len(annonces),
+                'parsing_ms': round(parsing * 1000, 3),
+                'extraction_ms': round(extraction * 1000, 3),
+                'total_ms': round((parsing + extraction) * 1000, 3),
+                'us_par_carte': round((parsing + extraction) / nb_cartes * 1e6, 1)
+            })
+    return resultats
+
+
+def bench_scraper_page(nb_pages: int, cartes_par_page: int) -> List[Dict]:
+    """Pages par seconde de scraper_page contre le serveur local"""
+    resultats = []
+    for nom, latence, taux_erreur, concurrence, workers_parsing in SCENARIOS_PAGES:
+        with ServeurLocal(latence, nb_pages, cartes_par_page, taux_erreur=taux_erreur) as serveur:
+            scraper = CoinAfriqueScraper(
+                intervalle_min=0.005, options_rythme=OPTIONS_RYTHME, workers_parsing=workers_parsing
+            )
+            url = f"{serveur.url}/categorie/vetements-homme"
+            # Le pool de processus est créé avant la mesure
+            if workers_parsing:
+                scraper.pool_parsing().submit(time.sleep, 0).result()
+
+            debut = time.perf_counter()
+            annonces = scraper.scraper_page(url, nb_pages + 1, concurrence=concurrence)
+            duree = time.perf_counter() - debut
+            stats_rythme = scraper.limiteurs.rythme(url).get_stats()
+            scraper.fermer()
+
+            resultats.append({
+                'scenario': nom,
+                'latence_ms': latence * 1000,
+                'taux_erreur': taux_erreur,
+                'concurrence': concurrence,
+                'workers_parsing': workers_parsing,
+                'pages': nb_pages,
+                'annonces': len(annonces),
+                'duree_s': round(duree, 3),
+                'pages_par_seconde': round(nb_pages / duree, 2),
+                'erreurs_servies': serveur.erreurs,
+                'reessais': stats_rythme['reessais'],
+                'abandons': stats_rythme['abandons']
+            })
+    return resultats
+
+
+def bench_toutes_categories(nb_categories: int, nb_pages: int, cartes_par_page: int, workers: List[int]) -> List[Dict]:
+    """Durée de scraper_toutes_categories selon le nombre de catégories simultanées"""
+    resultats = []
+    repertoire = os.getcwd()
+    categories_origine = dict(scraper_coinafrique.CATEGORIES)
+
+    with ServeurLocal(0.01, nb_pages, cartes_par_page) as serveur, tempfile.TemporaryDirectory() as dossier:
+        # Catégories synthétiques et CSV écrits dans un dossier temporaire
+        noms = [f"bench_{i}" for i in range(nb_categories)]
+        for nom in noms:
+            scraper_coinafrique.CATEGORIES[nom] = {
+                'nom': nom, 'url': f"{serveur.url}/categorie/{nom}", 'type_col': 'type_habits'
+            }
+        os.chdir(dossier)
+        try:
+            for nb_workers in workers:
+                scraper = CoinAfriqueScraper(intervalle_min=0.005, options_rythme=OPTIONS_RYTHME)
+                debut = time.perf_counter()
+                dataframes = scraper.scraper_toutes_categories(
+                    nb_pages + 1, workers=nb_workers, concurrence=2, categories=noms
+                )
+                duree = time.perf_counter() - debut
+                resultats.append({
+                    'categories': nb_categories,
+                    'workers': nb_workers,
+                    'pages_par_categorie': nb_pages,
+                    'annonces': sum(len(df) for df in dataframes.values()),
+                    'duree_s': round(duree, 3)
+                })
+        finally:
+            os.chdir(repertoire)
+            scraper_coinafrique.CATEGORIES.clear()
+            scraper_coinafrique.CATEGORIES.update(categories_origine)
+    return resultats
+
+
+def aplatir(mesures: Dict) -> Dict[str, Tuple[float, bool]]:
+    """
+    Métrique principale de chaque mesure, pour la comparaison
+
+    Returns:
+        {identifiant: (valeur, plus_grand_est_meilleur)}
+    """
+    resultats = mesures['resultats']
+    metriques = {}
+    for r in resultats.get('scraper_une_page', []):
+        metriques[f"scraper_une_page/{r['parseur']}/{r['cartes']} cartes (ms)"] = (r['total_ms'], False)
+    for r in resultats.get('scraper_page', []):
+        metriques[f"scraper_page/{r['scenario']} (pages/s)"] = (r['pages_par_seconde'], True)
+    for r in resultats.get('scraper_toutes_categories', []):
+        metriques[f"scraper_toutes_categories/{r['workers']} workers (s)"] = (r['duree_s'], False)
+    return metriques
+
+
+def comparer(reference: Dict, courant: Dict):
+    """Affiche l'évolution de chaque métrique entre deux séries de mesures"""
+    avant, apres = aplatir(reference), aplatir(courant)
+    print(f"\nComparaison {reference['commit']} -> {courant['commit']}")
+    print("-" * 78)
+    for cle, (valeur, plus_grand_meilleur) in apres.items():
+        if cle not in avant or not avant[cle][0]:
+            print(f"{cle:<52} {valeur:>10}   (nouveau)")
+            continue
+        ecart = (valeur - avant[cle][0]) / avant[cle][0] * 100
+        amelioration = ecart > 0 if plus_grand_meilleur else ecart < 0
+        signe = '=' if abs(ecart) < 10 else ('✓' if amelioration else '✗')
+        print(f"{cle:<52} {avant[cle][0]:>10} -> {valeur:>10} {ecart:+6.1f}% {signe}")
+    print("-" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du scraper")
+    parser.add_argument('--rapide', action='store_true', help="Tailles réduites (contrôle rapide)")
+    parser.add_argument('--comparer', help="Fichier JSON de référence à comparer aux mesures")
+    parser.add_argument('--sortie', help="Fichier JSON des résultats (benchmarks/resultats/<commit>.json par défaut)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    if args.rapide:
+        tailles, repetitions, nb_pages, nb_categories = [20, 60], 3, 8, 2
+    else:
+        tailles, repetitions, nb_pages, nb_categories = [20, 60, 120], 7, 20, 4
+
+    mesures = informations_environnement()
+    print(f"\nBenchmarks du scraper - commit {mesures['commit']}, {mesures['coeurs']} cœurs")
+
+    debut = time.perf_counter()
+    mesures['resultats'] = {
+        'scraper_une_page': bench_une_page(tailles, repetitions),
+        'scraper_page': bench_scraper_page(nb_pages, 40),
+        'scraper_toutes_categories': bench_toutes_categories(nb_categories, nb_pages // 2, 40, [1, nb_categories])
+    }
+    mesures['duree_totale_s'] = round(time.perf_counter() - debut, 1)
+
+    print(f"\n{'Parseur':<12} | {'Cartes':>6} | {'Parsing ms':>10} | {'Extraction ms':>13} | {'µs/carte':>8}")
+    for r in mesures['resultats']['scraper_une_page']:
+        print(f"{r['parseur']:<12} | {r['cartes']:>6} | {r['parsing_ms']:>10.2f} | "
+              f"{r['extraction_ms']:>13.2f} | {r['us_par_carte']:>8.1f}")
+
+    print(f"\n{'Scénario':<14} | {'Pages/s':>8} | {'Annonces':>8} | {'Erreurs':>7} | {'Réessais':>8}")
+    for r in mesures['resultats']['scraper_page']:
+        print(f"{r['scenario']:<14} | {r['pages_par_seconde']:>8.1f} | {r['annonces']:>8} | "
+              f"{r['erreurs_servies']:>7} | {r['reessais']:>8}")
+
+    print(f"\n{'Catégories':>10} | {'Workers':>7} | {'Durée s':>8} | {'Annonces':>8}")
+    for r in mesures['resultats']['scraper_toutes_categories']:
+        print(f"{r['categories']:>10} | {r['workers']:>7} | {r['duree_s']:>8.2f} | {r['annonces']:>8}")
+
+    sortie = args.sortie or os.path.join(DOSSIER_RESULTATS, f"{mesures['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(sortie)), exist_ok=True)
+    with open(sortie, 'w', encoding='utf-8') as f:
+        json.dump(mesures, f, ensure_ascii=False, indent=2)
+    print(f"\nRésultats écrits dans {sortie}")
+
+    if args.comparer:
+        with open(args.comparer, encoding='utf-8') as f:
+            comparer(json.load(f), mesures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Comparaison du chargement CSV et Parquet pour le tableau de bord
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Le même jeu d'annonces synthétiques est écrit en CSV nettoyé et dans
+l'entrepôt Parquet (réparti sur plusieurs jours de scraping). On
+chronomètre :
+- csv : read_csv puis calcul de prix_num et ville comme le tableau de bord ;
+- parquet : charger_categorie (prix entier et ville déjà stockés) ;
+- parquet_filtre : une ville et une tranche de prix, filtres poussés
+  jusqu'aux fichiers ;
+- ajout_jour : ajout d'un jour de données (l'historique n'est pas réécrit).
+
+Usage:
+    python -m benchmarks.bench_stockage            # 100 000 annonces
+    python -m benchmarks.bench_stockage 1000000
+"""
+
+import glob
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from entrepot_parquet import EntrepotParquet
+
+VILLES = ['Dakar', 'Pikine', 'Guédiawaye', 'Rufisque', 'Thiès', 'Mbour', 'Saint-Louis', 'Ziguinchor']
+TYPES = ['Chemise', 'Jean', 'T-shirt', 'Costume', 'Boubou', 'Veste', 'Short', 'Pull']
+
+
+def generer_annonces(nb_lignes: int, graine: int = 0) -> pd.DataFrame:
+    """Annonces au format du CSV nettoyé (prix texte, adresse « Ville, Sénégal »)"""
+    rng = random.Random(graine)
+    lignes = []
+    for i in range(nb_lignes):
+        tirage = rng.random()
+        if tirage < 0.05:
+            prix = "Prix sur demande"
+        elif tirage < 0.08:
+            prix = "Prix non disponible"
+        else:
+            prix = f"{rng.randint(1, 400) * 500} CFA"
+        lignes.append({
+            'type_habits': f"{rng.choice(TYPES)} {rng.choice(['neuf', 'occasion', 'homme', 'slim'])}",
+            'prix': prix,
+            'adresse': f"{rng.choice(VILLES)}, Sénégal" if rng.random() > 0.1 else "Adresse non disponible",
+            'image_lien': f"https://images.coinafrique.com/{graine}_{i}.jpg",
+            'id_annonce': graine * 10_000_000 + i
+        })
+    return pd.DataFrame(lignes)
+
+
+def preparer_csv(df: pd.DataFrame) -> pd.DataFrame:
+    """Préparation faite par le tableau de bord sur le CSV"""
+    df['prix_num'] = df['prix'].apply(lambda x:
+        float(re.sub(r'[^\d]', '', str(x))) if 'demande' not in str(x).lower() and re.sub(r'[^\d]', '', str(x)) else None
+    )
+    df['ville'] = df['adresse'].apply(lambda x:
+        x.split(',')[0].strip() if isinstance(x, str) and ',' in x else 'Non spécifié'
+    )
+    return df
+
+
+def chronometrer(fonction, repetitions: int = 5) -> float:
+    """Médiane des durées en secondes"""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return statistics.median(durees)
+
+
+def main():
+    nb_lignes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nb_jours = 7
+    par_jour = nb_lignes // nb_jours
+
+    with tempfile.TemporaryDirectory() as dossier:
+        fichier_csv = os.path.join(dossier, 'vetements_homme_nettoye.csv')
+        entrepot = EntrepotParquet(os.path.join(dossier, 'parquet'))
+        debut_historique = date(2026, 1, 1)
+
+        jours = [generer_annonces(par_jour, graine=j) for j in range(nb_jours)]
+        pd.concat(jours).drop(columns=['id_annonce']).to_csv(fichier_csv, index=False, encoding='utf-8-sig')
+        for j, df_jour in enumerate(jours):
+            entrepot.ecrire_dataframe(
+                'vetements_homme', df_jour, 'type_habits', debut_historique + timedelta(days=j), source='scraping'
+            )
+
+        mesures = {
+            'csv': chronometrer(lambda: preparer_csv(pd.read_csv(fichier_csv))),
+            'parquet': chronometrer(lambda: entrepot.charger_categorie('vetements_homme', 'type_habits')),
+            'parquet_filtre': chronometrer(lambda: entrepot.charger_categorie(
+                'vetements_homme', 'type_habits', villes=['Thiès'], prix_min=10_000, prix_max=50_000
+            )),
+        }
+
+        nouveau_jour = generer_annonces(par_jour, graine=nb_jours)
+        historique = glob.glob(os.path.join(entrepot.racine, 'categorie=*', 'date_scrape=*', '*.parquet'))
+        fichiers_avant = {f: os.path.getmtime(f) for f in historique}
+        debut = time.perf_counter()
+        entrepot.ecrire_dataframe(
+            'vetements_homme', nouveau_jour, 'type_habits', debut_historique + timedelta(days=nb_jours)
+        )
+        mesures['ajout_jour'] = time.perf_counter() - debut
+        reecrits = sum(1 for f, mtime in fichiers_avant.items() if os.path.getmtime(f) != mtime)
+
+        taille_csv = os.path.getsize(fichier_csv)
+        stats = entrepot.get_stats()
+
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK STOCKAGE - {par_jour * nb_jours:,} annonces sur {nb_jours} jours")
+    print("=" * 60)
+    print(f"{'Mesure':<16} | {'Durée ms':>10} | {'vs CSV':>8}")
+    print("-" * 60)
+    for nom, duree in mesures.items():
+        rapport = f"{duree / mesures['csv'] * 100:.0f}%" if nom != 'ajout_jour' else ''
+        print(f"{nom:<16} | {duree * 1000:>10.1f} | {rapport:>8}")
+    print("-" * 60)
+    print(f"Taille CSV: {taille_csv / 1024:,.0f} Ko - Parquet: {stats['octets'] / 1024:,.0f} Ko "
+          f"({stats['fichiers']} fichiers)")
+    print(f"Fichiers réécrits par l'ajout d'un jour: {reecrits}")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
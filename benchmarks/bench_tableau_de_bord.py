@@ -0,0 +1,92 @@
+"""
+Coût d'un rafraîchissement du tableau de bord : pandas sur CSV ou SQL
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Le tableau de bord recalcule ses agrégations à chaque interaction
+(répartition par ville et par produit, quartiles, tranches de prix, prix
+moyen par ville, disponibilités). On chronomètre ces agrégations :
+- pandas : lecture du CSV nettoyé, préparation et calculs en mémoire ;
+- sql : mêmes résultats calculés par BaseAnnonces sur ses index.
+
+Usage:
+    python -m benchmarks.bench_tableau_de_bord                  # 100 000 et 300 000 annonces
+    python -m benchmarks.bench_tableau_de_bord 50000 500000
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from base_annonces import BaseAnnonces
+from benchmarks.bench_stockage import chronometrer, generer_annonces, preparer_csv
+
+BORNES = [0, 5000, 10000, 20000, 50000, float('inf')]
+ETIQUETTES = ['0-5K', '5K-10K', '10K-20K', '20K-50K', '50K+']
+
+
+def agregations_pandas(fichier_csv: str) -> dict:
+    """Agrégations telles que le tableau de bord les faisait sur le CSV"""
+    df = preparer_csv(pd.read_csv(fichier_csv))
+    prix_valides = df['prix_num'].dropna()
+    df_ville_prix = df.dropna(subset=['prix_num']).groupby('ville')['prix_num'].agg(['mean', 'count']).reset_index()
+    return {
+        'villes': df['ville'].value_counts().head(10),
+        'produits': df['type_habits'].value_counts().head(15),
+        'resume': (prix_valides.mean(), prix_valides.min(), prix_valides.max(), prix_valides.std()),
+        'quartiles': prix_valides.quantile([0.25, 0.5, 0.75]),
+        'tranches': pd.cut(prix_valides, bins=BORNES, labels=ETIQUETTES).value_counts(),
+        'prix_par_ville': df_ville_prix[df_ville_prix['count'] >= 3].nlargest(10, 'mean'),
+        'disponibilites': (len(df[df['prix'] != 'Prix non disponible']),
+                           len(df[df['adresse'] != 'Adresse non disponible']))
+    }
+
+
+def agregations_sql(base: BaseAnnonces, categorie: str) -> dict:
+    """Mêmes agrégations, exécutées par la base"""
+    return {
+        'villes': base.compter_par(categorie, 'ville', limite=10),
+        'produits': base.compter_par(categorie, 'type', limite=15),
+        'resume': base.resume_prix(categorie),
+        'quartiles': base.quantiles_prix(categorie),
+        'tranches': base.tranches_prix(categorie, BORNES, ETIQUETTES),
+        'prix_par_ville': base.prix_par_ville(categorie, min_annonces=3, limite=10),
+        'disponibilites': base.disponibilites(categorie)
+    }
+
+
+def main():
+    tailles = [int(t) for t in sys.argv[1:]] or [100_000, 300_000]
+
+    print("\n" + "=" * 64)
+    print("BENCHMARK TABLEAU DE BORD - agrégations par rafraîchissement")
+    print("=" * 64)
+    print(f"{'Annonces':>10} | {'pandas ms':>10} | {'SQL ms':>8} | {'Accélération':>12} | {'Upsert s':>8}")
+    print("-" * 64)
+
+    for nb_lignes in tailles:
+        with tempfile.TemporaryDirectory() as dossier:
+            df = generer_annonces(nb_lignes)
+            fichier_csv = os.path.join(dossier, 'vetements_homme_nettoye.csv')
+            df.drop(columns=['id_annonce']).to_csv(fichier_csv, index=False, encoding='utf-8-sig')
+
+            base = BaseAnnonces(os.path.join(dossier, 'annonces.sqlite'))
+            debut = time.perf_counter()
+            base.upsert_dataframe('vetements_homme', df, 'type_habits')
+            duree_upsert = time.perf_counter() - debut
+
+            duree_pandas = chronometrer(lambda: agregations_pandas(fichier_csv), repetitions=3)
+            duree_sql = chronometrer(lambda: agregations_sql(base, 'vetements_homme'), repetitions=3)
+            base.fermer()
+
+        print(f"{nb_lignes:>10,} | {duree_pandas * 1000:>10.0f} | {duree_sql * 1000:>8.0f} | "
+              f"{duree_pandas / duree_sql:>11.1f}x | {duree_upsert:>8.2f}")
+
+    print("=" * 64 + "\n")
+
+
+if __name__ == "__main__":
+    main()
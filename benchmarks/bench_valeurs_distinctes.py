@@ -0,0 +1,77 @@
+"""
+Nettoyage des valeurs distinctes : temps de calcul et mémoire du résultat
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Sur un export synthétique, chaque colonne est nettoyée :
+- lignes : noyau Arrow sur toutes les lignes, résultat texte ;
+- distinctes : nettoyer_*_colonne ; titres, prix et adresses sont
+  factorisés, chaque valeur distincte est nettoyée une fois et la colonne
+  renvoyée est catégorielle. Les liens d'images, presque tous distincts,
+  restent nettoyés ligne par ligne.
+On vérifie que les valeurs sont identiques, puis on compare les durées et
+la mémoire des colonnes nettoyées (memory_usage(deep=True)), ainsi que
+celle du DataFrame complet de nettoyer_dataframe.
+
+Usage:
+    python -m benchmarks.bench_valeurs_distinctes            # 1 000 000 lignes
+    python -m benchmarks.bench_valeurs_distinctes 200000
+"""
+
+import logging
+import sys
+
+import pandas as pd
+
+from benchmarks.bench_nettoyage import generer_export
+from benchmarks.bench_stockage import chronometrer
+from nettoyage_donnees import (
+    NettoyeurDonnees, _noyau_adresse, _noyau_image_lien, _noyau_prix, _noyau_texte
+)
+
+COLONNES = [
+    ('Titre', NettoyeurDonnees.nettoyer_texte, _noyau_texte, NettoyeurDonnees.nettoyer_texte_colonne),
+    ('Prix', NettoyeurDonnees.nettoyer_prix, _noyau_prix, NettoyeurDonnees.nettoyer_prix_colonne),
+    ('Localisation', NettoyeurDonnees.nettoyer_adresse, _noyau_adresse, NettoyeurDonnees.nettoyer_adresse_colonne),
+    ('Image', NettoyeurDonnees.nettoyer_image_lien, _noyau_image_lien, NettoyeurDonnees.nettoyer_image_lien_colonne),
+]
+
+
+def mo(objet) -> float:
+    """Mémoire d'une Series ou d'un DataFrame en Mo, chaînes comprises"""
+    octets = objet.memory_usage(deep=True, index=False)
+    return (octets.sum() if isinstance(octets, pd.Series) else octets) / 1024 / 1024
+
+
+def main():
+    nb_lignes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    logging.disable(logging.INFO)
+    df = generer_export(nb_lignes).astype('str')
+
+    print("\n" + "=" * 78)
+    print(f"BENCHMARK VALEURS DISTINCTES - {len(df):,} lignes")
+    print("=" * 78)
+    print(f"{'Colonne':<13} | {'Distinctes':>10} | {'lignes s':>8} | {'distinctes s':>12} | "
+          f"{'lignes Mo':>9} | {'distinctes Mo':>13}")
+    print("-" * 78)
+
+    for colonne, fonction, noyau, nettoyer_colonne in COLONNES:
+        serie = df[colonne]
+        par_ligne = NettoyeurDonnees._nettoyer_valeurs(serie, fonction, noyau, textuelle=True)
+        distinctes = nettoyer_colonne(serie)
+        assert (par_ligne.to_numpy() == distinctes.astype(object).to_numpy()).all(), colonne
+
+        duree_lignes = chronometrer(lambda: NettoyeurDonnees._nettoyer_valeurs(serie, fonction, noyau, textuelle=True))
+        duree_distinctes = chronometrer(lambda: nettoyer_colonne(serie))
+        print(f"{colonne:<13} | {serie.nunique(dropna=False):>10,} | {duree_lignes:>8.3f} | "
+              f"{duree_distinctes:>12.3f} | {mo(par_ligne):>9.1f} | {mo(distinctes):>13.1f}")
+
+    resultat = NettoyeurDonnees().nettoyer_dataframe(df, 'vetements')
+    print("-" * 78)
+    print(f"DataFrame nettoyé : {mo(resultat.astype('str')):.1f} Mo en texte, "
+          f"{mo(resultat):.1f} Mo avec les colonnes catégorielles")
+    print("=" * 78 + "\n")
+
+
+if __name__ == "__main__":
+    main()
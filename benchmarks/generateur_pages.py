@@ -0,0 +1,151 @@
+"""
+Générateur de pages de listing synthétiques au format CoinAfrique
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import random
+from typing import List
+
+TYPES = ['Chemise', 'T-shirt Nike', 'Jean Levis', 'Basket Adidas', 'Costume africain',
+         'Sandales cuir', 'Boubou brodé', 'Polo Lacoste', 'Mocassins', 'Survêtement Puma']
+VILLES = ['Dakar', 'Thiès', 'Rufisque', 'Pikine', 'Mbour', 'Saint-Louis', 'Guédiawaye', 'Ziguinchor']
+
+# Variantes de balisage rencontrées sur le site, couvertes par les
+# différentes méthodes de repli de l'extraction historique :
+# - prix_dans_lien : prix et adresse dans le lien (méthodes 2)
+# - adresse_soeur : adresse voisine du lien (méthodes 3 et 4)
+# - prix_div_precedente : prix dans une div qui précède le lien (méthode 1)
+# - fcfa_sans_accent : prix « FCFA », adresse « Senegal » sans accent
+# - adresse_sans_virgule : « Dakar Sénégal », sans la virgule de la regex
+# - lien_ad : lien en /ad/ et image relative en data-lazy-src
+VARIANTES = ['standard', 'prix_dans_lien', 'adresse_soeur', 'sur_demande', 'sans_adresse', 'image_differee',
+             'prix_div_precedente', 'fcfa_sans_accent', 'adresse_sans_virgule', 'lien_ad']
+
+
+def generer_carte(id_annonce: int, variante: str, rng: random.Random) -> str:
+    """Retourne le HTML d'une carte d'annonce"""
+    titre = rng.choice(TYPES)
+    prix = f"{rng.randint(1, 150)} {rng.randint(0, 9)}00 CFA"
+    adresse = f"{rng.choice(VILLES)}, Sénégal"
+    lien = f"/annonce/vetements-homme/{titre.lower().replace(' ', '-')}-{id_annonce}"
+    image = f"https://images.coinafrique.com/{id_annonce}_1.jpg"
+
+    if variante == 'prix_dans_lien':
+        return (
+            f'<div class="col s6 m4 l3"><div class="card ad__card">'
+            f'<a class="card-image ad__card-image" href="{lien}"><img class="ad__card-img" src="{image}"></a>'
+            f'<a href="{lien}"><div class="ad__card-description">{titre}</div>'
+            f'<span class="ad__card-price">{prix}</span>'
+            f'<p class="ad__card-location">{adresse}</p></a>'
+            f'</div></div>'
+        )
+    if variante == 'adresse_soeur':
+        return (
+            f'<div class="col s6 m4 l3"><div class="card ad__card">'
+            f'<p class="ad__card-price">{prix}</p>'
+            f'<a href="{lien}" title="{titre}"><img src="{image}"> {titre}</a>'
+            f'<p class="ad__card-location"><span>location_on</span> {adresse}</p>'
+            f'</div></div>'
+        )
+
+    if variante == 'prix_div_precedente':
+        return (
+            f'<div class="col s6 m4 l3"><div class="card ad__card">'
+            f'<div class="ad__card-price">{prix}</div>'
+            f'<div class="ad__card-content"><a href="{lien}"><img src="{image}"><div>{titre}</div></a>'
+            f'<div class="ad__card-location">{adresse}</div></div>'
+            f'</div></div>'
+        )
+    if variante == 'lien_ad':
+        lien = lien.replace('/annonce/', '/ad/')
+
+    if variante == 'sur_demande':
+        prix = "Prix sur demande CFA"
+    elif variante == 'fcfa_sans_accent':
+        prix = prix.replace(' CFA', ' FCFA')
+        adresse = adresse.replace('Sénégal', 'Senegal')
+    elif variante == 'adresse_sans_virgule':
+        adresse = adresse.replace(', ', ' ')
+    if variante == 'image_differee':
+        balise_image = f'<img class="ad__card-img lazy" data-src="/media/{id_annonce}.jpg">'
+    elif variante == 'lien_ad':
+        balise_image = f'<img class="ad__card-img lazy" data-lazy-src="/media/{id_annonce}_lazy.jpg">'
+    else:
+        balise_image = f'<img class="ad__card-img" src="{image}" alt="{titre}">'
+    localisation = '' if variante == 'sans_adresse' else (
+        f'<p class="ad__card-location"><span class="material-icons">location_on</span>'
+        f'<span>{adresse}</span></p>'
+    )
+
+    return (
+        f'<div class="col s6 m4 l3"><div class="card ad__card round small hoverable">'
+        f'<div class="card-image waves-effect waves-block waves-light">'
+        f'<a class="card-image ad__card-image waves-block waves-light" href="{lien}">{balise_image}</a>'
+        f'</div>'
+        f'<div class="card-content ad__card-content">'
+        f'<p class="ad__card-price"><a href="{lien}">{prix}</a></p>'
+        f'<p class="ad__card-description"><a href="{lien}" title="{titre}">{titre}</a></p>'
+        f'{localisation}'
+        f'</div></div></div>'
+    )
+
+
+def generer_page(nb_cartes: int = 50, graine: int = 0, variantes: List[str] = None, premier_id: int = None) -> str:
+    """
+    Génère une page de listing complète (en-tête, grille de cartes, pied de page)
+
+    Args:
+        nb_cartes: Nombre de cartes d'annonce
+        graine: Graine aléatoire (pages reproductibles)
+        variantes: Variantes de balisage à mélanger (toutes par défaut)
+        premier_id: Identifiant de la première annonce (dérivé de la graine par défaut)
+    """
+    rng = random.Random(graine)
+    variantes = variantes or VARIANTES
+    premier_id = premier_id if premier_id is not None else 4_000_000 + graine * 10_000
+
+    cartes = [
+        generer_carte(premier_id + i, variantes[i % len(variantes)], rng)
+        for i in range(nb_cartes)
+    ]
+
+    return (
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+        '<title>Vêtements homme au Sénégal | CoinAfrique</title>'
+        '<script>window.dataLayer = window.dataLayer || [];</script>'
+        '<style>.card{margin:0}</style></head><body>'
+        '<header><nav><a href="/">CoinAfrique</a><a href="/publier">Vendre</a></nav></header>'
+        '<main><div class="container"><div class="row adcard__listing">'
+        + ''.join(cartes) +
+        '</div><ul class="pagination"><li><a href="?page=2">2</a></li></ul></div></main>'
+        '<footer><p>© CoinAfrique - Achetez et vendez au Sénégal</p></footer>'
+        '<script src="/static/app.js"></script></body></html>'
+    )
+
+
+def generer_page_detail(id_annonce: int, nb_images: int = 4) -> str:
+    """Génère la page de détail d'une annonce"""
+    rng = random.Random(id_annonce)
+    titre = rng.choice(TYPES)
+    images = ''.join(
+        f'<div class="swiper-slide" style="background-image: url(https://images.coinafrique.com/{id_annonce}_{i}.jpg)"></div>'
+        for i in range(1, nb_images + 1)
+    )
+    return (
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+        f'<title>{titre} | CoinAfrique</title>'
+        f'<meta property="og:image" content="https://images.coinafrique.com/{id_annonce}_1.jpg">'
+        '</head><body><header><nav><a href="/">CoinAfrique</a></nav></header>'
+        f'<div class="swiper-wrapper">{images}</div>'
+        '<div class="ad__info">'
+        f'<h1 class="title title-ad">{titre}</h1>'
+        f'<p class="price">{rng.randint(1, 150)} 000 CFA</p>'
+        f'<span class="valign-wrapper" data-tooltip="Date de publication">il y a {rng.randint(1, 23)} heures</span>'
+        f'<span class="valign-wrapper"><span>{rng.choice(VILLES)}, Sénégal</span></span>'
+        '<div class="ad__info__box ad__info__box-descriptions">'
+        f'<p>{titre} en très bon état, taille {rng.choice(["S", "M", "L", "XL", "42", "44"])}. '
+        'Livraison possible partout à Dakar.</p></div></div>'
+        f'<div class="profile-card__content"><p class="username">Boutique {rng.choice(VILLES)}</p></div>'
+        '<footer><p>© CoinAfrique</p></footer></body></html>'
+    )
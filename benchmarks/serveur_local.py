@@ -0,0 +1,119 @@
+"""
+Serveur HTTP local imitant sn.coinafrique.com pour les benchmarks
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Sert des pages de catégorie (/categorie/<nom>?page=N) et des pages de
+détail (/annonce/<categorie>/<titre>-<id>) synthétiques, avec une latence
+et une part de réponses en erreur configurables.
+"""
+
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.generateur_pages import generer_page, generer_page_detail
+
+RE_PAGE = re.compile(r'[?&]page=(\d+)')
+RE_DETAIL = re.compile(r'^/(?:annonce|ad)/.*?(\d+)/?$')
+
+
+class ServeurLocal:
+    """Serveur de pages synthétiques lancé dans un thread"""
+
+    def __init__(
+        self,
+        latence: float = 0.0,
+        nb_pages: int = 10,
+        cartes_par_page: int = 40,
+        taux_erreur: float = 0.0,
+        statut_erreur: int = 503,
+        graine: int = 0
+    ):
+        """
+        Args:
+            latence: Délai ajouté à chaque réponse (secondes)
+            nb_pages: Nombre de pages non vides par catégorie
+            cartes_par_page: Nombre d'annonces par page de catégorie
+            taux_erreur: Part des requêtes qui reçoivent statut_erreur
+            statut_erreur: Statut des réponses en erreur (503, 429, 500...)
+            graine: Graine du tirage des erreurs (scénarios reproductibles)
+        """
+        self.latence = latence
+        self.nb_pages = nb_pages
+        self.cartes_par_page = cartes_par_page
+        self.taux_erreur = taux_erreur
+        self.statut_erreur = statut_erreur
+        self._rng = random.Random(graine)
+        self.requetes = 0
+        self.erreurs = 0
+        self._verrou = threading.Lock()
+        self._serveur = ThreadingHTTPServer(('127.0.0.1', 0), self._gestionnaire())
+        self._serveur.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._serveur.server_port}"
+
+    def _gestionnaire(self):
+        serveur = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with serveur._verrou:
+                    serveur.requetes += 1
+                    en_erreur = serveur._rng.random() < serveur.taux_erreur
+                    if en_erreur:
+                        serveur.erreurs += 1
+                if serveur.latence:
+                    time.sleep(serveur.latence)
+                if en_erreur:
+                    statut, corps = serveur.statut_erreur, '<html><body>Service indisponible</body></html>'
+                else:
+                    statut, corps = serveur.reponse(self.path)
+                corps = corps.encode('utf-8')
+                self.send_response(statut)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        return Gestionnaire
+
+    def reponse(self, chemin: str):
+        """Statut et HTML servis pour un chemin"""
+        detail = RE_DETAIL.match(chemin.split('?')[0])
+        if detail:
+            return 200, generer_page_detail(int(detail.group(1)))
+
+        if chemin.startswith('/categorie/'):
+            correspondance = RE_PAGE.search(chemin)
+            page = int(correspondance.group(1)) if correspondance else 1
+            if page > self.nb_pages:
+                return 200, '<html><body><p>Aucune annonce</p></body></html>'
+            graine = zlib.crc32(chemin.split('?')[0].encode()) % 1000 * 1000 + page
+            return 200, generer_page(self.cartes_par_page, graine=graine)
+
+        return 404, '<html><body>Introuvable</body></html>'
+
+    def demarrer(self) -> 'ServeurLocal':
+        self._thread = threading.Thread(target=self._serveur.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def arreter(self):
+        self._serveur.shutdown()
+        self._serveur.server_close()
+
+    def __enter__(self):
+        return self.demarrer()
+
+    def __exit__(self, *args):
+        self.arreter()
@@ -0,0 +1,226 @@
+"""
+Cache disque des réponses HTTP du scraper CoinAfrique
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class CacheHTTP:
+    """
+    Cache persistant des pages, indexé par URL
+
+    Chaque entrée conserve le corps de la page, ses en-têtes ETag et
+    Last-Modified, l'empreinte SHA-256 du HTML et les annonces qui en ont été
+    extraites, avec l'empreinte des règles d'extraction qui les ont produites.
+    Une page revalidée (304) ou dont l'empreinte n'a pas changé n'est donc
+    ni re-téléchargée ni re-parsée, tant que les règles sont les mêmes. La
+    taille totale, tenue à jour à chaque écriture, est bornée par éviction
+    LRU.
+    """
+
+    def __init__(self, chemin: str = 'data/cache/http.sqlite', taille_max: int = 200 * 1024 * 1024):
+        """
+        Args:
+            chemin: Fichier SQLite du cache
+            taille_max: Taille maximale des corps stockés (octets)
+        """
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self.taille_max = taille_max
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.execute("""
+            CREATE TABLE IF NOT EXISTS reponses (
+                url TEXT PRIMARY KEY,
+                corps BLOB NOT NULL,
+                taille INTEGER NOT NULL,
+                empreinte TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                annonces TEXT,
+                version_annonces TEXT,
+                dernier_acces REAL NOT NULL
+            )
+        """)
+        colonnes = {ligne[1] for ligne in self._connexion.execute("PRAGMA table_info(reponses)")}
+        if 'version_annonces' not in colonnes:
+            # Cache antérieur aux empreintes de règles : ses annonces ne seront pas reprises
+            self._connexion.execute("ALTER TABLE reponses ADD COLUMN version_annonces TEXT")
+        self._connexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_reponses_acces ON reponses (dernier_acces)"
+        )
+        self._connexion.commit()
+        self._taille_totale = self._connexion.execute(
+            "SELECT COALESCE(SUM(taille), 0) FROM reponses"
+        ).fetchone()[0]
+
+        self.stats = {
+            'hits_304': 0,
+            'hits_empreinte': 0,
+            'misses': 0,
+            'parses_evites': 0,
+            'octets_economises': 0,
+            'evictions': 0
+        }
+
+    @staticmethod
+    def empreinte(contenu: bytes) -> str:
+        """Empreinte SHA-256 du contenu d'une page"""
+        return hashlib.sha256(contenu).hexdigest()
+
+    def entetes_conditionnels(self, url: str) -> Dict[str, str]:
+        """En-têtes If-None-Match / If-Modified-Since pour revalider une URL"""
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT etag, last_modified FROM reponses WHERE url = ?", (url,)
+            ).fetchone()
+
+        entetes = {}
+        if ligne:
+            etag, last_modified = ligne
+            if etag:
+                entetes['If-None-Match'] = etag
+            if last_modified:
+                entetes['If-Modified-Since'] = last_modified
+        return entetes
+
+    def non_modifiee(self, url: str, version: Optional[str] = None) -> Optional[Tuple[bytes, Optional[List[Dict]]]]:
+        """
+        Traite une réponse 304 : la page en cache est toujours valide
+
+        Args:
+            url: URL revalidée
+            version: Empreinte des règles d'extraction en vigueur
+
+        Returns:
+            (corps en cache, annonces extraites avec ces règles ou None), ou
+            None si l'entrée a été évincée entre-temps
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT corps, annonces, version_annonces FROM reponses WHERE url = ?", (url,)
+            ).fetchone()
+            if not ligne:
+                return None
+            corps, annonces, version_annonces = ligne
+            if version_annonces != version:
+                annonces = None
+            self._toucher(url)
+            self.stats['hits_304'] += 1
+            self.stats['octets_economises'] += len(corps)
+            if annonces is not None:
+                self.stats['parses_evites'] += 1
+
+        return corps, json.loads(annonces) if annonces is not None else None
+
+    def enregistrer_reponse(
+        self,
+        url: str,
+        contenu: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        version: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Enregistre une réponse 200
+
+        Args:
+            version: Empreinte des règles d'extraction en vigueur
+
+        Returns:
+            Les annonces déjà extraites si le HTML est identique à celui en
+            cache et les règles inchangées (le parsing peut être évité),
+            sinon None
+        """
+        empreinte = self.empreinte(contenu)
+
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT empreinte, annonces, version_annonces, taille FROM reponses WHERE url = ?", (url,)
+            ).fetchone()
+
+            if ligne and ligne[0] == empreinte:
+                # Contenu inchangé : on garde les annonces, on rafraîchit les validateurs
+                self._connexion.execute(
+                    "UPDATE reponses SET etag = ?, last_modified = ?, dernier_acces = ? WHERE url = ?",
+                    (etag, last_modified, time.time(), url)
+                )
+                self._connexion.commit()
+                self.stats['hits_empreinte'] += 1
+                if ligne[1] is not None and ligne[2] == version:
+                    self.stats['parses_evites'] += 1
+                    return json.loads(ligne[1])
+                return None
+
+            self.stats['misses'] += 1
+            self._connexion.execute(
+                """INSERT OR REPLACE INTO reponses
+                   (url, corps, taille, empreinte, etag, last_modified, annonces, version_annonces, dernier_acces)
+                   VALUES (?, ?, ?, ?, ?, ?, NULL, NULL, ?)""",
+                (url, contenu, len(contenu), empreinte, etag, last_modified, time.time())
+            )
+            self._taille_totale += len(contenu) - (ligne[3] if ligne else 0)
+            self._evincer()
+            self._connexion.commit()
+
+        return None
+
+    def enregistrer_annonces(self, url: str, annonces: List[Dict], version: Optional[str] = None):
+        """Associe à la page en cache les annonces extraites avec les règles d'empreinte `version`"""
+        with self._verrou:
+            self._connexion.execute(
+                "UPDATE reponses SET annonces = ?, version_annonces = ? WHERE url = ?",
+                (json.dumps(annonces, ensure_ascii=False), version, url)
+            )
+            self._connexion.commit()
+
+    def taille_totale(self) -> int:
+        """Taille cumulée des corps en cache (octets)"""
+        with self._verrou:
+            return self._taille_totale
+
+    def get_stats(self) -> Dict:
+        """Retourne les compteurs du cache"""
+        with self._verrou:
+            stats = self.stats.copy()
+        requetes = stats['hits_304'] + stats['hits_empreinte'] + stats['misses']
+        stats['taux_hit'] = (stats['hits_304'] + stats['hits_empreinte']) / requetes if requetes else 0.0
+        return stats
+
+    def fermer(self):
+        """Ferme la connexion SQLite"""
+        with self._verrou:
+            self._connexion.close()
+
+    def _toucher(self, url: str):
+        self._connexion.execute(
+            "UPDATE reponses SET dernier_acces = ? WHERE url = ?", (time.time(), url)
+        )
+        self._connexion.commit()
+
+    def _evincer(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de taille_max"""
+        if self._taille_totale <= self.taille_max:
+            return
+
+        for url, taille in self._connexion.execute(
+            "SELECT url, taille FROM reponses ORDER BY dernier_acces ASC"
+        ).fetchall():
+            if self._taille_totale <= self.taille_max:
+                break
+            self._connexion.execute("DELETE FROM reponses WHERE url = ?", (url,))
+            self._taille_totale -= taille
+            self.stats['evictions'] += 1
+
+        logging.debug(f"Cache HTTP après éviction: {self._taille_totale} octets")
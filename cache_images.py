@@ -0,0 +1,267 @@
+"""
+Cache local des images d'annonces, adressé par contenu
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+import requests
+
+from limiteur_debit import LimiteursParHote
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+class CacheImages:
+    """
+    Télécharge les images des annonces et les stocke sous leur empreinte
+
+    Deux liens qui servent la même image partagent une seule entrée : la
+    miniature est générée une fois par empreinte SHA-256. Les liens en
+    échec sont mémorisés comme cassés. L'espace disque des miniatures est
+    borné par un quota, avec éviction des moins récemment consultées.
+    """
+
+    def __init__(
+        self,
+        dossier: str = 'data/images',
+        quota_octets: int = 200 * 1024 * 1024,
+        workers: int = 8,
+        taille_miniature: tuple = (240, 240),
+        limiteurs: Optional[LimiteursParHote] = None
+    ):
+        """
+        Args:
+            dossier: Dossier des miniatures et de l'index
+            quota_octets: Espace disque maximal des miniatures
+            workers: Téléchargements simultanés
+            taille_miniature: Boîte englobante des miniatures (pixels)
+            limiteurs: Limiteurs par hôte à partager (sinon 10 requêtes/s par hôte)
+        """
+        self.dossier = dossier
+        self.quota_octets = quota_octets
+        self.workers = max(1, workers)
+        self.taille_miniature = taille_miniature
+        self.limiteurs = limiteurs or LimiteursParHote(intervalle_min=0.1)
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+
+        if Image is None:
+            logging.warning("Pillow non installé : les images seront stockées sans redimensionnement")
+
+        os.makedirs(os.path.join(dossier, 'miniatures'), exist_ok=True)
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(os.path.join(dossier, 'index.sqlite'), check_same_thread=False)
+        self._connexion.executescript("""
+            CREATE TABLE IF NOT EXISTS liens (
+                url TEXT PRIMARY KEY,
+                empreinte TEXT,
+                casse INTEGER NOT NULL DEFAULT 0,
+                erreur TEXT,
+                date_verification REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS images (
+                empreinte TEXT PRIMARY KEY,
+                taille INTEGER NOT NULL,
+                dernier_acces REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_images_acces ON images (dernier_acces);
+        """)
+        self._connexion.commit()
+
+        self.stats = {
+            'telechargements': 0,
+            'doublons_contenu': 0,
+            'liens_casses': 0,
+            'evictions': 0
+        }
+
+    def _compter(self, cle: str):
+        with self._verrou:
+            self.stats[cle] += 1
+
+    def _chemin(self, empreinte: str) -> str:
+        return os.path.join(self.dossier, 'miniatures', empreinte[:2], f"{empreinte}.jpg")
+
+    def _miniature(self, contenu: bytes) -> bytes:
+        """Réduit l'image à la taille des miniatures (JPEG)"""
+        if Image is None:
+            return contenu
+        with Image.open(io.BytesIO(contenu)) as image:
+            image = image.convert('RGB')
+            image.thumbnail(self.taille_miniature)
+            sortie = io.BytesIO()
+            image.save(sortie, format='JPEG', quality=80, optimize=True)
+            return sortie.getvalue()
+
+    def _traiter(self, url: str):
+        """Télécharge une image et enregistre sa miniature (exécuté dans un worker)"""
+        try:
+            self.limiteurs.pour(url).attendre()
+            response = self.session.get(url, timeout=15)
+            response.raise_for_status()
+            contenu = response.content
+            empreinte = hashlib.sha256(contenu).hexdigest()
+            self._compter('telechargements')
+
+            with self._verrou:
+                deja_stockee = self._connexion.execute(
+                    "SELECT 1 FROM images WHERE empreinte = ?", (empreinte,)
+                ).fetchone()
+
+            if deja_stockee and os.path.exists(self._chemin(empreinte)):
+                self._compter('doublons_contenu')
+            else:
+                miniature = self._miniature(contenu)
+                chemin = self._chemin(empreinte)
+                os.makedirs(os.path.dirname(chemin), exist_ok=True)
+                with open(chemin, 'wb') as f:
+                    f.write(miniature)
+                with self._verrou:
+                    self._connexion.execute(
+                        "INSERT OR REPLACE INTO images (empreinte, taille, dernier_acces) VALUES (?, ?, ?)",
+                        (empreinte, len(miniature), time.time())
+                    )
+
+            with self._verrou:
+                self._connexion.execute(
+                    "INSERT OR REPLACE INTO liens (url, empreinte, casse, erreur, date_verification) VALUES (?, ?, 0, NULL, ?)",
+                    (url, empreinte, time.time())
+                )
+                self._connexion.commit()
+
+        except Exception as e:
+            self._compter('liens_casses')
+            with self._verrou:
+                self._connexion.execute(
+                    "INSERT OR REPLACE INTO liens (url, empreinte, casse, erreur, date_verification) VALUES (?, NULL, 1, ?, ?)",
+                    (url, str(e)[:200], time.time())
+                )
+                self._connexion.commit()
+
+    def telecharger(self, urls: Iterable[str], reverifier_casses: bool = False) -> Dict:
+        """
+        Met en cache les images qui ne le sont pas encore
+
+        Args:
+            urls: Liens d'images (doublons et valeurs vides ignorés)
+            reverifier_casses: Retenter les liens déjà marqués cassés
+
+        Returns:
+            Statistiques du cache
+        """
+        urls = [u for u in dict.fromkeys(urls) if isinstance(u, str) and u.startswith('http')]
+
+        with self._verrou:
+            connus = {
+                url: (empreinte, casse)
+                for url, empreinte, casse in self._connexion.execute("SELECT url, empreinte, casse FROM liens")
+            }
+
+        a_traiter = []
+        for url in urls:
+            if url not in connus:
+                a_traiter.append(url)
+            else:
+                empreinte, casse = connus[url]
+                if casse and reverifier_casses:
+                    a_traiter.append(url)
+                elif not casse and not os.path.exists(self._chemin(empreinte)):
+                    # Miniature évincée : à re-télécharger
+                    a_traiter.append(url)
+
+        if a_traiter:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(self._traiter, a_traiter))
+            self._evincer()
+
+        return self.get_stats()
+
+    def chemin_miniature(self, url: str) -> Optional[str]:
+        """Chemin local de la miniature d'un lien, ou None si absente"""
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT empreinte FROM liens WHERE url = ? AND casse = 0", (url,)
+            ).fetchone()
+            if not ligne:
+                return None
+            chemin = self._chemin(ligne[0])
+            if not os.path.exists(chemin):
+                return None
+            self._connexion.execute(
+                "UPDATE images SET dernier_acces = ? WHERE empreinte = ?", (time.time(), ligne[0])
+            )
+            self._connexion.commit()
+        return chemin
+
+    def annoter(self, df: pd.DataFrame, colonne: str = 'image_lien') -> pd.DataFrame:
+        """
+        Ajoute au DataFrame l'empreinte de l'image et un indicateur de lien cassé
+
+        Les liens jamais vérifiés ont une empreinte vide et ne sont pas
+        marqués cassés.
+        """
+        with self._verrou:
+            etat = {
+                url: (empreinte or "", bool(casse))
+                for url, empreinte, casse in self._connexion.execute("SELECT url, empreinte, casse FROM liens")
+            }
+        df = df.copy()
+        df['image_empreinte'] = df[colonne].map(lambda u: etat.get(u, ("", False))[0])
+        df['image_cassee'] = df[colonne].map(lambda u: etat.get(u, ("", False))[1])
+        return df
+
+    def taille_totale(self) -> int:
+        """Espace occupé par les miniatures (octets)"""
+        with self._verrou:
+            return self._connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM images").fetchone()[0]
+
+    def get_stats(self) -> Dict:
+        """Compteurs de téléchargement et occupation disque"""
+        with self._verrou:
+            stats = self.stats.copy()
+        stats['octets_stockes'] = self.taille_totale()
+        with self._verrou:
+            stats['images_distinctes'] = self._connexion.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+            stats['liens_connus'] = self._connexion.execute("SELECT COUNT(*) FROM liens").fetchone()[0]
+        return stats
+
+    def _evincer(self):
+        """Supprime les miniatures les moins récemment consultées au-delà du quota"""
+        with self._verrou:
+            total = self._connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM images").fetchone()[0]
+            if total <= self.quota_octets:
+                return
+            for empreinte, taille in self._connexion.execute(
+                "SELECT empreinte, taille FROM images ORDER BY dernier_acces ASC"
+            ).fetchall():
+                if total <= self.quota_octets:
+                    break
+                try:
+                    os.remove(self._chemin(empreinte))
+                except FileNotFoundError:
+                    pass
+                self._connexion.execute("DELETE FROM images WHERE empreinte = ?", (empreinte,))
+                total -= taille
+                self.stats['evictions'] += 1
+            self._connexion.commit()
+
+    def fermer(self):
+        """Ferme l'index SQLite"""
+        with self._verrou:
+            self._connexion.close()
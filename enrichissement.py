@@ -0,0 +1,207 @@
+"""
+Enrichissement des annonces à partir de leur page de détail
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+CHAMPS_DETAIL = ['description', 'date_publication', 'vendeur', 'images']
+
+RE_CLASSE_DESCRIPTION = re.compile(r'description', re.IGNORECASE)
+RE_CLASSE_VENDEUR = re.compile(r'username|seller|vendeur|profile-card__name', re.IGNORECASE)
+RE_DATE_TEXTE = re.compile(r"(Publi[ée]e?\s+(?:le|il y a)\s+[^\n<]{1,40}|il y a\s+\d+\s+\w+)", re.IGNORECASE)
+RE_IMAGE_FOND = re.compile(r"background-image\s*:\s*url\(['\"]?([^'\")]+)['\"]?\)")
+
+
+def nettoyer(texte: Optional[str]) -> str:
+    """Espaces superflus supprimés"""
+    return ' '.join(texte.split()) if texte else ""
+
+
+def extraire_details(contenu: bytes, base_url: str = "https://sn.coinafrique.com") -> Dict:
+    """
+    Lit description, date de publication, vendeur et images d'une page d'annonce
+
+    Returns:
+        Dictionnaire avec les clés de CHAMPS_DETAIL
+    """
+    soup = BeautifulSoup(contenu, 'html.parser')
+
+    # Description : bloc dédié, sinon méta-description
+    description = ""
+    bloc = soup.find(class_=RE_CLASSE_DESCRIPTION)
+    if bloc:
+        description = nettoyer(bloc.get_text(' '))
+    if not description:
+        meta = soup.find('meta', attrs={'property': 'og:description'}) or soup.find('meta', attrs={'name': 'description'})
+        if meta:
+            description = nettoyer(meta.get('content'))
+
+    # Date de publication : balise <time>, infobulle, ou texte "Publiée il y a..."
+    date_publication = ""
+    balise_date = soup.find('time')
+    if balise_date:
+        date_publication = balise_date.get('datetime') or nettoyer(balise_date.get_text())
+    if not date_publication:
+        infobulle = soup.find(attrs={'data-tooltip': re.compile(r'publication', re.IGNORECASE)})
+        if infobulle:
+            date_publication = nettoyer(infobulle.get_text())
+    if not date_publication:
+        correspondance = RE_DATE_TEXTE.search(soup.get_text(' '))
+        if correspondance:
+            date_publication = nettoyer(correspondance.group(1))
+
+    # Vendeur
+    vendeur = ""
+    bloc_vendeur = soup.find(class_=RE_CLASSE_VENDEUR)
+    if bloc_vendeur:
+        vendeur = nettoyer(bloc_vendeur.get_text())
+
+    # Images : <img>, images de fond du carrousel et og:image, sans doublons
+    images = []
+    for img in soup.find_all('img'):
+        src = img.get('src') or img.get('data-src') or ''
+        if src and 'coinafrique' in urljoin(base_url, src) and not src.startswith('data:'):
+            images.append(urljoin(base_url, src))
+    for element in soup.find_all(style=RE_IMAGE_FOND):
+        images.extend(urljoin(base_url, url) for url in RE_IMAGE_FOND.findall(element['style']))
+    og_image = soup.find('meta', attrs={'property': 'og:image'})
+    if og_image and og_image.get('content'):
+        images.append(urljoin(base_url, og_image['content']))
+
+    return {
+        'description': description,
+        'date_publication': date_publication,
+        'vendeur': vendeur,
+        'images': list(dict.fromkeys(images))
+    }
+
+
+class EnrichisseurDetails:
+    """
+    Visite les pages de détail des annonces avec un pool de threads borné
+
+    Les requêtes passent par le scraper, donc par le même seau à jetons et
+    la même régulation AIMD que le scraping des catégories. Les détails
+    déjà récupérés lors de passages précédents sont relus depuis une base
+    SQLite au lieu d'être re-téléchargés.
+    """
+
+    def __init__(self, scraper, workers: int = 4, chemin: str = 'data/cache/details.sqlite'):
+        """
+        Args:
+            scraper: CoinAfriqueScraper dont la session et les limiteurs sont réutilisés
+            workers: Nombre de pages de détail téléchargées simultanément
+            chemin: Base SQLite des détails déjà récupérés
+        """
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self.scraper = scraper
+        self.workers = max(1, workers)
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.execute("""
+            CREATE TABLE IF NOT EXISTS details (
+                lien TEXT PRIMARY KEY,
+                details TEXT NOT NULL,
+                date_enrichissement REAL NOT NULL
+            )
+        """)
+        self._connexion.commit()
+
+        self.stats = {
+            'pages_telechargees': 0,
+            'deja_enrichies': 0,
+            'echecs': 0,
+            'duree_telechargement': 0.0
+        }
+
+    def _details_connus(self, liens: List[str]) -> Dict[str, Dict]:
+        connus = {}
+        with self._verrou:
+            for debut in range(0, len(liens), 500):
+                lot = liens[debut:debut + 500]
+                marqueurs = ','.join('?' * len(lot))
+                for lien, details in self._connexion.execute(
+                    f"SELECT lien, details FROM details WHERE lien IN ({marqueurs})", lot
+                ):
+                    connus[lien] = json.loads(details)
+        return connus
+
+    def _telecharger(self, lien: str) -> Optional[Dict]:
+        try:
+            contenu = self.scraper.telecharger(lien)
+            return extraire_details(contenu, self.scraper.base_url)
+        except Exception as e:
+            logging.warning(f"Détail indisponible pour {lien}: {str(e)}")
+            return None
+
+    def enrichir(self, annonces: List[Dict]) -> List[Dict]:
+        """
+        Ajoute description, date de publication, vendeur et images aux annonces
+
+        Args:
+            annonces: Annonces portant une clé 'lien'
+
+        Returns:
+            Les mêmes annonces, complétées (champs vides si la page échoue)
+        """
+        liens = list(dict.fromkeys(a['lien'] for a in annonces if a.get('lien')))
+        details = self._details_connus(liens)
+        a_telecharger = [lien for lien in liens if lien not in details]
+        self.stats['deja_enrichies'] += len(liens) - len(a_telecharger)
+
+        if a_telecharger:
+            debut = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                resultats = list(pool.map(self._telecharger, a_telecharger))
+            self.stats['duree_telechargement'] += time.perf_counter() - debut
+
+            nouveaux = []
+            for lien, resultat in zip(a_telecharger, resultats):
+                if resultat is None:
+                    self.stats['echecs'] += 1
+                    continue
+                details[lien] = resultat
+                nouveaux.append((lien, json.dumps(resultat, ensure_ascii=False), time.time()))
+            self.stats['pages_telechargees'] += len(nouveaux)
+
+            with self._verrou:
+                self._connexion.executemany(
+                    "INSERT OR REPLACE INTO details (lien, details, date_enrichissement) VALUES (?, ?, ?)",
+                    nouveaux
+                )
+                self._connexion.commit()
+
+        for annonce in annonces:
+            annonce.update(
+                details.get(annonce.get('lien'))
+                or {champ: ([] if champ == 'images' else "") for champ in CHAMPS_DETAIL}
+            )
+        return annonces
+
+    def get_stats(self) -> Dict:
+        """Compteurs et débit en pages de détail par seconde"""
+        stats = self.stats.copy()
+        duree = stats.pop('duree_telechargement')
+        stats['pages_par_seconde'] = round(stats['pages_telechargees'] / duree, 2) if duree else 0.0
+        return stats
+
+    def fermer(self):
+        """Ferme la base des détails"""
+        with self._verrou:
+            self._connexion.close()
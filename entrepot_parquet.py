@@ -0,0 +1,398 @@
+"""
+Entrepôt Parquet des annonces, partitionné par catégorie et date de scraping
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import glob
+import os
+import shutil
+import time
+import uuid
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+# Prix canonique produit par le scraper et le nettoyage ("15000 CFA")
+MOTIF_PRIX = r'^\s*(\d+)\s*(?:F\s*)?CFA\s*$'
+
+# Taille visée des groupes de lignes quand des pages préparées sont réunies
+LIGNES_PAR_GROUPE = 250_000
+
+# Champs d'annonce stockés en plus des colonnes du CSV
+COLONNES_TEXTE = ['image_lien', 'lien', 'description', 'date_publication', 'vendeur', 'images']
+
+if PYARROW_DISPONIBLE:
+    _DICTIONNAIRE = pa.dictionary(pa.int32(), pa.string())
+
+    # Colonnes des fichiers ; categorie et date_scrape viennent des partitions
+    SCHEMA = pa.schema(
+        [
+            ('id_annonce', pa.int64()),
+            ('type', _DICTIONNAIRE),
+            ('prix', pa.int64()),
+            ('prix_mention', _DICTIONNAIRE),
+            ('adresse', _DICTIONNAIRE),
+            ('ville', _DICTIONNAIRE),
+        ]
+        + [(colonne, pa.string()) for colonne in COLONNES_TEXTE]
+    )
+
+    SCHEMA_PARTITIONS = pa.schema([('categorie', pa.string()), ('date_scrape', pa.date32())])
+    PARTITIONNEMENT = ds.partitioning(SCHEMA_PARTITIONS, flavor='hive')
+
+
+def vers_table(df: pd.DataFrame, type_col: str = 'type') -> 'pa.Table':
+    """
+    Convertit des annonces au format CSV (prix texte) en table typée
+
+    Le prix devient un entier ; les prix non numériques ("Prix sur
+    demande", "Prix non disponible") sont conservés dans prix_mention. La
+    ville est la partie de l'adresse avant la virgule, comme au tableau
+    de bord.
+    """
+    n = len(df)
+    prix_texte = df['prix'].astype('string') if 'prix' in df.columns else pd.Series([pd.NA] * n, dtype='string')
+    prix = pd.to_numeric(prix_texte.str.extract(MOTIF_PRIX, expand=False), errors='coerce').astype('Int64')
+
+    adresse = df['adresse'].astype('string') if 'adresse' in df.columns else pd.Series([pd.NA] * n, dtype='string')
+    ville = adresse.str.split(',', n=1).str[0].str.strip().where(
+        adresse.str.contains(',', regex=False).fillna(False), 'Non spécifié'
+    )
+
+    colonnes = {
+        'id_annonce': pd.to_numeric(df['id_annonce'], errors='coerce').astype('Int64')
+        if 'id_annonce' in df.columns else pd.Series([pd.NA] * n, dtype='Int64'),
+        'type': df[type_col].astype('string') if type_col in df.columns else pd.Series([pd.NA] * n, dtype='string'),
+        'prix': prix,
+        'prix_mention': prix_texte.where(prix.isna()),
+        'adresse': adresse,
+        'ville': ville,
+    }
+    for colonne in COLONNES_TEXTE:
+        if colonne in df.columns:
+            valeurs = df[colonne].map(lambda v: ' | '.join(v) if isinstance(v, list) else v)
+            colonnes[colonne] = valeurs.astype('string')
+        else:
+            colonnes[colonne] = pd.Series([pd.NA] * n, dtype='string')
+
+    table = pa.Table.from_pandas(pd.DataFrame(colonnes), preserve_index=False)
+    return table.cast(SCHEMA)
+
+
+class PuitsParquet:
+    """
+    Annonces d'un scraping en cours, publiées dans l'entrepôt à la fin
+
+    Chaque page est écrite dans un fichier de préparation
+    (_en_cours/<catégorie>-<source>/page-N.parquet), ignoré à la lecture.
+    `valider` les réunit en un seul fichier de partition. Les pages déjà
+    préparées survivent à une interruption : comme pour le CSV, `tronquer`
+    ramène la préparation au dernier point de reprise.
+    """
+
+    def __init__(
+        self,
+        entrepot: 'EntrepotParquet',
+        categorie: str,
+        source: str = 'scraping',
+        remplacer: bool = True
+    ):
+        """
+        Args:
+            entrepot: Entrepôt de destination
+            categorie: Clé de la catégorie
+            source: Origine des annonces ('scraping', 'import')
+            remplacer: Remplacer les fichiers de même source du jour
+        """
+        self.entrepot = entrepot
+        self.categorie = categorie
+        self.source = source
+        self.remplacer = remplacer
+        self.dossier = os.path.join(entrepot.racine, '_en_cours', f"{categorie}-{source}")
+        self.lignes_ecrites = 0
+
+    def commencer(self):
+        """Oublie la préparation d'un scraping précédent"""
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def abandonner(self):
+        """Supprime la préparation sans rien publier (rien à garder ni à reprendre)"""
+        shutil.rmtree(self.dossier, ignore_errors=True)
+        self.lignes_ecrites = 0
+
+    def tronquer(self, derniere_page: int):
+        """Retire les pages préparées après le point de reprise"""
+        for fichier in glob.glob(os.path.join(self.dossier, 'page-*.parquet')):
+            if int(os.path.basename(fichier)[5:-8]) > derniere_page:
+                os.remove(fichier)
+
+    def ecrire(self, annonces: List[Dict], page: int):
+        """Prépare les annonces d'une page"""
+        if not annonces:
+            return
+        self.ecrire_dataframe(pd.DataFrame(annonces), page)
+
+    def ecrire_dataframe(self, df: pd.DataFrame, page: int, type_col: str = 'type'):
+        """Prépare une page au format CSV (bloc d'un nettoyage par blocs)"""
+        if df.empty:
+            return
+        os.makedirs(self.dossier, exist_ok=True)
+        table = vers_table(df, type_col)
+        temporaire = os.path.join(self.dossier, f".page-{page:05d}.tmp")
+        pq.write_table(table, temporaire)
+        os.replace(temporaire, os.path.join(self.dossier, f"page-{page:05d}.parquet"))
+        self.lignes_ecrites += len(df)
+
+    def valider(self, date_scrape: Optional[date] = None) -> Optional[str]:
+        """
+        Publie les pages préparées dans la partition du jour
+
+        Returns:
+            Chemin du fichier publié, ou None si rien n'a été préparé
+        """
+        fichiers = sorted(glob.glob(os.path.join(self.dossier, 'page-*.parquet')))
+        if not fichiers:
+            self.commencer()
+            return None
+        chemin = self.entrepot.publier(self._groupes(fichiers), self.categorie, date_scrape, self.source, self.remplacer)
+        self.commencer()
+        return chemin
+
+    @staticmethod
+    def _groupes(fichiers: List[str]) -> Iterator['pa.Table']:
+        """Pages lues dans l'ordre et réunies par LIGNES_PAR_GROUPE lignes environ"""
+        tables, lignes = [], 0
+        for fichier in fichiers:
+            table = pq.read_table(fichier, schema=SCHEMA)
+            tables.append(table)
+            lignes += table.num_rows
+            if lignes >= LIGNES_PAR_GROUPE:
+                yield pa.concat_tables(tables)
+                tables, lignes = [], 0
+        if tables:
+            yield pa.concat_tables(tables)
+
+
+class EntrepotParquet:
+    """
+    Annonces de toutes les catégories en Parquet, partitionnées par
+    catégorie et date de scraping
+
+    data/parquet/categorie=<clé>/date_scrape=<AAAA-MM-JJ>/<source>-<heure>-<id>.parquet
+
+    Ajouter les annonces d'un jour crée un fichier dans la partition du
+    jour sans réécrire l'historique. Le prix est un entier, type, ville et
+    adresse sont encodés en dictionnaire, et les filtres (catégorie,
+    dates, villes, prix) sont poussés jusqu'aux partitions et aux
+    statistiques des groupes de lignes : seules les données utiles sont lues.
+    """
+
+    def __init__(self, racine: str = 'data/parquet'):
+        """
+        Args:
+            racine: Dossier de l'entrepôt
+        """
+        if not PYARROW_DISPONIBLE:
+            raise ImportError("pyarrow est requis pour l'entrepôt Parquet (pip install pyarrow)")
+        self.racine = racine
+        os.makedirs(racine, exist_ok=True)
+
+    def chemin_partition(self, categorie: str, date_scrape: date) -> str:
+        return os.path.join(self.racine, f"categorie={categorie}", f"date_scrape={date_scrape.isoformat()}")
+
+    def publier(
+        self,
+        table: Union['pa.Table', Iterable['pa.Table']],
+        categorie: str,
+        date_scrape: Optional[date] = None,
+        source: str = 'scraping',
+        remplacer: bool = False
+    ) -> str:
+        """
+        Écrit une table dans la partition (catégorie, date)
+
+        Le fichier est écrit sous un nom temporaire (ignoré à la lecture)
+        puis renommé : une lecture concurrente ne voit jamais un fichier
+        incomplet. Avec `remplacer`, les fichiers précédents de la même
+        source dans cette partition sont supprimés ensuite. Une suite de
+        tables est écrite l'une après l'autre, sans être réunie en mémoire.
+        """
+        dossier = self.chemin_partition(categorie, date_scrape or date.today())
+        os.makedirs(dossier, exist_ok=True)
+        precedents = glob.glob(os.path.join(dossier, f"{source}-*.parquet")) if remplacer else []
+
+        nom = f"{source}-{time.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+        temporaire = os.path.join(dossier, f".{nom}.tmp")
+        if isinstance(table, pa.Table):
+            pq.write_table(table, temporaire, compression='zstd')
+        else:
+            with pq.ParquetWriter(temporaire, SCHEMA, compression='zstd') as writer:
+                for morceau in table:
+                    writer.write_table(morceau)
+        chemin = os.path.join(dossier, nom)
+        os.replace(temporaire, chemin)
+
+        for fichier in precedents:
+            os.remove(fichier)
+        return chemin
+
+    def ecrire_dataframe(
+        self,
+        categorie: str,
+        df: pd.DataFrame,
+        type_col: str = 'type',
+        date_scrape: Optional[date] = None,
+        source: str = 'import',
+        remplacer: bool = True
+    ) -> str:
+        """Ajoute un DataFrame au format CSV (import, nettoyage) à l'entrepôt"""
+        return self.publier(vers_table(df, type_col), categorie, date_scrape, source, remplacer)
+
+    def puits(self, categorie: str, source: str = 'scraping', remplacer: bool = True) -> PuitsParquet:
+        """Puits alimenté page par page pendant un scraping"""
+        return PuitsParquet(self, categorie, source, remplacer)
+
+    def _dataset(self) -> Optional['ds.Dataset']:
+        if not glob.glob(os.path.join(self.racine, 'categorie=*', 'date_scrape=*', '*.parquet')):
+            return None
+        return ds.dataset(
+            self.racine,
+            format='parquet',
+            schema=pa.unify_schemas([SCHEMA, SCHEMA_PARTITIONS]),
+            partitioning=PARTITIONNEMENT
+        )
+
+    def categories(self) -> List[str]:
+        """Catégories présentes dans l'entrepôt"""
+        return sorted(
+            os.path.basename(chemin)[len('categorie='):]
+            for chemin in glob.glob(os.path.join(self.racine, 'categorie=*'))
+            if glob.glob(os.path.join(chemin, 'date_scrape=*', '*.parquet'))
+        )
+
+    def lire(
+        self,
+        categories: Optional[List[str]] = None,
+        depuis: Optional[date] = None,
+        jusqu_a: Optional[date] = None,
+        villes: Optional[List[str]] = None,
+        prix_min: Optional[int] = None,
+        prix_max: Optional[int] = None,
+        colonnes: Optional[List[str]] = None,
+        dedoublonner: bool = True
+    ) -> pd.DataFrame:
+        """
+        Lit les annonces répondant aux filtres
+
+        Args:
+            categories: Clés des catégories (toutes par défaut)
+            depuis, jusqu_a: Bornes incluses de la date de scraping
+            villes: Villes retenues
+            prix_min, prix_max: Bornes incluses du prix (exclut les prix non numériques)
+            colonnes: Colonnes lues (toutes par défaut)
+            dedoublonner: Ne garder que la version la plus récente de chaque
+                annonce identifiée (les annonces sans identifiant sont toutes gardées)
+
+        Returns:
+            DataFrame typé (prix entier, colonnes catégorielles), avec les
+            colonnes de partition categorie et date_scrape
+        """
+        dataset = self._dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=(colonnes or SCHEMA.names) + ['categorie', 'date_scrape'])
+
+        filtre = None
+        conditions = []
+        if categories:
+            conditions.append(ds.field('categorie').isin(list(categories)))
+        if depuis:
+            conditions.append(ds.field('date_scrape') >= depuis)
+        if jusqu_a:
+            conditions.append(ds.field('date_scrape') <= jusqu_a)
+        if villes:
+            conditions.append(ds.field('ville').isin(list(villes)))
+        if prix_min is not None:
+            conditions.append(ds.field('prix') >= prix_min)
+        if prix_max is not None:
+            conditions.append(ds.field('prix') <= prix_max)
+        for condition in conditions:
+            filtre = condition if filtre is None else filtre & condition
+
+        lues = None
+        if colonnes:
+            lues = list(dict.fromkeys(colonnes + ['categorie', 'date_scrape']
+                                      + (['id_annonce'] if dedoublonner else [])))
+        df = dataset.to_table(columns=lues, filter=filtre).to_pandas()
+
+        if dedoublonner and len(df):
+            df = df.sort_values('date_scrape', kind='stable')
+            doublon = df['id_annonce'].notna() & df.duplicated(['categorie', 'id_annonce'], keep='last')
+            df = df[~doublon].sort_index(kind='stable')
+
+        # Entiers nullables (pyarrow convertit les entiers avec valeurs nulles en flottants)
+        for colonne in ('id_annonce', 'prix'):
+            if colonne in df.columns:
+                df[colonne] = df[colonne].astype('Int64')
+        # Catégories triées (ordre lexical au tri) et sans valeurs absentes du résultat
+        for colonne in df.select_dtypes('category').columns:
+            valeurs = df[colonne].cat.remove_unused_categories()
+            df[colonne] = valeurs.cat.reorder_categories(sorted(valeurs.cat.categories))
+        if colonnes:
+            df = df[colonnes + [c for c in ('categorie', 'date_scrape') if c not in colonnes]]
+        return df.reset_index(drop=True)
+
+    def charger_categorie(self, categorie: str, type_col: str = 'type', **filtres) -> pd.DataFrame:
+        """
+        Annonces d'une catégorie au format du CSV nettoyé
+
+        Le prix texte ("15000 CFA") est reconstitué ; prix_num et ville,
+        que le tableau de bord calculait à partir du CSV, sont fournis
+        directement.
+        """
+        df = self.lire([categorie], **filtres)
+        prix = df['prix']
+        texte = prix.astype('string') + ' CFA'
+        df['prix_num'] = prix.astype('Float64').astype(float)
+        df['prix'] = texte.where(prix.notna(), df['prix_mention'].astype('string'))
+        df = df.rename(columns={'type': type_col}).drop(columns=['prix_mention'])
+
+        # Colonnes de détail présentes seulement si renseignées
+        vides = [c for c in ['id_annonce'] + COLONNES_TEXTE[1:] if df[c].isna().all()]
+        colonnes = [type_col, 'prix', 'adresse', 'image_lien'] + [
+            c for c in df.columns if c not in (type_col, 'prix', 'adresse', 'image_lien') and c not in vides
+        ]
+        return df[colonnes]
+
+    def exporter_csv(self, categorie: str, chemin: str, type_col: str = 'type', **filtres) -> int:
+        """
+        Exporte une catégorie au format du CSV nettoyé
+
+        Returns:
+            Nombre de lignes exportées
+        """
+        df = self.charger_categorie(categorie, type_col, **filtres)
+        colonnes = [type_col, 'prix', 'adresse', 'image_lien'] + [
+            c for c in ('description', 'date_publication', 'vendeur', 'images') if c in df.columns
+        ]
+        df[colonnes].to_csv(chemin, index=False, encoding='utf-8-sig')
+        return len(df)
+
+    def get_stats(self) -> Dict:
+        """Fichiers, partitions, lignes et taille de l'entrepôt"""
+        fichiers = glob.glob(os.path.join(self.racine, 'categorie=*', 'date_scrape=*', '*.parquet'))
+        return {
+            'fichiers': len(fichiers),
+            'partitions': len({os.path.dirname(f) for f in fichiers}),
+            'lignes': sum(pq.ParquetFile(f).metadata.num_rows for f in fichiers),
+            'octets': sum(os.path.getsize(f) for f in fichiers)
+        }
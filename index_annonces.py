@@ -0,0 +1,165 @@
+"""
+Index persistant des annonces déjà vues, par catégorie
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import os
+import re
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, List, Optional
+
+# ".../chemise-homme-4419436" ou ".../ad/4419436"
+RE_ID_ANNONCE = re.compile(r'(\d+)/?$')
+
+
+def extraire_id_annonce(lien: str) -> Optional[int]:
+    """Identifiant numérique stable d'une annonce à partir de son lien"""
+    if not lien:
+        return None
+    chemin = lien.split('#')[0].split('?')[0]
+    correspondance = RE_ID_ANNONCE.search(chemin)
+    return int(correspondance.group(1)) if correspondance else None
+
+
+class IndexAnnoncesVues:
+    """
+    Ensemble compact d'identifiants d'annonces
+
+    Les identifiants sont gardés dans un tableau trié d'entiers 64 bits
+    (8 octets par annonce, recherche dichotomique) ; les nouveaux arrivent
+    dans un tampon qui est fusionné dans le tableau par compactage
+    périodique. Le fichier sur disque est le tableau brut.
+    """
+
+    def __init__(self, chemin: str, seuil_compactage: int = 50_000):
+        """
+        Args:
+            chemin: Fichier de l'index (créé à la première sauvegarde)
+            seuil_compactage: Taille du tampon déclenchant un compactage
+        """
+        self.chemin = chemin
+        self.seuil_compactage = seuil_compactage
+        self._ids = array('Q')
+        self._tampon = set()
+
+        if os.path.exists(chemin):
+            with open(chemin, 'rb') as f:
+                self._ids.frombytes(f.read())
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._tampon)
+
+    def __contains__(self, id_annonce: int) -> bool:
+        return self.contient(id_annonce)
+
+    def contient(self, id_annonce: int) -> bool:
+        """Indique si l'annonce a déjà été vue"""
+        if id_annonce in self._tampon:
+            return True
+        position = bisect_left(self._ids, id_annonce)
+        return position < len(self._ids) and self._ids[position] == id_annonce
+
+    def ajouter(self, ids: Iterable[int]):
+        """Enregistre des identifiants vus"""
+        for id_annonce in ids:
+            if id_annonce is not None and not self.contient(id_annonce):
+                self._tampon.add(id_annonce)
+
+        if len(self._tampon) >= self.seuil_compactage:
+            self.compacter()
+
+    def compacter(self):
+        """Fusionne le tampon dans le tableau trié"""
+        if not self._tampon:
+            return
+        self._ids = array('Q', merge(self._ids, sorted(self._tampon)))
+        self._tampon.clear()
+
+    def sauvegarder(self):
+        """Compacte puis écrit l'index de façon atomique"""
+        self.compacter()
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{self.chemin}.tmp"
+        with open(temporaire, 'wb') as f:
+            self._ids.tofile(f)
+        os.replace(temporaire, self.chemin)
+
+
+class DedoublonnageCrawl:
+    """
+    Annonces déjà émises pendant un scraping, toutes pages confondues
+
+    La clé est l'identifiant numérique de l'annonce, ou à défaut son lien
+    canonique (sans paramètres ni ancre). Seules les annonces réellement
+    émises sont marquées : un lien sans titre (lien image) ne masque pas
+    le lien titre de la même carte. Les répétitions sont comptées par
+    annonce distincte et par page, quel que soit le nombre de liens.
+    """
+
+    def __init__(self, cles: Iterable = ()):
+        """
+        Args:
+            cles: Clés d'annonces déjà émises (reprise d'un scraping interrompu)
+        """
+        self._cles = set(cles)
+        self._nouvelles = []
+        self._repetees_page = set()
+        self.repetitions = 0
+
+    @property
+    def repetitions_page(self) -> int:
+        """Annonces déjà émises rencontrées sur la page courante"""
+        return len(self._repetees_page)
+
+    @staticmethod
+    def cle(lien: str, id_annonce: Optional[int] = None):
+        """Clé de déduplication d'une annonce"""
+        if id_annonce is None:
+            id_annonce = extraire_id_annonce(lien)
+        return id_annonce if id_annonce is not None else lien.split('#')[0].split('?')[0]
+
+    def nouvelle_page(self):
+        """Remet à zéro le compteur de répétitions de la page courante"""
+        self._repetees_page = set()
+
+    def deja_emise(self, cle) -> bool:
+        """Indique si l'annonce a déjà été émise (et compte la répétition)"""
+        if cle in self._cles:
+            self._compter(cle)
+            return True
+        return False
+
+    def _compter(self, cle):
+        if cle not in self._repetees_page:
+            self._repetees_page.add(cle)
+            self.repetitions += 1
+
+    def fusionner_page(self, autre: 'DedoublonnageCrawl'):
+        """Ajoute à la page courante les répétitions relevées par un index de page seule"""
+        for cle in autre._repetees_page:
+            self._compter(cle)
+
+    def marquer(self, cle):
+        """Enregistre une annonce émise"""
+        self._cles.add(cle)
+        self._nouvelles.append(cle)
+
+    def extraire_nouvelles(self) -> List:
+        """Clés marquées depuis l'appel précédent (pour les points de reprise)"""
+        nouvelles, self._nouvelles = self._nouvelles, []
+        return nouvelles
+
+    def filtrer(self, annonces: List[Dict]) -> List[Dict]:
+        """Retire d'un lot d'annonces déjà construites celles déjà émises"""
+        nouvelles = []
+        for annonce in annonces:
+            cle = self.cle(annonce.get('lien', ''), annonce.get('id_annonce'))
+            if not self.deja_emise(cle):
+                self.marquer(cle)
+                nouvelles.append(annonce)
+        return nouvelles
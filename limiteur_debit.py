@@ -0,0 +1,224 @@
+"""
+Limitation du débit des requêtes vers CoinAfrique
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class LimiteurDebit:
+    """
+    Seau à jetons partagé entre threads
+
+    Chaque requête consomme un jeton ; les jetons se rechargent à `debit`
+    par seconde dans la limite de `capacite`. Avec une capacité de 1, cela
+    revient à imposer un espacement minimal de 1/debit entre deux requêtes.
+    """
+
+    def __init__(self, intervalle_min: float = 2.0, capacite: float = 1.0):
+        self._verrou = threading.Lock()
+        self.capacite = max(1.0, capacite)
+        self._jetons = self.capacite
+        self._derniere_maj = time.monotonic()
+        self.intervalle_min = intervalle_min
+
+    @property
+    def intervalle_min(self) -> float:
+        """Espacement moyen entre deux requêtes (secondes)"""
+        return 1.0 / self.debit if self.debit != float('inf') else 0.0
+
+    @intervalle_min.setter
+    def intervalle_min(self, valeur: float):
+        self.ajuster_debit(1.0 / valeur if valeur > 0 else float('inf'))
+
+    def ajuster_debit(self, debit: float):
+        """Change le débit (requêtes/seconde) sans perdre les jetons accumulés"""
+        with self._verrou:
+            self.debit = debit
+
+    def attendre(self) -> float:
+        """
+        Réserve un jeton et bloque jusqu'à ce qu'il soit disponible
+
+        Returns:
+            Temps d'attente effectif en secondes
+        """
+        with self._verrou:
+            if self.debit == float('inf'):
+                return 0.0
+            maintenant = time.monotonic()
+            self._jetons = min(
+                self.capacite,
+                self._jetons + (maintenant - self._derniere_maj) * self.debit
+            )
+            self._derniere_maj = maintenant
+            self._jetons -= 1
+            attente = -self._jetons / self.debit if self._jetons < 0 else 0.0
+
+        if attente > 0:
+            time.sleep(attente)
+        return attente
+
+
+class RythmeAdaptatif:
+    """
+    Régulation AIMD du débit d'un hôte, avec réessais à backoff exponentiel
+
+    Tant que les réponses arrivent vite, le débit du limiteur augmente de
+    `increment` requêtes/seconde par succès (hausse additive) ; une réponse
+    429/5xx ou un timeout le multiplie par `facteur` (baisse
+    multiplicative). Le plafond est par défaut le débit configuré du
+    limiteur (1/intervalle_min) : l'AIMD ralentit sous ce débit puis y
+    revient, sans le dépasser sauf plafond plus haut demandé. Les pages en
+    échec sont réessayées après un délai exponentiel avec gigue, dans la
+    limite d'un budget de réessais partagé par les requêtes de l'hôte
+    (listes et pages de détail). Chaque réessai consomme un jeton du budget
+    et chaque succès en rend `recharge_reessais` : une panne passagère
+    n'épuise pas les réessais de tout le reste du scraping, alors qu'un
+    hôte qui échoue sans cesse cesse vite d'être réessayé.
+    """
+
+    def __init__(
+        self,
+        limiteur: LimiteurDebit,
+        debit_min: float = 0.1,
+        debit_max: Optional[float] = None,
+        increment: float = 0.05,
+        facteur: float = 0.5,
+        seuil_latence: float = 1.0,
+        max_reessais_page: int = 4,
+        budget_reessais: int = 50,
+        recharge_reessais: float = 0.1,
+        delai_base: float = 1.0,
+        delai_max: float = 60.0
+    ):
+        """
+        Args:
+            limiteur: Seau à jetons dont le débit est piloté
+            debit_min: Débit plancher (requêtes/seconde)
+            debit_max: Débit plafond (requêtes/seconde), par défaut le débit
+                configuré du limiteur (illimité pour un intervalle_min de 0)
+            increment: Hausse additive par réponse rapide
+            facteur: Facteur de baisse sur surcharge
+            seuil_latence: Latence (s) au-delà de laquelle le débit n'augmente plus
+            max_reessais_page: Réessais maximum pour une même page
+            budget_reessais: Réessais maximum sans succès intermédiaire (jetons)
+            recharge_reessais: Jetons de réessai rendus par requête réussie
+            delai_base: Premier délai de réessai (s)
+            delai_max: Délai de réessai maximal (s)
+        """
+        self.limiteur = limiteur
+        self.debit_min = debit_min
+        self.debit_max = debit_max if debit_max is not None else limiteur.debit
+        self.increment = increment
+        self.facteur = facteur
+        self.seuil_latence = seuil_latence
+        self.max_reessais_page = max_reessais_page
+        self.budget_reessais = budget_reessais
+        self.recharge_reessais = recharge_reessais
+        self.delai_base = delai_base
+        self.delai_max = delai_max
+
+        self._verrou = threading.Lock()
+        self._jetons_reessai = float(budget_reessais)
+        self.stats = {
+            'requetes': 0,
+            'succes': 0,
+            'surcharges': 0,
+            'reessais': 0,
+            'abandons': 0,
+            'latence_totale': 0.0
+        }
+        self._borner(limiteur.debit)
+
+    def _borner(self, debit: float):
+        self.limiteur.ajuster_debit(min(self.debit_max, max(self.debit_min, debit)))
+
+    def succes(self, latence: float):
+        """Réponse exploitable : hausse additive si l'hôte répond vite"""
+        with self._verrou:
+            self.stats['requetes'] += 1
+            self.stats['succes'] += 1
+            self.stats['latence_totale'] += latence
+            self._jetons_reessai = min(self.budget_reessais, self._jetons_reessai + self.recharge_reessais)
+            if latence < self.seuil_latence:
+                self._borner(self.limiteur.debit + self.increment)
+
+    def surcharge(self, latence: float = 0.0):
+        """429, 5xx ou timeout : baisse multiplicative"""
+        with self._verrou:
+            self.stats['requetes'] += 1
+            self.stats['surcharges'] += 1
+            self.stats['latence_totale'] += latence
+            self._borner(self.limiteur.debit * self.facteur)
+
+    def autoriser_reessai(self, tentative: int) -> bool:
+        """Consomme un jeton de réessai si la page et le budget de l'hôte le permettent"""
+        with self._verrou:
+            if tentative >= self.max_reessais_page or self._jetons_reessai < 1:
+                self.stats['abandons'] += 1
+                return False
+            self._jetons_reessai -= 1
+            self.stats['reessais'] += 1
+            return True
+
+    def delai_reessai(self, tentative: int, retry_after: float = 0.0) -> float:
+        """Backoff exponentiel à gigue complète, au moins Retry-After"""
+        plafond = min(self.delai_max, self.delai_base * (2 ** tentative))
+        return max(retry_after, random.uniform(0, plafond))
+
+    def get_stats(self) -> Dict:
+        """Débit courant, réessais disponibles et compteurs de requêtes"""
+        with self._verrou:
+            stats = self.stats.copy()
+            stats['reessais_disponibles'] = int(self._jetons_reessai)
+        latence_totale = stats.pop('latence_totale')
+        stats['debit_courant'] = round(self.limiteur.debit, 3)
+        stats['latence_moyenne'] = round(latence_totale / stats['requetes'], 3) if stats['requetes'] else 0.0
+        return stats
+
+
+class LimiteursParHote:
+    """Un seau à jetons par hôte, partagé par toutes les catégories"""
+
+    def __init__(self, intervalle_min: float = 2.0, capacite: float = 1.0, options_rythme: Dict = None):
+        """
+        Args:
+            intervalle_min: Espacement initial entre deux requêtes (secondes)
+            capacite: Rafale maximale autorisée par hôte
+            options_rythme: Paramètres de RythmeAdaptatif (débit max, budget...)
+        """
+        self.intervalle_min = intervalle_min
+        self.capacite = capacite
+        self.options_rythme = options_rythme or {}
+        self._verrou = threading.Lock()
+        self._limiteurs: Dict[str, LimiteurDebit] = {}
+        self._rythmes: Dict[str, RythmeAdaptatif] = {}
+
+    def pour(self, url: str) -> LimiteurDebit:
+        """Retourne le limiteur de l'hôte de l'URL (créé au premier appel)"""
+        hote = urlparse(url).netloc
+        with self._verrou:
+            if hote not in self._limiteurs:
+                self._limiteurs[hote] = LimiteurDebit(self.intervalle_min, self.capacite)
+            return self._limiteurs[hote]
+
+    def rythme(self, url: str) -> RythmeAdaptatif:
+        """Retourne le régulateur AIMD de l'hôte de l'URL"""
+        limiteur = self.pour(url)
+        hote = urlparse(url).netloc
+        with self._verrou:
+            if hote not in self._rythmes:
+                self._rythmes[hote] = RythmeAdaptatif(limiteur, **self.options_rythme)
+            return self._rythmes[hote]
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Statistiques de régulation par hôte"""
+        with self._verrou:
+            rythmes = dict(self._rythmes)
+        return {hote: rythme.get_stats() for hote, rythme in rythmes.items()}
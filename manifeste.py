@@ -0,0 +1,147 @@
+"""
+Manifeste des jeux de données : lignes, taille, schéma et statistiques de prix
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+CHEMIN_MANIFESTE = 'data/manifeste.json'
+
+# Un seul écrivain à la fois dans le processus (catégories scrapées en parallèle)
+_verrou = threading.Lock()
+
+
+def prix_numeriques(prix: pd.Series) -> pd.Series:
+    """Prix en CFA d'une colonne de prix texte (NaN pour « sur demande » ou sans chiffres)"""
+    texte = prix.astype(str)
+    chiffres = pd.to_numeric(texte.str.replace(r'[^\d]', '', regex=True), errors='coerce')
+    return chiffres.where(~texte.str.lower().str.contains('demande', regex=False))
+
+
+def statistiques_prix(prix_num: pd.Series) -> Dict:
+    """Nombre de prix valides, moyenne, minimum, maximum et médiane"""
+    valides = prix_num.dropna()
+    if valides.empty:
+        return {'valides': 0, 'moyenne': None, 'min': None, 'max': None, 'mediane': None}
+    return {
+        'valides': int(len(valides)),
+        'moyenne': round(float(valides.mean()), 2),
+        'min': float(valides.min()),
+        'max': float(valides.max()),
+        'mediane': float(valides.median())
+    }
+
+
+def decrire_fichier(fichier: str, df: Optional[pd.DataFrame] = None, taille_bloc: int = 100_000) -> Dict:
+    """
+    Entrée de manifeste d'un CSV
+
+    Args:
+        fichier: CSV décrit (taille et date lues sur le disque)
+        df: Contenu du fichier s'il est déjà en mémoire ; sinon le fichier
+            est parcouru par blocs en ne lisant que la colonne prix
+        taille_bloc: Lignes par bloc lors du parcours
+
+    Returns:
+        {'fichier', 'lignes', 'octets', 'mtime', 'colonnes', 'prix', 'date_maj'}
+    """
+    infos = os.stat(fichier)
+    if df is not None:
+        lignes = len(df)
+        colonnes = {colonne: str(dtype) for colonne, dtype in df.dtypes.items()}
+        prix_num = prix_numeriques(df['prix']) if 'prix' in df.columns else pd.Series(dtype=float)
+        prix = statistiques_prix(prix_num)
+    elif infos.st_size == 0:
+        lignes, colonnes, prix = 0, {}, statistiques_prix(pd.Series(dtype=float))
+    else:
+        echantillon = pd.read_csv(fichier, nrows=1000)
+        colonnes = {colonne: str(dtype) for colonne, dtype in echantillon.dtypes.items()}
+        lignes = 0
+        morceaux = []
+        if 'prix' in colonnes:
+            for bloc in pd.read_csv(fichier, usecols=['prix'], chunksize=taille_bloc):
+                lignes += len(bloc)
+                morceaux.append(prix_numeriques(bloc['prix']).dropna())
+        else:
+            for bloc in pd.read_csv(fichier, usecols=[0], chunksize=taille_bloc):
+                lignes += len(bloc)
+        valeurs = pd.concat(morceaux) if morceaux else pd.Series(dtype=float)
+        prix = statistiques_prix(valeurs)
+
+    return {
+        'fichier': fichier,
+        'lignes': lignes,
+        'octets': infos.st_size,
+        'mtime': infos.st_mtime,
+        'colonnes': colonnes,
+        'prix': prix,
+        'date_maj': time.time()
+    }
+
+
+def lire_manifeste(chemin: str = CHEMIN_MANIFESTE) -> Dict[str, Dict]:
+    """Contenu du manifeste ({nom du jeu de données: entrée}), vide s'il n'existe pas"""
+    try:
+        with open(chemin, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _ecrire(manifeste: Dict[str, Dict], chemin: str):
+    """Remplace le manifeste d'un bloc : un lecteur voit l'ancien ou le nouveau, jamais un mélange"""
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    temporaire = f"{chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(manifeste, f, ensure_ascii=False, indent=2)
+    os.replace(temporaire, chemin)
+
+
+def mettre_a_jour(nom: str, fichier: str, df: Optional[pd.DataFrame] = None, chemin: str = CHEMIN_MANIFESTE) -> Dict:
+    """
+    Met à jour l'entrée d'un jeu de données après l'écriture de son fichier
+
+    Args:
+        nom: Nom du jeu de données (clé de catégorie)
+        fichier: CSV qui vient d'être écrit
+        df: Contenu écrit, s'il est en mémoire (évite de relire le fichier)
+        chemin: Fichier du manifeste
+
+    Returns:
+        Nouvelle entrée
+    """
+    entree = decrire_fichier(fichier, df)
+    with _verrou:
+        manifeste = lire_manifeste(chemin)
+        manifeste[nom] = entree
+        _ecrire(manifeste, chemin)
+    return entree
+
+
+def entree_a_jour(nom: str, fichier: str, chemin: str = CHEMIN_MANIFESTE) -> Optional[Dict]:
+    """
+    Entrée d'un jeu de données, en temps constant si le fichier n'a pas changé
+
+    La taille et la date du fichier sont comparées à celles du manifeste ;
+    un fichier modifié hors de l'application est décrit à nouveau.
+
+    Returns:
+        Entrée du manifeste, ou None si le fichier n'existe pas
+    """
+    try:
+        infos = os.stat(fichier)
+    except OSError:
+        return None
+    entree = lire_manifeste(chemin).get(nom)
+    if entree and entree['octets'] == infos.st_size and entree['mtime'] == infos.st_mtime:
+        return entree
+    return mettre_a_jour(nom, fichier, chemin=chemin)
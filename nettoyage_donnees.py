@@ -4,17 +4,278 @@ Auteur: Eudoxie - DIT Master AI
 Date: Janvier 2026
 """
 
+import functools
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+from pandas.api.types import union_categoricals
 import re
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional
 import logging
 
+from schemas_colonnes import SchemasColonnes
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
 logging.basicConfig(level=logging.INFO)
 
+# 'vectorise' : noyaux Arrow sur des colonnes entières (.apply sans pyarrow)
+# 'apply' : fonctions par valeur, conservées comme référence
+MOTEURS = ('vectorise', 'apply')
+
+# dtype que pandas infère pour une colonne de textes (celui des résultats de .apply)
+_DTYPE_TEXTE = pd.Series(['']).dtype
+
+# Sur le Latin-1 hors « ß », RE2 et utf8proc donnent les mêmes résultats que
+# re et str de Python (minuscules, capitalize, \d = [0-9]) ; les autres
+# caractères passent par les fonctions par valeur
+_HORS_ALPHABET = r'[^\x00-\xde\xe0-\xff]'
+
+# Espaces reconnus par str.split(), \s et utf8_trim dans cet alphabet
+_ESPACES = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0'
+
+# Nettoyage par blocs (mesures de benchmarks/bench_nettoyage_csv.py) :
+# - mémoire visée par défaut ;
+# - part fixe prise par pandas et Arrow dès le premier bloc, quelle que soit sa taille ;
+# - rapport entre la mémoire d'un bloc pendant son nettoyage et celle du bloc brut
+MEMOIRE_MAX_MO = 256
+RESERVE_MO = 50
+FACTEUR_MEMOIRE = 7
+LIGNES_ECHANTILLON = 1000
+LIGNES_MIN_BLOC = 10_000
+
+# Nettoyage parallèle : en deçà, une partition coûte plus à transmettre qu'à nettoyer
+LIGNES_MIN_PARTITION = 50_000
+
+# Valeurs distinctes gardées par le cache des fonctions par valeur (titres,
+# adresses hors de l'alphabet des noyaux), d'une colonne ou d'un bloc à l'autre
+TAILLE_MEMO = 100_000
+
+# Détection des colonnes : motifs cherchés dans les noms, par ordre de priorité
+MOTIFS_COLONNES = {
+    'type': ['type', 'titre', 'nom', 'produit', 'title', 'name', 'item'],
+    'prix': ['prix', 'price', 'montant', 'amount', 'cost'],
+    'adresse': ['adresse', 'localisation', 'location', 'ville', 'city', 'lieu', 'address'],
+    'image': ['image', 'img', 'photo', 'picture', 'pic']
+}
+
+# Colonnes ajoutées par Web Scraper (web-scraper-order, web-scraper-start-url)
+PREFIXE_WEB_SCRAPER = 'web-scraper-'
+
+# Part des valeurs renseignées de l'échantillon qui doivent avoir l'allure du rôle
+SEUIL_ROLE = 0.6
+
+# Allure des valeurs (sans tenir compte de la casse)
+_VALEUR_PRIX = r'\d[\d\s.]*(?:f\s*)?cfa|xof|sur demande|négociable|appeler'
+_VALEUR_LIEN = r'^(?:https?:)?//|^/[^/\s]'
+_VALEUR_IMAGE = r'\.(?:jpe?g|png|gif|webp|avif)\b|image|img|photo'
+_VALEUR_ADRESSE = r's[ée]n[ée]gal|^[^\d,/]{2,}(?:,\s*[^\d,/]{2,})+$'
+
+# Au-delà, la conversion int <-> str de Python peut être limitée
+# (sys.set_int_max_str_digits, 640 chiffres au minimum) : ces prix passent par nettoyer_prix
+_CHIFFRES_MAX = 640
+
+
+def _texte(valeur: str):
+    """Scalaire Arrow du type des colonnes traitées (large_string)"""
+    return pa.scalar(valeur, pa.large_string())
+
+
+@functools.lru_cache(maxsize=None)
+def _memoisee(fonction: Callable) -> Callable:
+    """
+    fonction avec un cache LRU de TAILLE_MEMO valeurs, partagé par le processus
+    
+    Seules les chaînes passent par le cache : 1 == True, mais str(1) != str(True).
+    """
+    cache = functools.lru_cache(maxsize=TAILLE_MEMO)(fonction)
+    return lambda valeur: cache(valeur) if isinstance(valeur, str) else fonction(valeur)
+
+
+def _regrouper_espaces(textes):
+    """
+    ' '.join(texte.split())
+    
+    Pas de utf8_split_whitespace : le dernier mot du tableau garde parfois
+    l'espace qui le suit (pyarrow 26).
+    """
+    return pc.utf8_trim(pc.replace_substring_regex(textes, r'[\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0]+', ' '), ' ')
+
+
+def _noyau_texte(textes, vides):
+    """nettoyer_texte : espaces regroupés et retirés aux extrémités"""
+    return _regrouper_espaces(textes), None
+
+
+def _noyau_prix(textes, vides):
+    """nettoyer_prix ; les chiffres que seul int() sait lire sont renvoyés à la fonction"""
+    textes = pc.utf8_trim(textes, _ESPACES)
+    minuscules = pc.utf8_lower(textes)
+    sur_demande = vides
+    for mot in ['demande', 'négociable', 'appeler']:
+        sur_demande = pc.or_(sur_demande, pc.match_substring(minuscules, mot))
+    
+    # Premier groupe de chiffres, sans espaces ni espaces insécables
+    groupe = pc.extract_regex(textes, r'(?P<chiffres>[0-9]+[0-9\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0]*)')
+    chiffres = pc.struct_field(groupe, 'chiffres')
+    chiffres = pc.replace_substring(pc.replace_substring(chiffres, ' ', ''), '\xa0', '')
+    simples = pc.and_(pc.ascii_is_decimal(chiffres), pc.less_equal(pc.utf8_length(chiffres), _CHIFFRES_MAX))
+    simples = pc.fill_null(simples, False)
+    
+    entiers = pc.utf8_ltrim(chiffres, '0')
+    entiers = pc.if_else(pc.equal(entiers, ''), '0', entiers)
+    montants = pc.binary_join_element_wise(entiers, _texte(' CFA'), _texte(''))
+    resultat = pc.if_else(
+        sur_demande, "Prix sur demande", pc.if_else(simples, montants, "Prix non disponible")
+    )
+    a_part = pc.and_(pc.and_(pc.is_valid(chiffres), pc.invert(simples)), pc.invert(sur_demande))
+    return resultat, a_part
+
+
+def _noyau_adresse(textes, vides):
+    """nettoyer_adresse : espaces, « Sénégal » et capitalisation de chaque partie"""
+    adresses = _regrouper_espaces(textes)
+    # S[ée]n[ée]gal avec IGNORECASE, restreint à l'alphabet
+    adresses = pc.replace_substring_regex(adresses, '[sS][éÉeE][nN][éÉeE][gG][aA][lL]', 'Sénégal')
+    
+    parties = pc.split_pattern(adresses, ',')
+    capitalisees = pc.utf8_capitalize(pc.utf8_trim(pc.list_flatten(parties), ' '))
+    jointes = pc.binary_join(type(parties).from_arrays(parties.offsets, capitalisees), _texte(', '))
+    adresses = pc.if_else(pc.match_substring(adresses, ','), jointes, adresses)
+    return pc.if_else(pc.equal(adresses, ''), "Adresse non disponible", adresses), None
+
+
+def _noyau_image_lien(textes, vides):
+    """nettoyer_image_lien : liens relatifs complétés"""
+    liens = pc.utf8_trim(textes, _ESPACES)
+    protocole = pc.starts_with(liens, '//')
+    racine = pc.and_(pc.starts_with(liens, '/'), pc.invert(protocole))
+    liens = pc.if_else(protocole, pc.binary_join_element_wise(_texte('https:'), liens, _texte('')), liens)
+    sur_site = pc.binary_join_element_wise(_texte('https://sn.coinafrique.com'), liens, _texte(''))
+    return pc.if_else(racine, sur_site, liens), None
+
+
+class EmpreintesLignes:
+    """
+    Ensemble compact des lignes déjà vues, pour dédoublonner entre des blocs
+    
+    Chaque ligne est réduite à une empreinte de 64 bits
+    (pd.util.hash_pandas_object) : 8 octets par ligne distincte, dans un
+    tableau trié. Deux lignes différentes ne sont confondues qu'avec une
+    probabilité de l'ordre de n² / 2^65 (3e-6 pour 10 millions de lignes).
+    """
+    
+    def __init__(self):
+        self.empreintes = np.empty(0, dtype=np.uint64)
+    
+    @property
+    def octets(self) -> int:
+        return self.empreintes.nbytes
+    
+    def ajouter(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Enregistre les lignes d'un bloc
+        
+        Returns:
+            Masque des premières occurrences (lignes jamais vues, première
+            apparition dans le bloc), comme ~df.duplicated() sur l'ensemble
+        """
+        empreintes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        nouvelles = ~pd.Series(empreintes).duplicated().to_numpy()
+        if len(self.empreintes):
+            positions = np.searchsorted(self.empreintes, empreintes).clip(max=len(self.empreintes) - 1)
+            nouvelles &= self.empreintes[positions] != empreintes
+        # Deux suites triées : le tri stable (timsort) les fusionne en temps linéaire
+        self.empreintes = np.sort(
+            np.concatenate([self.empreintes, np.sort(empreintes[nouvelles])]), kind='stable'
+        )
+        return nouvelles
+
+
+def _profil_valeurs(serie: pd.Series) -> Dict[str, Optional[float]]:
+    """
+    Part des valeurs renseignées d'une colonne qui ont l'allure de chaque rôle
+    
+    Returns:
+        {role: part entre 0 et 1}, None partout si la colonne est vide
+    """
+    valeurs = serie.dropna().astype(str).str.strip()
+    valeurs = valeurs[valeurs != '']
+    if valeurs.empty:
+        return dict.fromkeys(MOTIFS_COLONNES)
+    
+    lien = valeurs.str.contains(_VALEUR_LIEN, case=False, regex=True)
+    prix = valeurs.str.contains(_VALEUR_PRIX, case=False, regex=True) & ~lien
+    adresse = valeurs.str.contains(_VALEUR_ADRESSE, case=False, regex=True) & ~lien
+    image = lien & valeurs.str.contains(_VALEUR_IMAGE, case=False, regex=True)
+    texte = valeurs.str.contains(r'[A-Za-zÀ-ÿ]', regex=True) & ~(lien | prix | adresse)
+    # Un libellé répété partout (« Voir l'annonce ») n'est pas un titre
+    if len(valeurs) > 1 and valeurs.nunique() == 1:
+        texte[:] = False
+    return {
+        'type': float(texte.mean()),
+        'prix': float(prix.mean()),
+        'adresse': float(adresse.mean()),
+        'image': float(image.mean())
+    }
+
+
+def _lire_echantillon(source) -> pd.DataFrame:
+    """
+    Premières lignes d'un CSV brut (en-tête, estimation de la taille des lignes)
+    
+    Un fichier ouvert est rembobiné avant et après : il peut avoir déjà été lu.
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    echantillon = pd.read_csv(source, nrows=LIGNES_ECHANTILLON, dtype=str)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return echantillon
+
+
+def _blocs_csv(source, echantillon: pd.DataFrame, memoire_max_mo: int, empreintes: EmpreintesLignes) -> Iterator[pd.DataFrame]:
+    """
+    Blocs d'un CSV lus en texte, dimensionnés pour tenir dans la mémoire visée
+    
+    La part fixe et la place prise par les empreintes (et leurs copies
+    lors d'une fusion) sont retirées du budget avant chaque bloc ; les
+    blocs ont au moins LIGNES_MIN_BLOC lignes.
+    """
+    octets_ligne = max(echantillon.memory_usage(deep=True, index=False).sum() / max(len(echantillon), 1), 1)
+    budget = (memoire_max_mo - RESERVE_MO) * 1024 * 1024
+    with pd.read_csv(source, dtype=str, iterator=True) as lecteur:
+        while True:
+            disponible = budget - 3 * empreintes.octets
+            taille = max(LIGNES_MIN_BLOC, int(disponible / (octets_ligne * FACTEUR_MEMOIRE)))
+            try:
+                yield lecteur.get_chunk(taille)
+            except StopIteration:
+                return
+
+
+def _nettoyer_partition(tache) -> pd.DataFrame:
+    """Colonnes nettoyées d'une partition (exécuté dans un processus du pool)"""
+    partition, col_type, mapping_colonnes, moteur = tache
+    return NettoyeurDonnees()._colonnes_nettoyees(partition, col_type, mapping_colonnes, moteur)
+
+
 class NettoyeurDonnees:
     """Nettoie les données brutes issues de Web Scraper (extension Chrome)"""
     
-    def __init__(self):
+    def __init__(self, schemas: Optional[SchemasColonnes] = None):
+        """
+        Args:
+            schemas: Mappings confirmés par en-tête d'export ; sans eux, les
+                colonnes sont détectées à chaque nettoyage
+        """
+        self.schemas = schemas
         self.stats_nettoyage = {
             'lignes_initiales': 0,
             'lignes_finales': 0,
@@ -104,107 +365,309 @@ class NettoyeurDonnees:
         
         return lien_str if lien_str else ""
     
-    def detecter_colonnes(self, df: pd.DataFrame) -> Dict[str, str]:
+    @staticmethod
+    def _nettoyer_valeurs(valeurs: pd.Series, fonction: Callable, noyau: Callable, textuelle: bool) -> pd.Series:
         """
-        Détecte automatiquement les colonnes dans le DataFrame brut
+        Nettoie des valeurs avec un noyau Arrow
+        
+        Les valeurs dont un caractère sort de l'alphabet commun à Python et
+        Arrow, et celles que le noyau signale, passent par `fonction` :
+        le résultat est celui de valeurs.apply(fonction).
         
+        Args:
+            valeurs: Valeurs brutes (index quelconque)
+            fonction: Fonction par valeur de référence
+            noyau: (textes, vides) -> (résultat, masque à confier à `fonction` ou None)
+            textuelle: Les valeurs sont-elles des chaînes (ou manquantes) ?
+            
         Returns:
-            Dictionnaire {type_standard: nom_colonne_dans_df}
+            Valeurs nettoyées, index 0..n-1
         """
-        mapping = {
-            'type': None,
-            'prix': None,
-            'adresse': None,
-            'image': None
-        }
-        
-        colonnes_lower = {col.lower(): col for col in df.columns}
-        
-        # Détection du type/titre
-        for pattern in ['type', 'titre', 'nom', 'produit', 'title', 'name', 'item']:
-            for col_lower, col_original in colonnes_lower.items():
-                if pattern in col_lower and not mapping['type']:
-                    mapping['type'] = col_original
-                    break
-        
-        # Détection du prix
-        for pattern in ['prix', 'price', 'montant', 'amount', 'cost']:
-            for col_lower, col_original in colonnes_lower.items():
-                if pattern in col_lower and not mapping['prix']:
-                    mapping['prix'] = col_original
-                    break
-        
-        # Détection de l'adresse
-        for pattern in ['adresse', 'localisation', 'location', 'ville', 'city', 'lieu', 'address']:
-            for col_lower, col_original in colonnes_lower.items():
-                if pattern in col_lower and not mapping['adresse']:
-                    mapping['adresse'] = col_original
-                    break
-        
-        # Détection de l'image
-        for pattern in ['image', 'img', 'photo', 'picture', 'pic']:
-            for col_lower, col_original in colonnes_lower.items():
-                if pattern in col_lower and not mapping['image']:
-                    mapping['image'] = col_original
-                    break
-        
-        return mapping
+        if isinstance(valeurs.dtype, pd.StringDtype):
+            textes = pa.array(valeurs, from_pandas=True)
+        elif textuelle:
+            textes = pa.array(valeurs.astype(object), from_pandas=True)
+        else:
+            # Nombres, booléens... : même test de vérité et même conversion que str()
+            textes = pa.array(['' if pd.isna(v) or not v else str(v) for v in valeurs.astype(object)])
+        if isinstance(textes, pa.ChunkedArray):
+            textes = textes.combine_chunks()
+        vides = pc.fill_null(pc.equal(textes, ''), True)
+        textes = pc.fill_null(textes.cast(pa.large_string()), '')
+        
+        resultat, a_part = noyau(textes, vides)
+        # Le motif n'est évalué que sur les valeurs non ASCII
+        hors_alphabet = pc.invert(pc.string_is_ascii(textes))
+        if pc.any(hors_alphabet).as_py():
+            hors_alphabet = pc.replace_with_mask(
+                hors_alphabet, hors_alphabet,
+                pc.match_substring_regex(pc.filter(textes, hors_alphabet), _HORS_ALPHABET)
+            )
+        a_part = hors_alphabet if a_part is None else pc.or_(a_part, hors_alphabet)
+        
+        if pc.any(a_part).as_py():
+            masque = a_part.to_numpy(zero_copy_only=False)
+            resultat = resultat.to_numpy(zero_copy_only=False)
+            resultat[masque] = valeurs[masque].astype(object).map(_memoisee(fonction)).to_numpy()
+        return pd.Series(resultat, dtype=_DTYPE_TEXTE)
     
-    def nettoyer_dataframe(
-        self,
-        df: pd.DataFrame,
-        categorie: str,
-        mapping_colonnes: Dict[str, str] = None
-    ) -> pd.DataFrame:
+    @staticmethod
+    def _vectoriser(serie: pd.Series, fonction: Callable, noyau: Callable, categorielle: bool = False) -> pd.Series:
         """
-        Nettoie un DataFrame complet issu de Web Scraper
+        Nettoie une colonne entière
+        
+        Une colonne catégorielle (titres, prix, adresses : peu de valeurs
+        distinctes) est factorisée : chaque valeur distincte est nettoyée une
+        fois, puis replacée ligne par ligne d'après son code. Le résultat est
+        celui de serie.apply(fonction).
         
         Args:
-            df: DataFrame brut
-            categorie: 'vetements' ou 'chaussures'
-            mapping_colonnes: Mapping manuel des colonnes (optionnel)
+            serie: Colonne brute
+            fonction: Fonction par valeur de référence
+            noyau: (textes, vides) -> (résultat, masque à confier à `fonction` ou None)
+            categorielle: Colonne aux valeurs répétées, renvoyée catégorielle
             
         Returns:
-            DataFrame nettoyé
+            Colonne nettoyée
         """
-        logging.info(f"🧹 Début du nettoyage pour catégorie: {categorie}")
+        if serie.empty:
+            nettoyee = serie.apply(fonction)
+            return nettoyee.astype('category') if categorielle else nettoyee
+        
+        textuelle = isinstance(serie.dtype, pd.StringDtype) or pd.api.types.infer_dtype(serie, skipna=True) == 'string'
+        # Hors des textes, 1, 1.0 et True seraient confondus par la factorisation
+        if categorielle and textuelle:
+            codes, distinctes = pd.factorize(serie, use_na_sentinel=False)
+            distinctes = pd.Series(distinctes)
+            if PYARROW_DISPONIBLE:
+                nettoyees = NettoyeurDonnees._nettoyer_valeurs(distinctes, fonction, noyau, textuelle)
+            else:
+                nettoyees = distinctes.astype(object).map(_memoisee(fonction))
+            
+            # Deux valeurs brutes peuvent donner la même valeur nettoyée
+            codes_nettoyes, categories = pd.factorize(nettoyees)
+            valeurs = pd.Categorical.from_codes(codes_nettoyes[codes], categories=categories)
+            return pd.Series(valeurs, index=serie.index, name=serie.name)
+        
+        if PYARROW_DISPONIBLE:
+            nettoyee = NettoyeurDonnees._nettoyer_valeurs(serie, fonction, noyau, textuelle)
+            nettoyee.index, nettoyee.name = serie.index, serie.name
+        else:
+            nettoyee = serie.apply(fonction)
+        return nettoyee.astype('category') if categorielle else nettoyee
+    
+    @staticmethod
+    def nettoyer_prix_colonne(serie: pd.Series) -> pd.Series:
+        """Version vectorisée de nettoyer_prix (même résultat valeur par valeur, colonne catégorielle)"""
+        return NettoyeurDonnees._vectoriser(serie, NettoyeurDonnees.nettoyer_prix, _noyau_prix, categorielle=True)
+    
+    @staticmethod
+    def nettoyer_texte_colonne(serie: pd.Series) -> pd.Series:
+        """Version vectorisée de nettoyer_texte (colonne catégorielle)"""
+        return NettoyeurDonnees._vectoriser(serie, NettoyeurDonnees.nettoyer_texte, _noyau_texte, categorielle=True)
+    
+    @staticmethod
+    def nettoyer_adresse_colonne(serie: pd.Series) -> pd.Series:
+        """Version vectorisée de nettoyer_adresse (colonne catégorielle)"""
+        return NettoyeurDonnees._vectoriser(serie, NettoyeurDonnees.nettoyer_adresse, _noyau_adresse, categorielle=True)
+    
+    @staticmethod
+    def nettoyer_image_lien_colonne(serie: pd.Series) -> pd.Series:
+        """Version vectorisée de nettoyer_image_lien (texte : les liens sont presque tous distincts)"""
+        return NettoyeurDonnees._vectoriser(serie, NettoyeurDonnees.nettoyer_image_lien, _noyau_image_lien)
+    
+    def detecter_colonnes(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        Détecte automatiquement les colonnes dans le DataFrame brut
         
-        self.stats_nettoyage['lignes_initiales'] = len(df)
-        df_clean = df.copy()
+        Un en-tête déjà confirmé (schemas) reprend son mapping sans détection.
+        Sinon, les colonnes web-scraper-* sont écartées et les rôles sont
+        attribués un à un, d'après les LIGNES_ECHANTILLON premières lignes :
+        la première colonne dont le nom correspond et dont les valeurs ont
+        l'allure du rôle, à défaut la colonne aux valeurs les plus
+        ressemblantes, à défaut (échantillon vide) la première colonne dont
+        le nom correspond.
         
-        # Détection automatique des colonnes si pas de mapping fourni
-        if not mapping_colonnes:
-            mapping_colonnes = self.detecter_colonnes(df_clean)
-            logging.info(f"📋 Colonnes détectées: {mapping_colonnes}")
+        Returns:
+            Dictionnaire {type_standard: nom_colonne_dans_df}
+        """
+        if self.schemas is not None:
+            mapping = self.schemas.mapping(df.columns)
+            if mapping is not None:
+                logging.info("📋 Disposition d'export connue : mapping confirmé repris")
+                return mapping
+        
+        libres = [col for col in df.columns if not str(col).lower().startswith(PREFIXE_WEB_SCRAPER)]
+        echantillon = df[libres].head(LIGNES_ECHANTILLON)
+        profils = {col: _profil_valeurs(echantillon[col]) for col in libres}
+        
+        mapping = dict.fromkeys(MOTIFS_COLONNES)
+        # Liens et prix, les plus reconnaissables, sont attribués en premier
+        for role in ['image', 'prix', 'adresse', 'type']:
+            notes = {col: profils[col][role] for col in libres}
+            candidats = list(dict.fromkeys(
+                col for motif in MOTIFS_COLONNES[role] for col in libres if motif in str(col).lower()
+            ))
+            valides = [col for col in candidats if (notes[col] or 0) >= SEUIL_ROLE]
+            ressemblantes = [col for col in libres if (notes[col] or 0) >= SEUIL_ROLE]
+            
+            if valides:
+                mapping[role] = valides[0]
+            elif ressemblantes:
+                mapping[role] = max(ressemblantes, key=notes.get)
+            elif candidats:
+                mapping[role] = candidats[0]
+            if mapping[role] is not None:
+                libres.remove(mapping[role])
+        
+        return mapping
+    
+    def _confirmer_schema(self, colonnes, mapping_colonnes: Dict[str, str]):
+        """Enregistre le mapping d'un nettoyage qui a produit des annonces"""
+        if self.schemas is not None and self.stats_nettoyage['lignes_finales'] > 0:
+            self.schemas.confirmer(colonnes, mapping_colonnes)
+    
+    def _colonnes_nettoyees(
+        self,
+        df: pd.DataFrame,
+        col_type: str,
+        mapping_colonnes: Dict[str, str],
+        moteur: str
+    ) -> pd.DataFrame:
+        """Colonnes standardisées d'un DataFrame brut, avant dédoublonnage et filtrage"""
+        if moteur not in MOTEURS:
+            raise ValueError(f"Moteur de nettoyage inconnu: {moteur} (choix: {', '.join(MOTEURS)})")
+        
+        if moteur == 'vectorise':
+            nettoyer_texte = self.nettoyer_texte_colonne
+            nettoyer_prix = self.nettoyer_prix_colonne
+            nettoyer_adresse = self.nettoyer_adresse_colonne
+            nettoyer_image_lien = self.nettoyer_image_lien_colonne
+        else:
+            nettoyer_texte = lambda colonne: colonne.apply(self.nettoyer_texte).astype('category')
+            nettoyer_prix = lambda colonne: colonne.apply(self.nettoyer_prix).astype('category')
+            nettoyer_adresse = lambda colonne: colonne.apply(self.nettoyer_adresse).astype('category')
+            nettoyer_image_lien = lambda colonne: colonne.apply(self.nettoyer_image_lien)
         
         # Créer le nouveau DataFrame avec colonnes standardisées
         df_result = pd.DataFrame()
         
         # Type de produit
-        col_type = 'type_habits' if categorie == 'vetements' else 'type_chaussures'
         if mapping_colonnes['type']:
-            df_result[col_type] = df_clean[mapping_colonnes['type']].apply(self.nettoyer_texte)
+            df_result[col_type] = nettoyer_texte(df[mapping_colonnes['type']])
         else:
             df_result[col_type] = "Non disponible"
         
         # Prix
         if mapping_colonnes['prix']:
-            df_result['prix'] = df_clean[mapping_colonnes['prix']].apply(self.nettoyer_prix)
+            df_result['prix'] = nettoyer_prix(df[mapping_colonnes['prix']])
         else:
             df_result['prix'] = "Prix non disponible"
         
         # Adresse
         if mapping_colonnes['adresse']:
-            df_result['adresse'] = df_clean[mapping_colonnes['adresse']].apply(self.nettoyer_adresse)
+            df_result['adresse'] = nettoyer_adresse(df[mapping_colonnes['adresse']])
         else:
             df_result['adresse'] = "Adresse non disponible"
         
         # Image
         if mapping_colonnes['image']:
-            df_result['image_lien'] = df_clean[mapping_colonnes['image']].apply(self.nettoyer_image_lien)
+            df_result['image_lien'] = nettoyer_image_lien(df[mapping_colonnes['image']])
         else:
             df_result['image_lien'] = ""
         
+        return df_result
+    
+    def _colonnes_nettoyees_paralleles(
+        self,
+        df: pd.DataFrame,
+        col_type: str,
+        mapping_colonnes: Dict[str, str],
+        moteur: str,
+        workers: int
+    ) -> pd.DataFrame:
+        """
+        _colonnes_nettoyees sur des partitions de lignes consécutives, dans un
+        pool de processus ; les partitions sont recollées dans l'ordre
+        """
+        nb_partitions = min(workers, -(-len(df) // LIGNES_MIN_PARTITION))
+        if nb_partitions <= 1:
+            return self._colonnes_nettoyees(df, col_type, mapping_colonnes, moteur)
+        
+        # Seules les colonnes utilisées sont transmises aux processus
+        df = df[list(dict.fromkeys(colonne for colonne in mapping_colonnes.values() if colonne))]
+        bornes = np.linspace(0, len(df), nb_partitions + 1).astype(int)
+        taches = [
+            (df.iloc[debut:fin], col_type, mapping_colonnes, moteur)
+            for debut, fin in zip(bornes[:-1], bornes[1:])
+        ]
+        with ProcessPoolExecutor(max_workers=nb_partitions) as pool:
+            parties = list(pool.map(_nettoyer_partition, taches))
+        
+        # pd.concat ne garde une colonne catégorielle que si les catégories sont les mêmes
+        df_result = pd.concat(parties)
+        for colonne in df_result.columns:
+            if isinstance(parties[0][colonne].dtype, pd.CategoricalDtype):
+                df_result[colonne] = union_categoricals([partie[colonne] for partie in parties])
+        return df_result
+    
+    @staticmethod
+    def _lignes_utiles(df_result: pd.DataFrame, col_type: str) -> pd.Series:
+        """Lignes dont le type de produit est renseigné"""
+        return (df_result[col_type].str.len() > 3) & (df_result[col_type] != "Non disponible")
+    
+    @staticmethod
+    def _sans_categories_inutilisees(df_result: pd.DataFrame) -> pd.DataFrame:
+        """Retire des colonnes catégorielles les valeurs des lignes supprimées"""
+        for colonne in df_result.select_dtypes('category').columns:
+            df_result[colonne] = df_result[colonne].cat.remove_unused_categories()
+        return df_result
+    
+    def _journaliser_stats(self):
+        logging.info(f"✅ Nettoyage terminé:")
+        logging.info(f"   • Lignes initiales: {self.stats_nettoyage['lignes_initiales']}")
+        logging.info(f"   • Doublons supprimés: {self.stats_nettoyage['doublons_supprimes']}")
+        logging.info(f"   • Lignes invalides: {self.stats_nettoyage['lignes_invalides']}")
+        logging.info(f"   • Lignes finales: {self.stats_nettoyage['lignes_finales']}")
+    
+    def nettoyer_dataframe(
+        self,
+        df: pd.DataFrame,
+        categorie: str,
+        mapping_colonnes: Dict[str, str] = None,
+        moteur: str = 'vectorise',
+        workers: Optional[int] = 1
+    ) -> pd.DataFrame:
+        """
+        Nettoie un DataFrame complet issu de Web Scraper
+        
+        Args:
+            df: DataFrame brut
+            categorie: 'vetements' ou 'chaussures'
+            mapping_colonnes: Mapping manuel des colonnes (optionnel)
+            moteur: 'vectorise' (colonnes entières) ou 'apply' (valeur par
+                valeur, référence) ; le résultat est identique
+            workers: Processus nettoyant chacun une partition des lignes
+                (nombre de cœurs si None) ; doublons et lignes invalides
+                sont retirés ensuite sur l'ensemble, le résultat est identique
+            
+        Returns:
+            DataFrame nettoyé ; type, prix et adresse sont des colonnes
+            catégorielles
+        """
+        logging.info(f"🧹 Début du nettoyage pour catégorie: {categorie}")
+        
+        self.stats_nettoyage['lignes_initiales'] = len(df)
+        
+        # Détection automatique des colonnes si pas de mapping fourni
+        if not mapping_colonnes:
+            mapping_colonnes = self.detecter_colonnes(df)
+            logging.info(f"📋 Colonnes détectées: {mapping_colonnes}")
+        
+        col_type = 'type_habits' if categorie == 'vetements' else 'type_chaussures'
+        workers = workers or os.cpu_count() or 1
+        df_result = self._colonnes_nettoyees_paralleles(df, col_type, mapping_colonnes, moteur, workers)
+        
         # Supprimer les doublons
         avant_doublons = len(df_result)
         df_result = df_result.drop_duplicates()
@@ -212,25 +675,150 @@ class NettoyeurDonnees:
         
         # Supprimer les lignes sans information utile
         avant_invalides = len(df_result)
-        df_result = df_result[
-            (df_result[col_type].str.len() > 3) &
-            (df_result[col_type] != "Non disponible")
-        ]
+        df_result = df_result[self._lignes_utiles(df_result, col_type)]
         self.stats_nettoyage['lignes_invalides'] = avant_invalides - len(df_result)
         
         # Reset index
-        df_result = df_result.reset_index(drop=True)
+        df_result = self._sans_categories_inutilisees(df_result.reset_index(drop=True))
         
         self.stats_nettoyage['lignes_finales'] = len(df_result)
         
-        logging.info(f"✅ Nettoyage terminé:")
-        logging.info(f"   • Lignes initiales: {self.stats_nettoyage['lignes_initiales']}")
-        logging.info(f"   • Doublons supprimés: {self.stats_nettoyage['doublons_supprimes']}")
-        logging.info(f"   • Lignes invalides: {self.stats_nettoyage['lignes_invalides']}")
-        logging.info(f"   • Lignes finales: {self.stats_nettoyage['lignes_finales']}")
+        self._journaliser_stats()
+        self._confirmer_schema(df.columns, mapping_colonnes)
         
         return df_result
     
+    def nettoyer_csv_par_blocs(
+        self,
+        source,
+        categorie: str,
+        mapping_colonnes: Dict[str, str] = None,
+        memoire_max_mo: int = MEMOIRE_MAX_MO,
+        moteur: str = 'vectorise'
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Nettoie un CSV brut bloc par bloc, en mémoire bornée
+        
+        Chaque bloc est nettoyé puis débarrassé des lignes déjà vues (dans ce
+        bloc ou les précédents, d'après leur empreinte) et des lignes sans
+        information utile. La suite des blocs est le résultat de
+        nettoyer_dataframe sur le fichier entier lu en texte (dtype=str), et
+        stats_nettoyage est complet une fois les blocs épuisés.
+        
+        Args:
+            source: Chemin ou fichier ouvert (fichier importé dans Streamlit)
+            categorie: 'vetements' ou 'chaussures'
+            mapping_colonnes: Mapping manuel des colonnes (optionnel)
+            memoire_max_mo: Mémoire de travail visée, empreintes comprises ;
+                la taille des blocs en découle
+            moteur: 'vectorise' ou 'apply'
+            
+        Yields:
+            Blocs nettoyés (colonnes de nettoyer_dataframe)
+        """
+        logging.info(f"🧹 Début du nettoyage par blocs pour catégorie: {categorie}")
+        
+        echantillon = _lire_echantillon(source)
+        if not mapping_colonnes:
+            mapping_colonnes = self.detecter_colonnes(echantillon)
+            logging.info(f"📋 Colonnes détectées: {mapping_colonnes}")
+        col_type = 'type_habits' if categorie == 'vetements' else 'type_chaussures'
+        
+        for cle in self.stats_nettoyage:
+            self.stats_nettoyage[cle] = 0
+        empreintes = EmpreintesLignes()
+        
+        aucun_bloc = True
+        for bloc in _blocs_csv(source, echantillon, memoire_max_mo, empreintes):
+            aucun_bloc = False
+            self.stats_nettoyage['lignes_initiales'] += len(bloc)
+            df_bloc = self._colonnes_nettoyees(bloc, col_type, mapping_colonnes, moteur)
+            del bloc
+            
+            nouvelles = empreintes.ajouter(df_bloc)
+            self.stats_nettoyage['doublons_supprimes'] += int((~nouvelles).sum())
+            df_bloc = df_bloc[nouvelles]
+            
+            utiles = self._lignes_utiles(df_bloc, col_type)
+            self.stats_nettoyage['lignes_invalides'] += int((~utiles).sum())
+            df_bloc = self._sans_categories_inutilisees(df_bloc[utiles].reset_index(drop=True))
+            
+            self.stats_nettoyage['lignes_finales'] += len(df_bloc)
+            yield df_bloc
+        
+        if aucun_bloc:
+            # Fichier sans lignes : un bloc vide porte les colonnes
+            yield self._colonnes_nettoyees(echantillon, col_type, mapping_colonnes, moteur)
+        
+        self._journaliser_stats()
+        self._confirmer_schema(echantillon.columns, mapping_colonnes)
+    
+    def nettoyer_csv(
+        self,
+        source,
+        fichier_sortie: str,
+        categorie: str,
+        mapping_colonnes: Dict[str, str] = None,
+        memoire_max_mo: int = MEMOIRE_MAX_MO,
+        moteur: str = 'vectorise',
+        traiter_bloc: Optional[Callable[[pd.DataFrame, int], None]] = None
+    ) -> Dict:
+        """
+        Nettoie un CSV brut vers un CSV nettoyé, sans le charger en entier
+        
+        Le fichier de sortie est écrit bloc par bloc sous un nom temporaire
+        puis renommé : il contient les mêmes octets que
+        nettoyer_dataframe(...).to_csv(fichier_sortie, index=False, encoding='utf-8-sig').
+        
+        Args:
+            source: Chemin ou fichier ouvert
+            fichier_sortie: CSV nettoyé
+            categorie: 'vetements' ou 'chaussures'
+            mapping_colonnes: Mapping manuel des colonnes (optionnel)
+            memoire_max_mo: Mémoire de travail visée
+            moteur: 'vectorise' ou 'apply'
+            traiter_bloc: Appelée avec chaque bloc écrit et son numéro (à
+                partir de 1), p. ex. pour l'ajouter à la base des annonces
+            
+        Returns:
+            Statistiques du nettoyage
+        """
+        dossier = os.path.dirname(fichier_sortie)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{fichier_sortie}.{os.getpid()}.tmp"
+        
+        try:
+            with open(temporaire, 'w', encoding='utf-8-sig', newline='') as f:
+                blocs = self.nettoyer_csv_par_blocs(source, categorie, mapping_colonnes, memoire_max_mo, moteur)
+                for numero, bloc in enumerate(blocs, start=1):
+                    bloc.to_csv(f, header=numero == 1, index=False)
+                    if traiter_bloc and len(bloc):
+                        traiter_bloc(bloc, numero)
+            os.replace(temporaire, fichier_sortie)
+        finally:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+        
+        return self.get_stats()
+    
+    def decrire_csv(self, source, memoire_max_mo: int = MEMOIRE_MAX_MO, lignes_apercu: int = 15) -> Dict:
+        """
+        Résumé d'un CSV brut calculé bloc par bloc
+        
+        Returns:
+            {'lignes', 'colonnes', 'doublons', 'valeurs_manquantes', 'apercu'}
+        """
+        echantillon = _lire_echantillon(source)
+        empreintes = EmpreintesLignes()
+        resume = {'lignes': 0, 'colonnes': len(echantillon.columns), 'doublons': 0, 'valeurs_manquantes': 0}
+        for bloc in _blocs_csv(source, echantillon, memoire_max_mo, empreintes):
+            resume['lignes'] += len(bloc)
+            resume['doublons'] += int((~empreintes.ajouter(bloc)).sum())
+            resume['valeurs_manquantes'] += int(bloc.isnull().sum().sum())
+        resume['apercu'] = echantillon.head(lignes_apercu)
+        return resume
+    
     def get_stats(self) -> Dict:
         """Retourne les statistiques du dernier nettoyage"""
         return self.stats_nettoyage.copy()
@@ -0,0 +1,105 @@
+"""
+Construction de l'arbre HTML des pages CoinAfrique avec un parseur au choix
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import re
+from typing import List
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    LXML_DISPONIBLE = True
+except ImportError:
+    LXML_DISPONIBLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _ParseurRapide
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as _ParseurRapide
+    except ImportError:
+        _ParseurRapide = None
+
+# Classe CSS des cartes d'annonce dans la grille de listing
+CLASSE_CARTE = 'ad__card'
+
+BACKENDS = ['html.parser', 'lxml', 'html5lib', 'selectolax']
+
+
+def backends_disponibles() -> List[str]:
+    """Liste des parseurs utilisables dans l'environnement courant"""
+    disponibles = ['html.parser', 'html5lib']
+    if LXML_DISPONIBLE:
+        disponibles.insert(1, 'lxml')
+    if _ParseurRapide is not None:
+        disponibles.append('selectolax')
+    return disponibles
+
+
+def filtre_cartes(classe: str = CLASSE_CARTE) -> SoupStrainer:
+    """SoupStrainer ne gardant que les cartes d'annonce (et leur contenu)"""
+    return SoupStrainer(class_=re.compile(rf'(^|\s){re.escape(classe)}(\s|$)'))
+
+
+def construire_soup(
+    contenu: bytes,
+    backend: str = 'html.parser',
+    restreindre: bool = False,
+    classe_carte: str = CLASSE_CARTE
+) -> BeautifulSoup:
+    """
+    Parse une page avec le backend demandé
+
+    Args:
+        contenu: HTML brut de la page
+        backend: 'html.parser', 'lxml', 'html5lib' ou 'selectolax'
+        restreindre: Ne construire que les cartes d'annonce (SoupStrainer),
+            sans en-tête, pied de page ni scripts. Ignoré par html5lib qui ne
+            supporte pas le parsing partiel.
+        classe_carte: Classe CSS des cartes d'annonce
+
+    Returns:
+        Objet BeautifulSoup exploitable par scraper_une_page
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Parseur inconnu: {backend} (choix: {', '.join(BACKENDS)})")
+    if backend not in backends_disponibles():
+        raise ValueError(f"Parseur non installé: {backend}")
+
+    if backend == 'selectolax':
+        return _soup_selectolax(contenu, classe_carte)
+
+    if restreindre and backend != 'html5lib':
+        return BeautifulSoup(contenu, backend, parse_only=filtre_cartes(classe_carte))
+    return BeautifulSoup(contenu, backend)
+
+
+def _soup_selectolax(contenu: bytes, classe_carte: str) -> BeautifulSoup:
+    """
+    Chemin rapide : le parseur C de selectolax isole les cartes, puis seul
+    leur HTML est reconstruit en arbre BeautifulSoup
+    """
+    arbre = _ParseurRapide(contenu)
+    noeuds = arbre.css(f'.{classe_carte}')
+    sous_parseur = 'lxml' if LXML_DISPONIBLE else 'html.parser'
+
+    if not noeuds:
+        # Balisage inattendu : on garde tout le corps, sans scripts ni styles
+        arbre.strip_tags(['script', 'style', 'noscript'])
+        racine = arbre.body or arbre.root
+        return BeautifulSoup(racine.html if racine else '', sous_parseur)
+
+    # Ne garder que les cartes de plus haut niveau (pas celles imbriquées)
+    identifiants = {noeud.mem_id for noeud in noeuds}
+    cartes = []
+    for noeud in noeuds:
+        parent = noeud.parent
+        while parent is not None and parent.mem_id not in identifiants:
+            parent = parent.parent
+        if parent is None:
+            cartes.append(noeud.html)
+
+    return BeautifulSoup(''.join(cartes), sous_parseur)
@@ -0,0 +1,250 @@
+"""
+Pipeline de scraping : téléchargement, parsing multi-processus, écriture
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from index_annonces import DedoublonnageCrawl
+from regles_extraction import MoteurRegles
+
+# Scraper propre à chaque processus de parsing (créé par initialiser_processus)
+_scraper_processus = None
+
+
+def initialiser_processus(parseur: str, restreindre_parsing: bool):
+    """Crée le scraper d'un processus de parsing (initializer du pool)"""
+    global _scraper_processus
+    from scraper_coinafrique import CoinAfriqueScraper
+    _scraper_processus = CoinAfriqueScraper(parseur=parseur, restreindre_parsing=restreindre_parsing)
+
+
+def extraire_html(nom_categorie: Optional[str], contenu: bytes) -> Tuple:
+    """
+    Parse une page et en extrait les annonces (exécuté dans un processus du pool)
+
+    Returns:
+        (annonces de la page, répétitions relevées dans la page, compteurs
+        des règles pour cette page, durée en secondes)
+    """
+    debut = time.perf_counter()
+    regles = _scraper_processus.moteur_regles(nom_categorie) if nom_categorie else _scraper_processus.regles
+    page_seule = DedoublonnageCrawl()
+    annonces = _scraper_processus.extraire_annonces(contenu, regles, page_seule)
+    return annonces, page_seule, regles.relever_compteurs(), time.perf_counter() - debut
+
+
+class PipelineScraping:
+    """
+    Scraping d'une catégorie en trois étages concurrents
+
+    - téléchargement : `fetchers` threads déposent le HTML brut dans une
+      file bornée ;
+    - parsing : un distributeur confie chaque page au pool de processus du
+      scraper, avec au plus deux pages par processus en cours ;
+    - écriture : le consommateur de `iter_pages` reçoit les pages dans
+      l'ordre et persiste leurs annonces.
+
+    La contre-pression est assurée de bout en bout : au plus
+    `pages_en_cours` pages sont lancées sans avoir été consommées, donc un
+    écrivain lent finit par suspendre les téléchargements. Chaque étage
+    compte ses pages, son temps d'activité et son temps de blocage.
+    """
+
+    def __init__(self, scraper, fetchers: int = 4, taille_file: int = 8):
+        """
+        Args:
+            scraper: CoinAfriqueScraper avec workers_parsing > 0 (session,
+                limiteurs, cache et pool de processus de parsing)
+            fetchers: Threads de téléchargement
+            taille_file: Capacité de la file téléchargement -> parsing
+        """
+        self.scraper = scraper
+        self.pool: ProcessPoolExecutor = scraper.pool_parsing()
+        self.fetchers = max(1, fetchers)
+        self.taille_file = max(1, taille_file)
+        self.parsings_max = 2 * max(1, scraper.workers_parsing)
+        self.pages_en_cours = self.taille_file + self.parsings_max + self.fetchers
+
+        self._verrou = threading.Lock()
+        self.stats = {
+            etage: {'pages': 0, 'duree_active': 0.0, 'attente': 0.0}
+            for etage in ('telechargement', 'parsing', 'ecriture')
+        }
+        self.stats['telechargement']['octets'] = 0
+        self.stats['parsing']['annonces'] = 0
+        self._debut = None
+        self._fin = None
+
+    def _compter(self, etage: str, duree: float = 0.0, attente: float = 0.0, **autres):
+        with self._verrou:
+            stats = self.stats[etage]
+            stats['pages'] += 1
+            stats['duree_active'] += duree
+            stats['attente'] += attente
+            for cle, valeur in autres.items():
+                stats[cle] += valeur
+
+    def iter_pages(
+        self,
+        url: str,
+        premiere_page: int,
+        max_pages: int,
+        regles: Optional[MoteurRegles] = None
+    ) -> Iterator[Tuple[int, str, Callable[[], Tuple]]]:
+        """
+        Télécharge et parse les pages en parallèle, et les cède dans l'ordre
+
+        Les compteurs des règles relevés dans les processus de parsing sont
+        cumulés dans `regles` (règles générales du scraper par défaut).
+
+        Yields:
+            (page, URL, résultat) où résultat() retourne (contenu, annonces,
+            extraction) : annonces du cache ou du parsing, et répétitions
+            relevées par le parsing (None pour une page servie par le
+            cache). Une page en échec lève son exception à l'appel de
+            résultat().
+        """
+        regles = regles or self.scraper.regles
+        arret = threading.Event()
+        places = threading.Semaphore(self.pages_en_cours)
+        places_parsing = threading.Semaphore(self.parsings_max)
+        file_html = queue.Queue(maxsize=self.taille_file)
+        condition = threading.Condition()
+        resultats: Dict[int, Tuple] = {}
+        prochaine = {'page': premiere_page}
+
+        def deposer(page: int, page_url: str, erreur: Optional[BaseException], *donnees):
+            with condition:
+                resultats[page] = (page_url, erreur, donnees)
+                condition.notify_all()
+
+        def attendre_place(semaphore: threading.Semaphore) -> bool:
+            while not arret.is_set():
+                if semaphore.acquire(timeout=0.1):
+                    return True
+            return False
+
+        def telecharger():
+            while attendre_place(places):
+                with self._verrou:
+                    page = prochaine['page']
+                    prochaine['page'] += 1
+                if page > max_pages:
+                    places.release()
+                    return
+                page_url = self.scraper._url_page(url, page)
+                debut = time.perf_counter()
+                try:
+                    contenu, annonces = self.scraper._recuperer_page(page_url, regles.empreinte)
+                    element = (page, page_url, None, contenu, annonces)
+                except Exception as e:
+                    contenu = b""
+                    element = (page, page_url, e, None, None)
+                duree = time.perf_counter() - debut
+
+                # Contre-pression : bloqué tant que le parsing ne suit pas
+                debut_attente = time.perf_counter()
+                while not arret.is_set():
+                    try:
+                        file_html.put(element, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                self._compter('telechargement', duree, time.perf_counter() - debut_attente, octets=len(contenu))
+
+        def distribuer():
+            while True:
+                element = file_html.get()
+                if element is None:
+                    return
+                page, page_url, erreur, contenu, annonces = element
+                if erreur is not None or annonces is not None:
+                    # Échec ou page inchangée (annonces du cache) : rien à parser
+                    deposer(page, page_url, erreur, contenu, annonces, None, None)
+                    continue
+
+                debut_attente = time.perf_counter()
+                if not attendre_place(places_parsing):
+                    continue
+                attente = time.perf_counter() - debut_attente
+                try:
+                    future = self.pool.submit(extraire_html, regles.categorie, contenu)
+                except Exception as e:
+                    # Pool arrêté ou cassé : la page passe en échec
+                    places_parsing.release()
+                    deposer(page, page_url, e)
+                    continue
+
+                def terminer(future, page=page, page_url=page_url, contenu=contenu, attente=attente):
+                    places_parsing.release()
+                    try:
+                        annonces, extraction, releve, duree = future.result()
+                    except Exception as e:
+                        deposer(page, page_url, e)
+                        return
+                    self._compter('parsing', duree, attente, annonces=len(annonces))
+                    deposer(page, page_url, None, contenu, annonces, extraction, releve)
+
+                future.add_done_callback(terminer)
+
+        self._debut = time.perf_counter()
+        threads = [threading.Thread(target=telecharger, daemon=True) for _ in range(self.fetchers)]
+        distributeur = threading.Thread(target=distribuer, daemon=True)
+        for thread in threads + [distributeur]:
+            thread.start()
+
+        def resultat(erreur: Optional[BaseException], donnees: Tuple) -> Callable[[], Tuple]:
+            def obtenir():
+                if erreur is not None:
+                    raise erreur
+                return donnees[:3]
+            return obtenir
+
+        try:
+            for page in range(premiere_page, max_pages + 1):
+                debut_attente = time.perf_counter()
+                with condition:
+                    while page not in resultats:
+                        condition.wait(timeout=0.1)
+                    page_url, erreur, donnees = resultats.pop(page)
+                attente = time.perf_counter() - debut_attente
+                if donnees and donnees[3]:
+                    regles.cumuler_compteurs(donnees[3])
+
+                debut = time.perf_counter()
+                yield page, page_url, resultat(erreur, donnees)
+                self._compter('ecriture', time.perf_counter() - debut, attente)
+                places.release()
+        finally:
+            # Arrêt (fin, page vide ou consommateur interrompu) : plus aucune
+            # page n'est lancée, les parsings déjà soumis s'achèvent
+            arret.set()
+            for thread in threads:
+                thread.join()
+            file_html.put(None)
+            distributeur.join()
+            self._fin = time.perf_counter()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Débit de chaque étage
+
+        Returns:
+            {étage: {'pages', 'duree_active', 'attente', 'pages_par_seconde', ...}}
+            avec attente = temps bloqué à attendre l'étage suivant (ou, pour
+            l'écriture, le précédent)
+        """
+        with self._verrou:
+            stats = {etage: valeurs.copy() for etage, valeurs in self.stats.items()}
+        duree = ((self._fin or time.perf_counter()) - self._debut) if self._debut else 0.0
+        for valeurs in stats.values():
+            valeurs['pages_par_seconde'] = round(valeurs['pages'] / duree, 2) if duree else 0.0
+            valeurs['duree_active'] = round(valeurs['duree_active'], 3)
+            valeurs['attente'] = round(valeurs['attente'], 3)
+        return stats
@@ -0,0 +1,247 @@
+"""
+Points de reprise des scrapings interrompus
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# États successifs d'une page de catégorie
+ETATS_PAGE = ('telechargee', 'extraite', 'ecrite', 'echec')
+
+
+class PointsReprise:
+    """
+    Frontière du scraping enregistrée dans une base SQLite
+
+    Pour chaque catégorie en cours, on garde l'état de chaque page
+    (téléchargée, extraite, écrite dans le CSV), la taille du fichier CSV
+    après la dernière page écrite et les annonces déjà émises. Un scraping
+    interrompu reprend à la page suivant la dernière page écrite, sans
+    re-télécharger les précédentes.
+
+    Les écritures sont regroupées : les mises à jour sont gardées en
+    mémoire et enregistrées en une transaction toutes les `taille_lot`
+    pages écrites ou `delai_max` secondes. Un arrêt brutal fait perdre au
+    plus le dernier lot ; le CSV est alors tronqué à la taille enregistrée
+    avant de reprendre, donc aucune ligne n'est dupliquée.
+
+    Un état lié à la frontière (l'index des annonces vues d'un scraping
+    incrémental) est sauvegardé par un appel `au_enregistrement`, juste
+    après chaque transaction qui fait avancer la catégorie : il n'est
+    jamais en avance sur le point de reprise.
+    """
+
+    def __init__(self, chemin: str = 'data/cache/reprise.sqlite', taille_lot: int = 10, delai_max: float = 5.0):
+        """
+        Args:
+            chemin: Base SQLite des points de reprise
+            taille_lot: Pages écrites entre deux enregistrements
+            delai_max: Délai maximal entre deux enregistrements (secondes)
+        """
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        self.taille_lot = max(1, taille_lot)
+        self.delai_max = delai_max
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.executescript("""
+            CREATE TABLE IF NOT EXISTS categories (
+                categorie TEXT PRIMARY KEY,
+                terminee INTEGER NOT NULL DEFAULT 0,
+                derniere_page INTEGER NOT NULL DEFAULT 0,
+                octets_csv INTEGER NOT NULL DEFAULT 0,
+                lignes_debut INTEGER NOT NULL DEFAULT 0,
+                date_debut REAL NOT NULL,
+                date_maj REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                categorie TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                etat TEXT NOT NULL,
+                nb_annonces INTEGER,
+                date_maj REAL NOT NULL,
+                PRIMARY KEY (categorie, page)
+            );
+            CREATE TABLE IF NOT EXISTS annonces_emises (
+                categorie TEXT NOT NULL,
+                cle TEXT NOT NULL,
+                PRIMARY KEY (categorie, cle)
+            );
+        """)
+        self._connexion.commit()
+
+        self._pages_en_attente: Dict[tuple, tuple] = {}
+        self._categories_en_attente: Dict[str, tuple] = {}
+        self._cles_en_attente: List[tuple] = []
+        self._pages_ecrites_lot = 0
+        self._dernier_enregistrement = time.monotonic()
+        self._sauvegardes: Dict[str, Callable[[], None]] = {}
+
+        self.stats = {
+            'enregistrements': 0,
+            'mises_a_jour': 0,
+            'pages_reprises': 0
+        }
+
+    def etat_categorie(self, categorie: str) -> Optional[Dict]:
+        """
+        Point de reprise d'une catégorie interrompue
+
+        Returns:
+            {'derniere_page', 'octets_csv', 'lignes_debut', 'date_debut', 'cles'},
+            ou None
+            si la catégorie n'a pas de scraping inachevé avec au moins
+            une page écrite
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT derniere_page, octets_csv, lignes_debut, date_debut FROM categories "
+                "WHERE categorie = ? AND terminee = 0 AND derniere_page > 0",
+                (categorie,)
+            ).fetchone()
+            if not ligne:
+                return None
+            cles = [
+                json.loads(cle) for (cle,) in self._connexion.execute(
+                    "SELECT cle FROM annonces_emises WHERE categorie = ?", (categorie,)
+                )
+            ]
+            self.stats['pages_reprises'] += ligne[0]
+        return {
+            'derniere_page': ligne[0], 'octets_csv': ligne[1], 'lignes_debut': ligne[2],
+            'date_debut': ligne[3], 'cles': cles
+        }
+
+    def commencer(self, categorie: str, lignes_debut: int = 0):
+        """Démarre un nouveau scraping de la catégorie (oublie le précédent)"""
+        maintenant = time.time()
+        with self._verrou:
+            for cle in [c for c in self._pages_en_attente if c[0] == categorie]:
+                del self._pages_en_attente[cle]
+            self._cles_en_attente = [c for c in self._cles_en_attente if c[0] != categorie]
+            self._categories_en_attente.pop(categorie, None)
+            with self._connexion:
+                self._connexion.execute("DELETE FROM pages WHERE categorie = ?", (categorie,))
+                self._connexion.execute("DELETE FROM annonces_emises WHERE categorie = ?", (categorie,))
+                self._connexion.execute(
+                    "INSERT OR REPLACE INTO categories "
+                    "(categorie, terminee, derniere_page, octets_csv, lignes_debut, date_debut, date_maj) "
+                    "VALUES (?, 0, 0, 0, ?, ?, ?)",
+                    (categorie, lignes_debut, maintenant, maintenant)
+                )
+
+    def au_enregistrement(self, categorie: str, sauvegarde: Optional[Callable[[], None]]):
+        """
+        Associe à la catégorie une sauvegarde faite après chacun de ses points de reprise
+
+        Args:
+            categorie: Clé de la catégorie
+            sauvegarde: Fonction sans argument, ou None pour retirer la précédente
+        """
+        with self._verrou:
+            if sauvegarde is None:
+                self._sauvegardes.pop(categorie, None)
+            else:
+                self._sauvegardes[categorie] = sauvegarde
+
+    def marquer(self, categorie: str, page: int, etat: str, nb_annonces: Optional[int] = None):
+        """Enregistre (en différé) l'état d'une page"""
+        if etat not in ETATS_PAGE:
+            raise ValueError(f"État de page inconnu: {etat}")
+        with self._verrou:
+            self._pages_en_attente[(categorie, page)] = (etat, nb_annonces, time.time())
+            self.stats['mises_a_jour'] += 1
+
+    def page_ecrite(self, categorie: str, page: int, nb_annonces: int, octets_csv: int, cles: List):
+        """
+        Enregistre (en différé) une page écrite dans le CSV
+
+        Args:
+            categorie: Clé de la catégorie
+            page: Numéro de la page
+            nb_annonces: Annonces écrites pour cette page
+            octets_csv: Taille du fichier CSV après écriture de la page
+            cles: Clés de déduplication des annonces émises par la page
+        """
+        maintenant = time.time()
+        with self._verrou:
+            self._pages_en_attente[(categorie, page)] = ('ecrite', nb_annonces, maintenant)
+            self._categories_en_attente[categorie] = (page, octets_csv, maintenant)
+            self._cles_en_attente.extend((categorie, json.dumps(cle)) for cle in cles)
+            self._pages_ecrites_lot += 1
+            self.stats['mises_a_jour'] += 1
+            if (self._pages_ecrites_lot >= self.taille_lot
+                    or time.monotonic() - self._dernier_enregistrement >= self.delai_max):
+                self._enregistrer()
+
+    def terminer(self, categorie: str):
+        """Marque le scraping de la catégorie comme achevé"""
+        with self._verrou:
+            self._enregistrer()
+            # L'état lié est complet avant que la catégorie soit close
+            if categorie in self._sauvegardes:
+                self._sauvegardes[categorie]()
+            with self._connexion:
+                self._connexion.execute(
+                    "UPDATE categories SET terminee = 1, date_maj = ? WHERE categorie = ?",
+                    (time.time(), categorie)
+                )
+                self._connexion.execute("DELETE FROM annonces_emises WHERE categorie = ?", (categorie,))
+
+    def enregistrer(self):
+        """Écrit immédiatement les mises à jour en attente"""
+        with self._verrou:
+            self._enregistrer()
+
+    def _enregistrer(self):
+        """Écrit le lot en attente en une transaction (verrou tenu)"""
+        if self._pages_en_attente or self._categories_en_attente or self._cles_en_attente:
+            with self._connexion:
+                self._connexion.executemany(
+                    "INSERT OR REPLACE INTO pages (categorie, page, etat, nb_annonces, date_maj) VALUES (?, ?, ?, ?, ?)",
+                    [(c, p, *valeurs) for (c, p), valeurs in self._pages_en_attente.items()]
+                )
+                self._connexion.executemany(
+                    "UPDATE categories SET derniere_page = ?, octets_csv = ?, date_maj = ? WHERE categorie = ?",
+                    [(*valeurs, c) for c, valeurs in self._categories_en_attente.items()]
+                )
+                self._connexion.executemany(
+                    "INSERT OR IGNORE INTO annonces_emises (categorie, cle) VALUES (?, ?)",
+                    self._cles_en_attente
+                )
+            self.stats['enregistrements'] += 1
+        categories_avancees = [c for c in self._categories_en_attente if c in self._sauvegardes]
+        self._pages_en_attente = {}
+        self._categories_en_attente = {}
+        self._cles_en_attente = []
+        self._pages_ecrites_lot = 0
+        self._dernier_enregistrement = time.monotonic()
+        for categorie in categories_avancees:
+            self._sauvegardes[categorie]()
+
+    def frontiere(self, categorie: str) -> Dict[int, str]:
+        """État de chaque page connue de la catégorie ({page: état})"""
+        with self._verrou:
+            self._enregistrer()
+            return dict(self._connexion.execute(
+                "SELECT page, etat FROM pages WHERE categorie = ? ORDER BY page", (categorie,)
+            ).fetchall())
+
+    def get_stats(self) -> Dict:
+        """Nombre de transactions, de mises à jour et de pages sautées à la reprise"""
+        with self._verrou:
+            return self.stats.copy()
+
+    def fermer(self):
+        """Enregistre le lot en attente et ferme la base"""
+        with self._verrou:
+            self._enregistrer()
+            self._connexion.close()
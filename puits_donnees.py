@@ -0,0 +1,136 @@
+"""
+Écriture incrémentale des annonces au fil du scraping
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import csv
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+class PuitsCSV:
+    """
+    Ajoute chaque lot d'annonces au fichier CSV dès sa réception
+
+    Le fichier est (ré)initialisé au premier lot, sauf en mode ajout où les
+    lignes existantes sont conservées : les lots suivent alors l'en-tête du
+    fichier (colonnes absentes d'une annonce laissées vides), élargi aux
+    colonnes demandées qui lui manquent. Un crash en cours de scraping laisse
+    donc sur disque toutes les pages déjà traitées. La taille du fichier
+    après chaque lot (`octets`) sert de point de reprise : `tronquer`
+    retire ce qui a été écrit au-delà.
+    """
+
+    def __init__(
+        self,
+        chemin: str,
+        colonnes: List[str],
+        renommage: Optional[Dict[str, str]] = None,
+        ajout: bool = False
+    ):
+        """
+        Args:
+            chemin: Fichier CSV de sortie
+            colonnes: Colonnes écrites, dans l'ordre
+            renommage: Clés des annonces à renommer (ex: {'type': 'type_habits'})
+            ajout: Conserver le contenu existant du fichier
+        """
+        self.chemin = chemin
+        self.colonnes = colonnes
+        self.renommage = renommage or {}
+        self.ajout = ajout
+        self.lignes_existantes = 0
+        self.lignes_ecrites = 0
+        self.prix_disponibles = 0
+        self.adresses_disponibles = 0
+        self.octets = 0
+        self._ouvert = False
+
+    def ouvrir(self):
+        """Prépare le fichier (en-tête ou comptage des lignes existantes), une seule fois"""
+        if self._ouvert:
+            return
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+        if self.ajout and os.path.exists(self.chemin) and os.path.getsize(self.chemin) > 0:
+            with open(self.chemin, newline='', encoding='utf-8-sig') as f:
+                lecteur = csv.reader(f)
+                entete = next(lecteur)
+                self.lignes_existantes = sum(1 for _ in lecteur)
+            nouvelles = [colonne for colonne in self.colonnes if colonne not in entete]
+            self.colonnes = entete + nouvelles
+            if nouvelles:
+                self._elargir(len(entete))
+        else:
+            with open(self.chemin, 'w', newline='', encoding='utf-8-sig') as f:
+                csv.writer(f).writerow(self.colonnes)
+        self.octets = os.path.getsize(self.chemin)
+        self._ouvert = True
+
+    def _elargir(self, nb_colonnes_existantes: int):
+        """Réécrit le fichier sous l'en-tête élargi, nouvelles colonnes vides pour les lignes existantes"""
+        temporaire = f"{self.chemin}.tmp"
+        vides = [''] * (len(self.colonnes) - nb_colonnes_existantes)
+        with open(self.chemin, newline='', encoding='utf-8-sig') as source, \
+                open(temporaire, 'w', newline='', encoding='utf-8-sig') as cible:
+            lecteur = csv.reader(source)
+            next(lecteur)
+            ecrivain = csv.writer(cible)
+            ecrivain.writerow(self.colonnes)
+            for ligne in lecteur:
+                ecrivain.writerow(ligne + vides)
+        os.replace(temporaire, self.chemin)
+
+    def tronquer(self, octets: int):
+        """Ramène le fichier à la taille d'un point de reprise (avant ouverture)"""
+        if os.path.exists(self.chemin) and os.path.getsize(self.chemin) > octets:
+            os.truncate(self.chemin, octets)
+
+    def ecrire(self, annonces: List[Dict]):
+        """Ajoute un lot d'annonces à la fin du fichier"""
+        self.ouvrir()
+        if not annonces:
+            return
+
+        lignes = []
+        for annonce in annonces:
+            ligne = {
+                self.renommage.get(cle, cle): (' | '.join(valeur) if isinstance(valeur, list) else valeur)
+                for cle, valeur in annonce.items()
+            }
+            lignes.append(ligne)
+            if ligne.get('prix') != 'Prix non disponible':
+                self.prix_disponibles += 1
+            if ligne.get('adresse') != 'Adresse non disponible':
+                self.adresses_disponibles += 1
+
+        with open(self.chemin, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.colonnes, extrasaction='ignore')
+            writer.writerows(lignes)
+        self.octets = os.path.getsize(self.chemin)
+        self.lignes_ecrites += len(lignes)
+
+    def relire(self, lignes_ignorees: Optional[int] = None) -> pd.DataFrame:
+        """
+        Relit uniquement les lignes écrites par ce puits
+
+        Args:
+            lignes_ignorees: Lignes de début de fichier à sauter (par défaut
+                celles qui précédaient ce puits)
+        """
+        if lignes_ignorees is None:
+            if not self.lignes_ecrites:
+                return pd.DataFrame(columns=self.colonnes)
+            lignes_ignorees = self.lignes_existantes
+        return pd.read_csv(
+            self.chemin,
+            skiprows=range(1, 1 + lignes_ignorees),
+            dtype=str,
+            keep_default_na=False,
+            encoding='utf-8-sig'
+        )
@@ -0,0 +1,268 @@
+"""
+Moteur de règles d'extraction déclaratives
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import soupsieve
+
+# Fichier de configuration livré avec le projet (catégories et règles)
+CHEMIN_REGLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'regles_extraction.json')
+
+# Sélecteur réduit à un nom de balise : un simple find() suffit
+RE_NOM_BALISE = re.compile(r'^[a-zA-Z][a-zA-Z0-9]*$')
+
+
+def charger_config(chemin: str = CHEMIN_REGLES) -> Dict:
+    """Lit le fichier de configuration des catégories et des règles"""
+    with open(chemin, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def charger_categories(chemin: str = CHEMIN_REGLES) -> Dict[str, Dict]:
+    """
+    Catégories scrapées, telles que déclarées dans la configuration
+
+    Returns:
+        {clé: {'nom', 'url', 'type_col'}} dans l'ordre du fichier
+    """
+    return charger_config(chemin)['categories']
+
+
+class RegleCompilee:
+    """
+    Une règle d'extraction dont regex et sélecteur sont compilés une fois
+
+    Une règle textuelle (clés 'contient', 'contient_insensible', 'regex')
+    est testée sur chaque texte de l'élément ; la regex est cherchée dans le
+    texte (re.search, comme string=re.compile(...) de BeautifulSoup), un
+    texte sur plusieurs lignes correspond donc si l'une d'elles correspond.
+    Une règle à sélecteur ('selecteur', 'attributs') lit le premier
+    descendant correspondant.
+    """
+
+    def __init__(self, champ: str, definition: Dict):
+        """
+        Args:
+            champ: Champ de l'annonce alimenté par la règle
+            definition: Règle telle qu'écrite dans la configuration
+        """
+        self.champ = champ
+        self.nom = definition['nom']
+        self.transformation = definition.get('transformation', 'texte')
+        self.contient = tuple(definition.get('contient', []))
+        self.contient_insensible = tuple(m.lower() for m in definition.get('contient_insensible', []))
+        self.regex = re.compile(definition['regex']) if definition.get('regex') else None
+        self.attributs = tuple(definition.get('attributs', []))
+        self.teste = self._compiler_test()
+
+        selecteur = definition.get('selecteur')
+        if not selecteur:
+            self.selecteur = None
+        elif RE_NOM_BALISE.match(selecteur):
+            self.selecteur = lambda element, nom=selecteur.lower(): element.find(nom)
+        else:
+            self.selecteur = soupsieve.compile(selecteur).select_one
+
+        self.evaluations = 0
+        self.correspondances = 0
+        self.duree = 0.0
+
+    @property
+    def textuelle(self) -> bool:
+        return self.selecteur is None
+
+    def _compiler_test(self) -> Callable[[str], bool]:
+        """
+        Prédicat de la règle textuelle, réduit aux seuls tests déclarés
+        (sous-chaînes d'abord, regex ensuite)
+        """
+        contient, insensible, regex = self.contient, self.contient_insensible, self.regex
+
+        if len(contient) == 1 and not insensible:
+            marqueur = contient[0]
+            sous_chaine = lambda texte: marqueur in texte
+        elif contient or insensible:
+            sous_chaine = lambda texte: (
+                any(m in texte for m in contient)
+                or (bool(insensible) and any(m in texte.lower() for m in insensible))
+            )
+        else:
+            sous_chaine = None
+
+        if regex is None:
+            return sous_chaine or (lambda texte: True)
+        if sous_chaine is None:
+            return lambda texte: regex.search(texte) is not None
+        return lambda texte: sous_chaine(texte) and regex.search(texte) is not None
+
+    def lire(self, element) -> str:
+        """Valeur brute lue par une règle à sélecteur ('' si absente)"""
+        cible = self.selecteur(element)
+        if cible is None:
+            return ""
+        if not self.attributs:
+            return cible.get_text()
+        for attribut in self.attributs:
+            valeur = cible.get(attribut)
+            if valeur:
+                return valeur
+        return ""
+
+    def get_stats(self) -> Dict:
+        return {
+            'champ': self.champ,
+            'regle': self.nom,
+            'evaluations': self.evaluations,
+            'correspondances': self.correspondances,
+            'taux_correspondance': round(self.correspondances / self.evaluations, 3) if self.evaluations else 0.0,
+            'duree_ms': round(self.duree * 1000, 2)
+        }
+
+
+class MoteurRegles:
+    """
+    Applique les règles compilées d'une catégorie aux cartes d'annonce
+
+    Pour chaque champ, les règles sont classées par priorité : la première
+    qui correspond fournit la valeur, sinon le champ prend sa valeur par
+    défaut. Toutes les règles textuelles d'une même portée sont évaluées
+    pendant un seul parcours des textes de l'élément, qui s'arrête dès que
+    chaque champ a obtenu sa règle la plus prioritaire.
+
+    Les compteurs ne sont pas protégés par un verrou : utiliser un moteur
+    par flux de pages (un par catégorie). `empreinte` identifie les règles :
+    des annonces extraites sous une autre empreinte ne sont pas reprises
+    du cache HTTP.
+    """
+
+    def __init__(self, champs: Dict[str, Dict], transformations: Dict[str, Callable[[str], str]]):
+        """
+        Args:
+            champs: Section 'regles' de la configuration ({champ: {portee, defaut, regles}})
+            transformations: Fonctions de mise en forme par nom ('nombre', 'texte', 'url'...)
+        """
+        self.transformations = transformations
+        self.categorie: Optional[str] = None
+        self._portees: Dict[str, List] = {}
+        self.regles: List[RegleCompilee] = []
+        self.empreinte = hashlib.sha1(
+            json.dumps(champs, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()[:16]
+
+        for champ, definition in champs.items():
+            regles = [RegleCompilee(champ, regle) for regle in definition['regles']]
+            for regle in regles:
+                if regle.transformation not in transformations:
+                    raise ValueError(f"Transformation inconnue '{regle.transformation}' (règle {regle.nom})")
+            self.regles.extend(regles)
+            self._portees.setdefault(definition.get('portee', 'carte'), []).append(
+                (champ, definition.get('defaut', ""), regles)
+            )
+
+    @classmethod
+    def depuis_config(
+        cls,
+        transformations: Dict[str, Callable[[str], str]],
+        categorie: Optional[str] = None,
+        config: Optional[Dict] = None
+    ) -> 'MoteurRegles':
+        """
+        Compile les règles générales, surchargées champ par champ par
+        celles de la catégorie ('regles_par_categorie')
+        """
+        config = config or charger_config()
+        champs = dict(config['regles'])
+        champs.update(config.get('regles_par_categorie', {}).get(categorie, {}))
+        moteur = cls(champs, transformations)
+        moteur.categorie = categorie
+        return moteur
+
+    def extraire(self, element, portee: str = 'carte') -> Dict[str, str]:
+        """
+        Valeurs des champs d'une portée ('carte' ou 'lien') pour un élément
+
+        Returns:
+            {champ: valeur}, dans l'ordre de la configuration
+        """
+        mesure = time.perf_counter
+        champs = self._portees.get(portee, [])
+        trouves = {}
+        candidats = []
+
+        for champ, _, regles in champs:
+            for rang, regle in enumerate(regles):
+                regle.evaluations += 1
+                if regle.textuelle:
+                    candidats.append((champ, rang, regle))
+                    continue
+                debut = mesure()
+                valeur = regle.lire(element)
+                regle.duree += mesure() - debut
+                if valeur:
+                    regle.correspondances += 1
+                    trouves[champ] = (rang, regle, valeur)
+                    break
+
+        # Règles textuelles encore utiles : plus prioritaires que la valeur trouvée
+        candidats = [c for c in candidats if c[0] not in trouves or c[1] < trouves[c[0]][0]]
+
+        if candidats:
+            for texte in element.strings:
+                modifie = False
+                for champ, rang, regle in candidats:
+                    if champ in trouves and trouves[champ][0] <= rang:
+                        continue
+                    debut = mesure()
+                    correspond = regle.teste(texte)
+                    regle.duree += mesure() - debut
+                    if correspond:
+                        regle.correspondances += 1
+                        trouves[champ] = (rang, regle, texte)
+                        modifie = True
+                if modifie:
+                    candidats = [c for c in candidats if c[0] not in trouves or c[1] < trouves[c[0]][0]]
+                    if not candidats:
+                        break
+
+        resultats = {}
+        for champ, defaut, _ in champs:
+            if champ not in trouves:
+                resultats[champ] = defaut
+                continue
+            _, regle, valeur = trouves[champ]
+            debut = mesure()
+            resultats[champ] = self.transformations[regle.transformation](valeur) or defaut
+            regle.duree += mesure() - debut
+        return resultats
+
+    def relever_compteurs(self) -> List[Tuple[int, int, float]]:
+        """
+        Compteurs de chaque règle depuis le dernier relevé, remis à zéro
+
+        Sert à rapatrier les statistiques d'un moteur utilisé dans un
+        processus de parsing (voir cumuler_compteurs).
+        """
+        releve = []
+        for regle in self.regles:
+            releve.append((regle.evaluations, regle.correspondances, regle.duree))
+            regle.evaluations, regle.correspondances, regle.duree = 0, 0, 0.0
+        return releve
+
+    def cumuler_compteurs(self, releve: List[Tuple[int, int, float]]):
+        """Ajoute un relevé d'un moteur de même configuration à ces compteurs"""
+        for regle, (evaluations, correspondances, duree) in zip(self.regles, releve):
+            regle.evaluations += evaluations
+            regle.correspondances += correspondances
+            regle.duree += duree
+
+    def get_stats(self) -> List[Dict]:
+        """Taux de correspondance et temps passé, règle par règle"""
+        return [regle.get_stats() for regle in self.regles]
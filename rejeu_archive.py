@@ -0,0 +1,268 @@
+"""
+Rejeu hors ligne de l'extraction sur les pages archivées
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+
+Usage:
+    python rejeu_archive.py                          # toutes les catégories, dans data/rejeu
+    python rejeu_archive.py --categories vetements_homme --workers 8
+    python rejeu_archive.py --ecraser                # remplace les données du scraping
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+import manifeste
+from archive_html import ArchiveHTML
+from base_annonces import BaseAnnonces
+from entrepot_parquet import EntrepotParquet, PYARROW_DISPONIBLE
+from index_annonces import DedoublonnageCrawl
+from puits_donnees import PuitsCSV
+from scraper_coinafrique import CoinAfriqueScraper, CATEGORIES
+
+# Dossier des CSV rejoués, à part des fichiers du scraping (sauf --ecraser)
+DOSSIER_REJEU = 'data/rejeu'
+DOSSIER_NETTOYE = 'data/nettoye'
+
+# Scraper propre à chaque processus du pool (créé par _initialiser)
+_scraper: Optional[CoinAfriqueScraper] = None
+
+
+def _initialiser(parseur: str, restreindre_parsing: bool):
+    global _scraper
+    _scraper = CoinAfriqueScraper(parseur=parseur, restreindre_parsing=restreindre_parsing)
+
+
+def extraire_capture(tache: Tuple[str, bytes]) -> List[Dict]:
+    """
+    Décompresse une page archivée et en extrait les annonces
+
+    Exécuté dans un processus du pool : ni réseau ni attente, seulement du
+    parsing avec les règles de la catégorie.
+
+    Args:
+        tache: (clé de la catégorie, corps compressé de la page)
+    """
+    nom_categorie, contenu_compresse = tache
+    contenu = ArchiveHTML.decompresser(contenu_compresse)
+    return _scraper.extraire_annonces(contenu, _scraper.moteur_regles(nom_categorie))
+
+
+def numero_page(url: str) -> int:
+    """Numéro de page d'une URL de catégorie (1 sans paramètre page)"""
+    valeurs = parse_qs(urlparse(url).query).get('page')
+    try:
+        return int(valeurs[0]) if valeurs else 1
+    except ValueError:
+        return 1
+
+
+def pages_consecutives(captures: List[Dict]) -> int:
+    """
+    Nombre de captures (triées par page) qui se suivent depuis la page 1
+
+    Une page manquante dans l'archive (téléchargement en échec, page
+    évincée) interrompt la suite : les pages suivantes ne peuvent pas être
+    rejouées comme un scraping, qui les aurait atteintes après elle.
+    """
+    for position, capture in enumerate(captures):
+        if numero_page(capture['url']) != position + 1:
+            return position
+    return len(captures)
+
+
+def extraire_dans_l_ordre(
+    pool: ProcessPoolExecutor,
+    archive: ArchiveHTML,
+    nom_categorie: str,
+    captures: List[Dict],
+    fenetre: int
+) -> Iterator[Tuple[int, List[Dict]]]:
+    """
+    Extrait les captures sur le pool et cède leurs annonces dans l'ordre
+
+    Au plus `fenetre` pages sont en cours : le corps d'une capture n'est lu
+    dans l'archive qu'au moment de la soumettre.
+
+    Yields:
+        (numéro de page, annonces de la page)
+    """
+    en_vol = deque()
+    restantes = iter(captures)
+    try:
+        while True:
+            while len(en_vol) < fenetre:
+                capture = next(restantes, None)
+                if capture is None:
+                    break
+                tache = (nom_categorie, archive.contenu_compresse(capture['id']))
+                en_vol.append((numero_page(capture['url']), pool.submit(extraire_capture, tache)))
+            if not en_vol:
+                return
+            page, future = en_vol.popleft()
+            yield page, future.result()
+    finally:
+        for _, future in en_vol:
+            future.cancel()
+
+
+def rejouer_archive(
+    archive: ArchiveHTML,
+    categories: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    dossier_sortie: str = DOSSIER_REJEU,
+    parseur: str = 'html.parser',
+    restreindre_parsing: bool = False,
+    avant: Optional[float] = None,
+    ecraser: bool = False
+) -> Dict[str, pd.DataFrame]:
+    """
+    Ré-extrait les annonces de chaque catégorie à partir de l'archive
+
+    La dernière capture de chaque page est extraite sur un pool de
+    processus, puis les annonces sont dédoublonnées dans l'ordre des pages
+    et écrites comme lors d'un scraping, qui s'arrête à la première page
+    vide. Le rejeu s'arrête aussi à la première page absente de l'archive
+    (avertissement) : il est alors incomplet.
+
+    Par défaut les CSV sont écrits à part (dossier_sortie) et les données
+    du scraping ne sont pas touchées. Avec `ecraser`, le rejeu remplace les
+    fichiers de data/nettoye et est publié comme un scraping complet :
+    base des annonces (annonces absentes retirées), entrepôt Parquet
+    (source 'rejeu') et manifeste. Un rejeu incomplet est publié comme un
+    scraping interrompu : aucune annonce n'est retirée de la base.
+
+    Args:
+        archive: Archive des pages
+        categories: Clés de CATEGORIES à rejouer (toutes par défaut)
+        workers: Processus d'extraction (nombre de cœurs par défaut)
+        dossier_sortie: Dossier des fichiers CSV produits (sans `ecraser`)
+        parseur: Parseur HTML (voir parseurs_html)
+        restreindre_parsing: Limiter le parsing aux cartes d'annonce
+        avant: Rejouer l'archive telle qu'elle était à ce timestamp
+        ecraser: Remplacer les données de scraping des catégories rejouées
+
+    Returns:
+        Dictionnaire avec les DataFrames de chaque catégorie rejouée
+    """
+    noms = list(categories) if categories else list(CATEGORIES)
+    workers = workers or os.cpu_count() or 1
+    dossier = DOSSIER_NETTOYE if ecraser else dossier_sortie
+    base = BaseAnnonces() if ecraser else None
+    entrepot = EntrepotParquet() if ecraser and PYARROW_DISPONIBLE else None
+    resultats = {}
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialiser,
+            initargs=(parseur, restreindre_parsing)
+        ) as pool:
+            for nom in noms:
+                config = CATEGORIES[nom]
+                captures = [
+                    capture for capture in archive.captures(config['url'], avant=avant, avec_contenu=False)
+                    if capture['url'].split('?')[0] == config['url']
+                ]
+                if not captures:
+                    logging.warning(f"Aucune page archivée pour {nom}")
+                    continue
+                captures.sort(key=lambda capture: numero_page(capture['url']))
+                consecutives = pages_consecutives(captures)
+                complet = consecutives == len(captures)
+                if not complet:
+                    logging.warning(f"{nom}: page {consecutives + 1} absente de l'archive, "
+                                    f"rejeu arrêté après {consecutives} pages "
+                                    f"({len(captures) - consecutives} captures ignorées)")
+                    captures = captures[:consecutives]
+
+                debut = time.perf_counter()
+                fichier_csv = os.path.join(dossier, f"{nom}_nettoye.csv")
+                dedoublonnage = DedoublonnageCrawl()
+                puits = PuitsCSV(
+                    fichier_csv,
+                    colonnes=[config['type_col'], 'prix', 'adresse', 'image_lien'],
+                    renommage={'type': config['type_col']}
+                )
+                puits_parquet = entrepot.puits(nom, source='rejeu') if entrepot else None
+                if puits_parquet:
+                    puits_parquet.commencer()
+                date_observation = time.time()
+
+                pages = 0
+                for page, annonces_page in extraire_dans_l_ordre(pool, archive, nom, captures, workers * 4):
+                    dedoublonnage.nouvelle_page()
+                    annonces_page = dedoublonnage.filtrer(annonces_page)
+                    if not annonces_page and not dedoublonnage.repetitions_page:
+                        logging.info(f"{nom}: arrêt à la page {page} (page vide)")
+                        break
+                    puits.ecrire(annonces_page)
+                    if puits_parquet:
+                        puits_parquet.ecrire(annonces_page, page)
+                    if base:
+                        base.upsert(nom, annonces_page, date_observation=date_observation)
+                    pages += 1
+                duree = time.perf_counter() - debut
+
+                logging.info(f"{nom}: {pages} pages rejouées en {duree:.2f}s "
+                             f"({pages / duree:.1f} pages/s), {puits.lignes_ecrites} annonces, "
+                             f"{dedoublonnage.repetitions} répétitions ignorées")
+                if not puits.lignes_ecrites:
+                    if puits_parquet:
+                        puits_parquet.abandonner()
+                    continue
+
+                if ecraser:
+                    entree = manifeste.mettre_a_jour(nom, fichier_csv)
+                    if complet:
+                        # Publication d'un scraping complet : les annonces non rejouées sont retirées
+                        base.retirer_absentes(nom, date_observation)
+                    else:
+                        logging.warning(f"{nom}: rejeu incomplet, aucune annonce retirée de la base")
+                    base.noter_source(nom, entree['octets'], entree['mtime'])
+                    if puits_parquet:
+                        puits_parquet.valider()
+                resultats[nom] = puits.relire()
+    finally:
+        if base:
+            base.fermer()
+
+    return resultats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu de l'extraction sur l'archive des pages")
+    parser.add_argument('--archive', default='data/archive/pages.sqlite', help="Fichier de l'archive")
+    parser.add_argument('--categories', nargs='*', help="Catégories à rejouer (toutes par défaut)")
+    parser.add_argument('--workers', type=int, default=None, help="Processus d'extraction")
+    parser.add_argument('--sortie', default=DOSSIER_REJEU, help="Dossier des CSV produits (sans --ecraser)")
+    parser.add_argument('--parseur', default='html.parser', help="Parseur HTML")
+    parser.add_argument('--ecraser', action='store_true',
+                        help="Remplacer les CSV de data/nettoye, la base, l'entrepôt Parquet et le manifeste")
+    args = parser.parse_args()
+    dossier = DOSSIER_NETTOYE if args.ecraser else args.sortie
+
+    archive = ArchiveHTML(args.archive)
+    stats = archive.get_stats()
+    print(f"\nArchive: {stats['captures']} captures, {stats['urls']} URL, "
+          f"{stats['octets_bruts'] / 1024:,.0f} Ko bruts (compression x{stats['taux_compression']})")
+
+    resultats = rejouer_archive(
+        archive, args.categories, args.workers, args.sortie, args.parseur, ecraser=args.ecraser
+    )
+    archive.fermer()
+
+    for nom, df in resultats.items():
+        print(f"  ✓ {nom}: {len(df)} annonces -> {os.path.join(dossier, nom + '_nettoye.csv')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Correspondances de colonnes confirmées, par empreinte d'en-tête d'export
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+CHEMIN_SCHEMAS = 'data/cache/schemas_colonnes.json'
+
+
+def empreinte_entete(colonnes: Iterable) -> str:
+    """Empreinte de l'ensemble des noms de colonnes (l'ordre des colonnes est indifférent)"""
+    noms = sorted({str(colonne) for colonne in colonnes})
+    return hashlib.sha1('\n'.join(noms).encode('utf-8')).hexdigest()[:16]
+
+
+class SchemasColonnes:
+    """
+    Mapping des colonnes de chaque disposition d'export déjà nettoyée
+
+    Un export Web Scraper d'un même sitemap a toujours les mêmes colonnes :
+    une fois un nettoyage mené à bien, son mapping est enregistré sous
+    l'empreinte de l'en-tête et les imports suivants le reprennent sans
+    détection. Le fichier JSON est remplacé d'un bloc à chaque confirmation.
+    """
+
+    def __init__(self, chemin: str = CHEMIN_SCHEMAS):
+        """
+        Args:
+            chemin: Fichier JSON des schémas ({empreinte: entrée})
+        """
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        self._schemas = self._lire()
+        self.stats = {'trouves': 0, 'confirmes': 0}
+
+    def _lire(self) -> Dict[str, Dict]:
+        try:
+            with open(self.chemin, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def mapping(self, colonnes: Iterable) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Mapping confirmé pour cet en-tête
+
+        Returns:
+            {type_standard: nom_colonne}, ou None pour une disposition inconnue
+        """
+        with self._verrou:
+            entree = self._schemas.get(empreinte_entete(colonnes))
+            if entree is None:
+                return None
+            self.stats['trouves'] += 1
+            return dict(entree['mapping'])
+
+    def confirmer(self, colonnes: Iterable, mapping: Dict[str, Optional[str]]):
+        """Enregistre le mapping d'un nettoyage réussi pour cet en-tête"""
+        colonnes = sorted({str(colonne) for colonne in colonnes})
+        empreinte = empreinte_entete(colonnes)
+        with self._verrou:
+            # Relu avant d'écrire : un autre processus a pu confirmer d'autres schémas
+            self._schemas = self._lire()
+            precedente = self._schemas.get(empreinte, {})
+            self._schemas[empreinte] = {
+                'colonnes': colonnes,
+                'mapping': dict(mapping),
+                'imports': precedente.get('imports', 0) + 1,
+                'date_maj': time.time()
+            }
+            self._ecrire()
+            self.stats['confirmes'] += 1
+
+    def _ecrire(self):
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{self.chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(self._schemas, f, ensure_ascii=False, indent=2)
+        os.replace(temporaire, self.chemin)
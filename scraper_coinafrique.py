@@ -9,26 +9,99 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
+import os
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Tuple, Iterator
 import re
+import threading
 from urllib.parse import urljoin
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from limiteur_debit import LimiteursParHote
+from cache_http import CacheHTTP
+from parseurs_html import construire_soup
+from index_annonces import IndexAnnoncesVues, DedoublonnageCrawl, extraire_id_annonce
+from puits_donnees import PuitsCSV
+from enrichissement import EnrichisseurDetails, CHAMPS_DETAIL
+from regles_extraction import MoteurRegles, charger_config
+from points_reprise import PointsReprise
+from archive_html import ArchiveHTML
+from pipeline_scraping import PipelineScraping, initialiser_processus
+from entrepot_parquet import EntrepotParquet
+from base_annonces import BaseAnnonces
+import manifeste
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Liens vers une annonce, et texte de lien réduit à un prix (lien prix d'une carte)
+RE_LIEN_ANNONCE = re.compile(r'/ad/|/annonce/')
+RE_TITRE_PRIX = re.compile(r'^(?:[\d\s.,]+|Prix sur demande)\s*F?\s*CFA$', re.IGNORECASE)
+
+# Réponses signalant un serveur surchargé : on ralentit et on réessaie
+STATUTS_SURCHARGE = {429, 500, 502, 503, 504}
+
+# Catégories scrapées par le projet et règles d'extraction des champs
+# (config/regles_extraction.json : ajouter une catégorie ne touche pas au code)
+CONFIG_REGLES = charger_config()
+CATEGORIES = CONFIG_REGLES['categories']
+
 class CoinAfriqueScraper:
     """Scraper pour extraire les données de CoinAfrique avec BeautifulSoup"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        intervalle_min: float = 2.0,
+        cache: Optional[CacheHTTP] = None,
+        parseur: str = 'html.parser',
+        restreindre_parsing: bool = False,
+        options_rythme: Optional[Dict] = None,
+        archive: Optional[ArchiveHTML] = None,
+        workers_parsing: int = 0,
+        entrepot: Optional[EntrepotParquet] = None,
+        base: Optional[BaseAnnonces] = None
+    ):
         self.base_url = "https://sn.coinafrique.com"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        # Assez de connexions pour plusieurs catégories en parallèle
+        adaptateur = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount('https://', adaptateur)
+        self.session.mount('http://', adaptateur)
+        # Un seau à jetons par hôte (remplace la pause fixe de 2 s), partagé
+        # par toutes les catégories scrapées en même temps et piloté en AIMD
+        # à partir de intervalle_min (voir RythmeAdaptatif pour options_rythme)
+        self.limiteurs = LimiteursParHote(intervalle_min, options_rythme=options_rythme)
+        # Cache disque des réponses (optionnel) : revalidation conditionnelle
+        # et réutilisation des annonces des pages inchangées
+        self.cache = cache
+        # Parseur HTML ('html.parser', 'lxml', 'html5lib', 'selectolax') et
+        # parsing limité aux cartes d'annonce
+        self.parseur = parseur
+        self.restreindre_parsing = restreindre_parsing
+        # Archive des pages téléchargées (optionnelle), rejouable hors ligne
+        # par rejeu_archive après une modification des heuristiques
+        self.archive = archive
+        # Parsing des pages sur un pool de processus (0 : dans le thread qui
+        # consomme les pages), partagé par toutes les catégories
+        self.workers_parsing = workers_parsing
+        self._pool_parsing: Optional[ProcessPoolExecutor] = None
+        self._verrou_pool = threading.Lock()
+        # Entrepôt Parquet (optionnel) alimenté en plus du CSV : une
+        # partition par catégorie et par jour de scraping
+        self.entrepot = entrepot
+        # Base SQLite (optionnelle) des annonces, mises à jour par identifiant,
+        # sur laquelle le tableau de bord exécute ses agrégations
+        self.base = base
+        # Règles d'extraction compilées une fois : générales, puis par catégorie
+        self._moteurs_categories: Dict[str, MoteurRegles] = {}
+        self.regles = self.moteur_regles()
         
     def extraire_nombre(self, texte: str) -> str:
         """Extrait le nombre d'une chaîne de caractères"""
@@ -53,26 +126,110 @@ class CoinAfriqueScraper:
             return ""
         return ' '.join(texte.split())
     
-    def scraper_une_page(self, soup: BeautifulSoup) -> List[Dict]:
+    def url_absolue(self, lien: str) -> str:
+        """Rend absolu un lien relatif au site"""
+        if lien and not lien.startswith('http'):
+            return urljoin(self.base_url, lien)
+        return lien
+    
+    def pool_parsing(self) -> ProcessPoolExecutor:
+        """Pool de processus de parsing, créé à la première utilisation"""
+        with self._verrou_pool:
+            if self._pool_parsing is None:
+                self._pool_parsing = ProcessPoolExecutor(
+                    max_workers=max(1, self.workers_parsing),
+                    initializer=initialiser_processus,
+                    initargs=(self.parseur, self.restreindre_parsing)
+                )
+            return self._pool_parsing
+    
+    def fermer(self):
+        """Arrête le pool de processus de parsing s'il a été créé"""
+        with self._verrou_pool:
+            if self._pool_parsing is not None:
+                self._pool_parsing.shutdown()
+                self._pool_parsing = None
+    
+    def moteur_regles(self, nom_categorie: Optional[str] = None) -> MoteurRegles:
+        """
+        Règles d'extraction compilées d'une catégorie (générales si None)
+        
+        Un moteur par catégorie : ses statistiques par règle ne concernent
+        que les pages de cette catégorie.
+        """
+        transformations = {
+            'nombre': self.extraire_nombre,
+            'texte': self.nettoyer_texte,
+            'url': self.url_absolue
+        }
+        if nom_categorie is None:
+            return MoteurRegles.depuis_config(transformations, config=CONFIG_REGLES)
+        if nom_categorie not in self._moteurs_categories:
+            self._moteurs_categories[nom_categorie] = MoteurRegles.depuis_config(
+                transformations, nom_categorie, config=CONFIG_REGLES
+            )
+        return self._moteurs_categories[nom_categorie]
+    
+    def scraper_une_page(
+        self,
+        soup: BeautifulSoup,
+        regles: Optional[MoteurRegles] = None,
+        dedoublonnage: Optional[DedoublonnageCrawl] = None
+    ) -> List[Dict]:
         """
         Scrape une seule page et retourne toutes les annonces
         
+        Extraction en une passe : chaque carte d'annonce (le plus grand
+        ancêtre qui ne contient que des liens vers la même annonce) est
+        localisée une seule fois, puis les règles de portée 'carte' (prix,
+        adresse) sont appliquées à son sous-arbre et partagées par tous les
+        liens de la carte ; les règles de portée 'lien' (image) sont
+        appliquées au lien lui-même. Le temps de parsing reste ainsi
+        linéaire en nombre de cartes.
+        
+        Une annonce n'est émise qu'une fois : les liens vers une annonce déjà
+        émise (par la page ou, avec `dedoublonnage`, par une page précédente
+        du même scraping) sont écartés avant toute extraction. Un lien dont
+        le texte n'est qu'un prix ne fournit pas de titre et laisse la place
+        au lien titre de la carte.
+        
         Args:
             soup: Objet BeautifulSoup de la page
+            regles: Moteur de règles de la catégorie (règles générales par défaut)
+            dedoublonnage: Annonces déjà émises pendant le scraping (page seule par défaut)
             
         Returns:
             Liste des annonces de cette page
         """
+        regles = regles or self.regles
+        dedoublonnage = dedoublonnage or DedoublonnageCrawl()
         annonces_page = []
         
         # Trouver toutes les annonces
-        annonces_elements = soup.find_all('a', href=re.compile(r'/ad/|/annonce/'))
+        annonces_elements = soup.find_all('a', href=RE_LIEN_ANNONCE)
         
         if not annonces_elements:
             return annonces_page
         
+        proprietaires = self._proprietaires_cartes(annonces_elements)
+        champs_cartes = {}
+        
         for element in annonces_elements:
             try:
+                cle = self._cle_dedoublonnage(element)
+                if dedoublonnage.deja_emise(cle):
+                    continue
+                
+                carte = self._carte_annonce(element, proprietaires)
+                
+                if carte is element:
+                    # Pas de conteneur propre à l'annonce : heuristiques historiques
+                    annonce = self._extraire_annonce_historique(element)
+                    if annonce and not RE_TITRE_PRIX.match(annonce['type']):
+                        dedoublonnage.marquer(cle)
+                        annonces_page.append(annonce)
+                    continue
+                
                 # Extraire le titre/type
                 titre_elem = element.find('div') or element
                 titre = self.nettoyer_texte(titre_elem.get_text()) if titre_elem else ""
@@ -80,100 +237,20 @@ class CoinAfriqueScraper:
                 if not titre:
                     titre = element.get('title', '')
                 
-                # Extraire le prix
-                prix = ""
-                
-                # Méthode 1: chercher dans les éléments frères précédents
-                prix_elem = element.find_previous('div')
-                tentatives = 0
-                while prix_elem and tentatives < 5:
-                    prix_text = prix_elem.get_text()
-                    if 'CFA' in prix_text or 'F CFA' in prix_text or 'FCFA' in prix_text:
-                        prix = self.extraire_nombre(prix_text)
-                        break
-                    prix_elem = prix_elem.find_previous('div')
-                    tentatives += 1
-                
-                # Méthode 2: chercher dans les éléments enfants
-                if not prix:
-                    for child in element.find_all(['div', 'span', 'p']):
-                        child_text = child.get_text()
-                        if 'CFA' in child_text or 'F CFA' in child_text or 'FCFA' in child_text:
-                            prix = self.extraire_nombre(child_text)
-                            break
-                
-                # Méthode 3: chercher dans l'élément parent
-                if not prix:
-                    parent = element.parent
-                    if parent:
-                        for sibling in parent.find_all(['div', 'span', 'p']):
-                            sibling_text = sibling.get_text()
-                            if 'CFA' in sibling_text or 'F CFA' in sibling_text or 'FCFA' in sibling_text:
-                                prix = self.extraire_nombre(sibling_text)
-                                break
-                
-                if not prix:
-                    prix = "Prix non disponible"
-                
-                # Extraire l'adresse
-                adresse = ""
-                
-                # Méthode 1: chercher un élément contenant "Sénégal"
-                location_elem = element.find_next('div', string=re.compile(r'.*[,].*[Ss][ée]n[ée]gal.*'))
-                if not location_elem:
-                    location_elem = element.find_next(string=re.compile(r'.*[,].*[Ss][ée]n[ée]gal.*'))
-                
-                if location_elem:
-                    adresse = self.nettoyer_texte(
-                        location_elem if isinstance(location_elem, str) else location_elem.get_text()
-                    )
-                
-                # Méthode 2: chercher dans les éléments enfants
-                if not adresse:
-                    for child in element.find_all(['div', 'span', 'p']):
-                        child_text = child.get_text()
-                        if 'Sénégal' in child_text or 'senegal' in child_text.lower():
-                            adresse = self.nettoyer_texte(child_text)
-                            break
+                if not titre or len(titre) <= 3 or RE_TITRE_PRIX.match(titre):
+                    continue
                 
-                # Méthode 3: chercher dans le parent
-                if not adresse:
-                    parent = element.parent
-                    if parent:
-                        for sibling in parent.find_all(['div', 'span', 'p']):
-                            sibling_text = sibling.get_text()
-                            if 'Sénégal' in sibling_text or 'senegal' in sibling_text.lower():
-                                adresse = self.nettoyer_texte(sibling_text)
-                                break
+                # Prix et adresse : une seule application des règles par carte
+                if id(carte) not in champs_cartes:
+                    champs_cartes[id(carte)] = regles.extraire(carte, 'carte')
                 
-                # Méthode 4: chercher avec find_next_sibling
-                if not adresse:
-                    next_sibling = element.find_next_sibling()
-                    if next_sibling:
-                        sibling_text = next_sibling.get_text()
-                        if 'Sénégal' in sibling_text or 'senegal' in sibling_text.lower():
-                            adresse = self.nettoyer_texte(sibling_text)
-                
-                if not adresse:
-                    adresse = "Adresse non disponible"
-                
-                # Extraire l'image
-                image_elem = element.find('img')
-                image_url = ""
-                if image_elem:
-                    image_url = image_elem.get('src', '') or image_elem.get('data-src', '') or image_elem.get('data-lazy-src', '')
-                    if image_url and not image_url.startswith('http'):
-                        image_url = urljoin(self.base_url, image_url)
-                
-                # Ajouter l'annonce si elle a des données valides
-                if titre and len(titre) > 3:
-                    annonce = {
-                        'type': titre,
-                        'prix': prix,
-                        'adresse': adresse,
-                        'image_lien': image_url
-                    }
-                    annonces_page.append(annonce)
+                dedoublonnage.marquer(cle)
+                annonces_page.append({
+                    'type': titre,
+                    **champs_cartes[id(carte)],
+                    **regles.extraire(element, 'lien'),
+                    **self._identifiants(element)
+                })
                     
             except Exception as e:
                 logging.debug(f"Erreur lors de l'extraction d'une annonce: {str(e)}")
@@ -181,147 +258,846 @@ class CoinAfriqueScraper:
         
         return annonces_page
     
-    def scraper_page(self, url: str, max_pages: int = 5) -> List[Dict]:
+    @staticmethod
+    def _cle_lien(element) -> str:
+        """Lien d'annonce sans paramètres ni ancre"""
+        return element.get('href', '').split('#')[0].split('?')[0]
+    
+    def _cle_dedoublonnage(self, element):
+        """Identifiant de l'annonce du lien, ou à défaut son lien canonique absolu"""
+        lien = self._cle_lien(element)
+        id_annonce = extraire_id_annonce(lien)
+        return id_annonce if id_annonce is not None else urljoin(self.base_url, lien)
+    
+    def _proprietaires_cartes(self, annonces_elements) -> Dict[int, Optional[str]]:
         """
-        Scrape plusieurs pages de CoinAfrique
+        Associe chaque ancêtre des liens d'annonce au lien qu'il contient
+        
+        Un ancêtre qui contient des liens vers plusieurs annonces est marqué
+        None. La remontée s'arrête dès qu'un ancêtre est déjà marqué : ses
+        propres ancêtres ont alors été traités, d'où un coût linéaire.
+        """
+        proprietaires = {}
+        for element in annonces_elements:
+            lien = self._cle_lien(element)
+            for parent in element.parents:
+                cle = id(parent)
+                if cle not in proprietaires:
+                    proprietaires[cle] = lien
+                elif proprietaires[cle] is None:
+                    break
+                elif proprietaires[cle] == lien:
+                    break
+                else:
+                    proprietaires[cle] = None
+        return proprietaires
+    
+    def _carte_annonce(self, element, proprietaires: Dict[int, Optional[str]]):
+        """Plus grand ancêtre (hors body) ne contenant que des liens vers cette annonce"""
+        lien = self._cle_lien(element)
+        carte = element
+        for parent in element.parents:
+            if parent.name in ('body', 'html', '[document]') or proprietaires.get(id(parent)) != lien:
+                break
+            carte = parent
+        return carte
+    
+    def _identifiants(self, element) -> Dict:
+        """Lien absolu de l'annonce et son identifiant numérique"""
+        lien = urljoin(self.base_url, self._cle_lien(element))
+        return {'lien': lien, 'id_annonce': extraire_id_annonce(lien)}
+    
+    def _scraper_une_page_historique(self, soup: BeautifulSoup) -> List[Dict]:
+        """
+        Extraction historique lien par lien (méthodes de repli successives)
+        
+        Conservée comme référence pour vérifier l'équivalence et mesurer le
+        gain de l'extraction en une passe.
+        """
+        annonces_page = []
+        
+        for element in soup.find_all('a', href=RE_LIEN_ANNONCE):
+            try:
+                annonce = self._extraire_annonce_historique(element)
+                if annonce:
+                    annonces_page.append(annonce)
+            except Exception as e:
+                logging.debug(f"Erreur lors de l'extraction d'une annonce: {str(e)}")
+                continue
+        
+        return annonces_page
+    
+    def _extraire_annonce_historique(self, element) -> Optional[Dict]:
+        """Extrait une annonce à partir d'un lien en explorant le document autour"""
+        # Extraire le titre/type
+        titre_elem = element.find('div') or element
+        titre = self.nettoyer_texte(titre_elem.get_text()) if titre_elem else ""
+        
+        if not titre:
+            titre = element.get('title', '')
+        
+        # Extraire le prix
+        prix = ""
+        
+        # Méthode 1: chercher dans les éléments frères précédents
+        prix_elem = element.find_previous('div')
+        tentatives = 0
+        while prix_elem and tentatives < 5:
+            prix_text = prix_elem.get_text()
+            if 'CFA' in prix_text or 'F CFA' in prix_text or 'FCFA' in prix_text:
+                prix = self.extraire_nombre(prix_text)
+                break
+            prix_elem = prix_elem.find_previous('div')
+            tentatives += 1
+        
+        # Méthode 2: chercher dans les éléments enfants
+        if not prix:
+            for child in element.find_all(['div', 'span', 'p']):
+                child_text = child.get_text()
+                if 'CFA' in child_text or 'F CFA' in child_text or 'FCFA' in child_text:
+                    prix = self.extraire_nombre(child_text)
+                    break
+        
+        # Méthode 3: chercher dans l'élément parent
+        if not prix:
+            parent = element.parent
+            if parent:
+                for sibling in parent.find_all(['div', 'span', 'p']):
+                    sibling_text = sibling.get_text()
+                    if 'CFA' in sibling_text or 'F CFA' in sibling_text or 'FCFA' in sibling_text:
+                        prix = self.extraire_nombre(sibling_text)
+                        break
+        
+        if not prix:
+            prix = "Prix non disponible"
+        
+        # Extraire l'adresse
+        adresse = ""
+        
+        # Méthode 1: chercher un élément contenant "Sénégal"
+        location_elem = element.find_next('div', string=re.compile(r'.*[,].*[Ss][ée]n[ée]gal.*'))
+        if not location_elem:
+            location_elem = element.find_next(string=re.compile(r'.*[,].*[Ss][ée]n[ée]gal.*'))
+        
+        if location_elem:
+            adresse = self.nettoyer_texte(
+                location_elem if isinstance(location_elem, str) else location_elem.get_text()
+            )
+        
+        # Méthode 2: chercher dans les éléments enfants
+        if not adresse:
+            for child in element.find_all(['div', 'span', 'p']):
+                child_text = child.get_text()
+                if 'Sénégal' in child_text or 'senegal' in child_text.lower():
+                    adresse = self.nettoyer_texte(child_text)
+                    break
+        
+        # Méthode 3: chercher dans le parent
+        if not adresse:
+            parent = element.parent
+            if parent:
+                for sibling in parent.find_all(['div', 'span', 'p']):
+                    sibling_text = sibling.get_text()
+                    if 'Sénégal' in sibling_text or 'senegal' in sibling_text.lower():
+                        adresse = self.nettoyer_texte(sibling_text)
+                        break
+        
+        # Méthode 4: chercher avec find_next_sibling
+        if not adresse:
+            next_sibling = element.find_next_sibling()
+            if next_sibling:
+                sibling_text = next_sibling.get_text()
+                if 'Sénégal' in sibling_text or 'senegal' in sibling_text.lower():
+                    adresse = self.nettoyer_texte(sibling_text)
+        
+        if not adresse:
+            adresse = "Adresse non disponible"
+        
+        # Extraire l'image
+        image_elem = element.find('img')
+        image_url = ""
+        if image_elem:
+            image_url = image_elem.get('src', '') or image_elem.get('data-src', '') or image_elem.get('data-lazy-src', '')
+            if image_url and not image_url.startswith('http'):
+                image_url = urljoin(self.base_url, image_url)
+        
+        # Ajouter l'annonce si elle a des données valides
+        if titre and len(titre) > 3:
+            annonce = {
+                'type': titre,
+                'prix': prix,
+                'adresse': adresse,
+                'image_lien': image_url,
+                **self._identifiants(element)
+            }
+            return annonce
+        
+        return None
+    
+    def extraire_annonces(
+        self,
+        contenu: bytes,
+        regles: Optional[MoteurRegles] = None,
+        dedoublonnage: Optional[DedoublonnageCrawl] = None
+    ) -> List[Dict]:
+        """
+        Parse le HTML d'une page avec le parseur configuré et extrait ses annonces
+        
+        Si le parsing restreint aux cartes ne trouve rien (balisage
+        inattendu), la page est re-parsée en entier avant de conclure
+        qu'elle est vide. Une page dont toutes les annonces ont déjà été
+        émises n'est pas re-parsée.
+        """
+        dedoublonnage = dedoublonnage or DedoublonnageCrawl()
+        soup = construire_soup(contenu, self.parseur, self.restreindre_parsing)
+        annonces = self.scraper_une_page(soup, regles, dedoublonnage)
+        
+        if (not annonces and not dedoublonnage.repetitions_page
+                and (self.restreindre_parsing or self.parseur == 'selectolax')):
+            soup = construire_soup(contenu, 'html.parser')
+            annonces = self.scraper_une_page(soup, regles, dedoublonnage)
+        
+        return annonces
+    
+    def _url_page(self, url: str, page: int) -> str:
+        """Construit l'URL d'une page de catégorie"""
+        return f"{url}?page={page}" if page > 1 else url
+    
+    def _requete(self, page_url: str, entetes: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        GET régulé par le rythme adaptatif de l'hôte, avec réessais
+        
+        Les réponses 429/5xx et les timeouts font baisser le débit de l'hôte
+        et sont réessayés avec un backoff exponentiel à gigue, jusqu'à
+        épuisement des réessais de la page ou du budget global.
+        
+        Raises:
+            requests.exceptions.RequestException: si la page reste en échec
+        """
+        limiteur = self.limiteurs.pour(page_url)
+        rythme = self.limiteurs.rythme(page_url)
+        tentative = 0
+        
+        while True:
+            limiteur.attendre()
+            debut = time.monotonic()
+            erreur = None
+            response = None
+            
+            try:
+                response = self.session.get(page_url, timeout=15, headers=entetes)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                erreur = e
+            latence = time.monotonic() - debut
+            
+            if response is not None and response.status_code not in STATUTS_SURCHARGE:
+                rythme.succes(latence)
+                return response
+            
+            rythme.surcharge(latence)
+            retry_after = 0.0
+            if response is not None:
+                erreur = requests.exceptions.HTTPError(
+                    f"{response.status_code} pour {page_url}", response=response
+                )
+                try:
+                    retry_after = float(response.headers.get('Retry-After', 0))
+                except ValueError:
+                    retry_after = 0.0
+            
+            if not rythme.autoriser_reessai(tentative):
+                raise erreur
+            
+            delai = rythme.delai_reessai(tentative, retry_after)
+            logging.warning(f"{erreur} - nouvel essai dans {delai:.1f}s "
+                            f"(débit {rythme.limiteur.debit:.2f} req/s)")
+            time.sleep(delai)
+            tentative += 1
+    
+    def telecharger(self, url: str) -> bytes:
+        """
+        Télécharge une page quelconque du site (page de détail d'une annonce)
+        
+        La requête partage le débit et le budget de réessais de l'hôte avec
+        les pages de liste, sans passer par le cache ni par l'archive.
+        
+        Returns:
+            Contenu brut de la page
+            
+        Raises:
+            requests.exceptions.RequestException: si la page reste en échec
+        """
+        response = self._requete(url)
+        response.raise_for_status()
+        return response.content
+    
+    def _recuperer_page(self, page_url: str, version_regles: Optional[str] = None) -> Tuple[bytes, Optional[List[Dict]]]:
+        """
+        Télécharge une page en respectant le débit autorisé pour son hôte
+        
+        Args:
+            page_url: URL complète de la page
+            version_regles: Empreinte des règles d'extraction en vigueur
+            
+        Returns:
+            (contenu HTML brut, annonces déjà extraites avec ces règles si la
+            page est inchangée dans le cache, sinon None)
+        """
+        if not self.cache:
+            response = self._requete(page_url)
+            response.raise_for_status()
+            self._archiver(page_url, response)
+            return response.content, None
+        
+        response = self._requete(page_url, self.cache.entetes_conditionnels(page_url))
+        if response.status_code == 304:
+            en_cache = self.cache.non_modifiee(page_url, version_regles)
+            if en_cache:
+                return en_cache
+            # Entrée évincée entre-temps : on refait une requête complète
+            response = self._requete(page_url)
+        response.raise_for_status()
+        self._archiver(page_url, response)
+        
+        annonces = self.cache.enregistrer_reponse(
+            page_url,
+            response.content,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            version_regles
+        )
+        return response.content, annonces
+    
+    def _archiver(self, page_url: str, response: requests.Response):
+        """Archive une page téléchargée si l'archive est activée"""
+        if self.archive:
+            self.archive.enregistrer(page_url, response.content, response.headers, response.status_code)
+    
+    def _iter_pages_telechargees(
+        self,
+        url: str,
+        premiere_page: int,
+        max_pages: int,
+        concurrence: int,
+        version_regles: Optional[str] = None
+    ) -> Iterator[Tuple[int, str, Callable[[], Tuple]]]:
+        """
+        Télécharge les pages sur un pool de threads et les cède dans l'ordre
+        
+        Jusqu'à `concurrence` requêtes restent en vol ; la fenêtre est
+        complétée chaque fois que la page suivante est demandée.
+        
+        Yields:
+            (page, URL, résultat) où résultat() retourne (contenu, annonces
+            du cache ou None, None) ou lève l'erreur de la page
+        """
+        with ThreadPoolExecutor(max_workers=concurrence) as pool:
+            en_vol = deque()
+            prochaine_page = premiere_page
+            try:
+                while True:
+                    # Remplir la fenêtre de requêtes
+                    while prochaine_page <= max_pages and len(en_vol) < concurrence:
+                        page_url = self._url_page(url, prochaine_page)
+                        future = pool.submit(self._recuperer_page, page_url, version_regles)
+                        en_vol.append((prochaine_page, page_url, future))
+                        prochaine_page += 1
+                    if not en_vol:
+                        return
+                    
+                    page, page_url, future = en_vol.popleft()
+                    yield page, page_url, lambda future=future: (*future.result(), None)
+            finally:
+                for _, _, future in en_vol:
+                    future.cancel()
+    
+    def iter_annonces(
+        self,
+        url: str,
+        max_pages: int = 5,
+        concurrence: int = 1,
+        callback_page: Optional[Callable[[int, int], None]] = None,
+        index_vus: Optional[IndexAnnoncesVues] = None,
+        seuil_connus: float = 0.8,
+        regles: Optional[MoteurRegles] = None,
+        premiere_page: int = 1,
+        dedoublonnage: Optional[DedoublonnageCrawl] = None,
+        callback_etat: Optional[Callable[[int, str, Optional[int]], None]] = None,
+        callback_connues: Optional[Callable[[List[Dict]], None]] = None,
+        sauvegarder_index: bool = True
+    ) -> Iterator[List[Dict]]:
+        """
+        Scrape plusieurs pages de CoinAfrique et produit les annonces page par page
+        
+        Rien n'est accumulé : chaque lot est cédé dès que sa page est traitée,
+        la mémoire reste donc constante quelle que soit la longueur du scraping.
+        
+        Les pages sont téléchargées par un pool de threads qui garde jusqu'à
+        `concurrence` requêtes en vol, mais elles sont traitées dans l'ordre :
+        le scraping s'arrête à la première page vide comme en mode séquentiel.
+        
+        Avec workers_parsing > 0, le parsing quitte ce thread : les pages
+        traversent un pipeline (voir PipelineScraping) où `concurrence`
+        threads téléchargent pendant que le pool de processus parse, et ce
+        générateur ne fait plus que dédoublonner et céder les annonces.
+        
+        En mode incrémental (index_vus fourni), seules les annonces absentes de
+        l'index sont retournées, et la pagination s'arrête dès qu'une page est
+        composée d'au moins `seuil_connus` d'annonces déjà vues : les pages
+        suivantes, plus anciennes, ont déjà été collectées. Les annonces d'une
+        page entrent dans l'index quand l'appelant demande la page suivante ;
+        l'index est alors sauvegardé, sauf si l'appelant s'en charge
+        (sauvegarder_index=False, sauvegarde alignée sur ses points de
+        reprise). Après une interruption, seule la page en cours de
+        traitement sera collectée à nouveau. Les annonces connues
+        écartées sont passées à `callback_connues` (observation de leur prix
+        dans la base).
+        
+        Une annonce déjà émise par une page précédente (pagination décalée
+        pendant le scraping) n'est pas émise à nouveau ; le nombre de
+        répétitions écartées est journalisé page par page.
         
         Args:
             url: URL de la catégorie à scraper
             max_pages: Nombre maximum de pages à scraper
+            concurrence: Nombre maximum de requêtes simultanées
+            callback_page: Appelé après chaque page avec (page, total annonces)
+            index_vus: Index des annonces déjà vues de la catégorie (mode incrémental)
+            seuil_connus: Part d'annonces connues à partir de laquelle on s'arrête
+            regles: Moteur de règles d'extraction (règles générales par défaut)
+            premiere_page: Page de départ (reprise d'un scraping interrompu)
+            dedoublonnage: Annonces déjà émises (nouvel index par défaut)
+            callback_etat: Appelé avec (page, état, nombre d'annonces) quand une
+                page est 'telechargee', 'extraite' ou en 'echec'
+            callback_connues: Appelé avec les annonces déjà vues écartées de
+                chaque page (mode incrémental), avant que la page soit cédée
+            sauvegarder_index: Sauvegarder l'index après chaque page
             
-        Returns:
-            Liste de dictionnaires contenant les données des annonces
+        Yields:
+            Liste des annonces de chaque page, dans l'ordre des pages
         """
-        toutes_annonces = []
-        page = 1
+        total_annonces = 0
+        pages_scrapees = 0
+        arret_incremental = False
+        dedoublonnage = dedoublonnage or DedoublonnageCrawl()
+        concurrence = max(1, concurrence)
+        
+        def signaler(page: int, etat: str, nb_annonces: Optional[int] = None):
+            if callback_etat:
+                callback_etat(page, etat, nb_annonces)
+        
+        # Les annonces du cache ne sont reprises que si elles ont été
+        # extraites avec les mêmes règles
+        version_regles = (regles or self.regles).empreinte
+        
+        # Espacement du limiteur de l'hôte, partagé par toutes les catégories
+        # (fixé à la construction du scraper)
+        limiteur = self.limiteurs.pour(url)
         
         logging.info(f"Début du scraping de: {url}")
         logging.info(f"Nombre de pages à scraper: {max_pages}")
+        logging.info(f"Requêtes simultanées: {concurrence} "
+                     f"(espacement {limiteur.intervalle_min}s)")
         
-        while page <= max_pages:
-            try:
-                # Construire l'URL de la page
-                page_url = f"{url}?page={page}" if page > 1 else url
-                
-                logging.info(f"\n{'='*60}")
-                logging.info(f"Scraping de la page {page}/{max_pages}")
-                logging.info(f"URL: {page_url}")
-                logging.info(f"{'='*60}")
-                
-                # Récupérer la page
-                response = self.session.get(page_url, timeout=15)
-                response.raise_for_status()
-                
-                # Parser le HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Scraper toutes les annonces de cette page
-                annonces_page = self.scraper_une_page(soup)
-                
-                if not annonces_page:
-                    logging.warning(f"Aucune annonce trouvée sur la page {page}")
-                    logging.info("Arrêt du scraping (page vide)")
-                    break
-                
-                # Ajouter les annonces de cette page au total
-                toutes_annonces.extend(annonces_page)
-                
-                logging.info(f"✓ Page {page} terminée: {len(annonces_page)} annonces collectées")
-                logging.info(f"  Total cumulé: {len(toutes_annonces)} annonces")
-                
-                # Pause entre les pages
-                if page < max_pages:
-                    logging.info("Pause de 2 secondes avant la page suivante...")
-                    time.sleep(2)
-                
-                page += 1
+        if self.workers_parsing:
+            pipeline = PipelineScraping(self, fetchers=concurrence)
+            pages = pipeline.iter_pages(url, premiere_page, max_pages, regles)
+        else:
+            pipeline = None
+            pages = self._iter_pages_telechargees(url, premiere_page, max_pages, concurrence, version_regles)
+        
+        try:
+            for page, page_url, resultat in pages:
+                try:
+                    logging.info(f"\n{'='*60}")
+                    logging.info(f"Scraping de la page {page}/{max_pages}")
+                    logging.info(f"URL: {page_url}")
+                    logging.info(f"{'='*60}")
                     
-            except requests.exceptions.RequestException as e:
-                logging.error(f"Erreur HTTP lors de la requête: {str(e)}")
-                break
-            except Exception as e:
-                logging.error(f"Erreur inattendue: {str(e)}")
-                break
+                    # Récupérer la page (dans l'ordre des pages)
+                    contenu, annonces_page, extraction = resultat()
+                    signaler(page, 'telechargee')
+                    dedoublonnage.nouvelle_page()
+                    
+                    if extraction is not None:
+                        # Extraite par le pool de parsing, page seule : les
+                        # annonces des pages précédentes sont écartées ici
+                        if self.cache:
+                            self.cache.enregistrer_annonces(page_url, annonces_page, version_regles)
+                        dedoublonnage.fusionner_page(extraction)
+                        annonces_page = dedoublonnage.filtrer(annonces_page)
+                    elif annonces_page is None and not self.cache:
+                        # Parser le HTML et scraper les annonces inédites de cette page
+                        annonces_page = self.extraire_annonces(contenu, regles, dedoublonnage)
+                    else:
+                        if annonces_page is None:
+                            # Le cache garde les annonces de la page seule,
+                            # indépendamment des pages qui la précèdent
+                            page_seule = DedoublonnageCrawl()
+                            annonces_page = self.extraire_annonces(contenu, regles, page_seule)
+                            self.cache.enregistrer_annonces(page_url, annonces_page, version_regles)
+                            dedoublonnage.fusionner_page(page_seule)
+                        else:
+                            logging.info("Page inchangée depuis le dernier passage (cache)")
+                        annonces_page = dedoublonnage.filtrer(annonces_page)
+                    
+                    if dedoublonnage.repetitions_page:
+                        logging.info(f"  Annonces répétées ignorées: {dedoublonnage.repetitions_page}")
+                    
+                    if not annonces_page and not dedoublonnage.repetitions_page:
+                        logging.warning(f"Aucune annonce trouvée sur la page {page}")
+                        logging.info("Arrêt du scraping (page vide)")
+                        break
+                    
+                    if index_vus is not None:
+                        ids_page = {a['id_annonce'] for a in annonces_page if a.get('id_annonce') is not None}
+                        connus = {id_annonce for id_annonce in ids_page if index_vus.contient(id_annonce)}
+                        if callback_connues and connus:
+                            callback_connues([a for a in annonces_page if a.get('id_annonce') in connus])
+                        annonces_page = [
+                            a for a in annonces_page
+                            if a.get('id_annonce') is None or a['id_annonce'] not in connus
+                        ]
+                        
+                        part_connus = len(connus) / len(ids_page) if ids_page else 0.0
+                        logging.info(f"  Annonces déjà vues: {len(connus)}/{len(ids_page)} ({part_connus*100:.0f}%)")
+                        arret_incremental = part_connus >= seuil_connus
+                    
+                    total_annonces += len(annonces_page)
+                    pages_scrapees += 1
+                    
+                    logging.info(f"✓ Page {page} terminée: {len(annonces_page)} annonces collectées")
+                    logging.info(f"  Total cumulé: {total_annonces} annonces")
+                    
+                    if callback_page:
+                        callback_page(page, total_annonces)
+                    
+                    signaler(page, 'extraite', len(annonces_page))
+                    yield annonces_page
+                    
+                    if index_vus is not None:
+                        # L'appelant a traité la page : ses annonces sont vues
+                        index_vus.ajouter(ids_page)
+                        if sauvegarder_index:
+                            index_vus.sauvegarder()
+                    
+                    if arret_incremental:
+                        logging.info("Arrêt du scraping (page composée d'annonces déjà vues)")
+                        break
+                        
+                except requests.exceptions.RequestException as e:
+                    logging.error(f"Erreur HTTP lors de la requête: {str(e)}")
+                    signaler(page, 'echec')
+                    break
+                except Exception as e:
+                    logging.error(f"Erreur inattendue: {str(e)}")
+                    signaler(page, 'echec')
+                    break
+        finally:
+            # Abandonner les pages encore en attente après un arrêt
+            pages.close()
         
         logging.info(f"\n{'='*60}")
         logging.info(f"SCRAPING TERMINÉ")
-        logging.info(f"Pages scrapées: {page - 1}")
-        logging.info(f"Total annonces: {len(toutes_annonces)}")
+        logging.info(f"Pages scrapées: {pages_scrapees}")
+        logging.info(f"Total annonces: {total_annonces}")
+        logging.info(f"Répétitions ignorées: {dedoublonnage.repetitions}")
+        if pipeline:
+            for etage, stats_etage in pipeline.get_stats().items():
+                logging.info(f"Étage {etage}: {stats_etage['pages']} pages, "
+                             f"{stats_etage['pages_par_seconde']} pages/s, "
+                             f"{stats_etage['duree_active']}s actif, {stats_etage['attente']}s en attente")
+        stats_rythme = self.limiteurs.rythme(url).get_stats()
+        logging.info(f"Rythme: {stats_rythme['debit_courant']} req/s, "
+                     f"{stats_rythme['surcharges']} surcharges, {stats_rythme['reessais']} réessais, "
+                     f"{stats_rythme['abandons']} abandons, latence moyenne {stats_rythme['latence_moyenne']}s")
+        if self.cache:
+            stats = self.cache.get_stats()
+            logging.info(f"Cache HTTP: {stats['hits_304']} revalidations 304, "
+                         f"{stats['hits_empreinte']} pages inchangées, {stats['misses']} misses, "
+                         f"{stats['parses_evites']} parsings évités, "
+                         f"{stats['octets_economises']} octets économisés")
         logging.info(f"{'='*60}\n")
+    
+    def scraper_page(self, url: str, max_pages: int = 5, **options) -> List[Dict]:
+        """
+        Scrape plusieurs pages de CoinAfrique
         
+        Args:
+            url: URL de la catégorie à scraper
+            max_pages: Nombre maximum de pages à scraper
+            **options: Options de iter_annonces (concurrence, index_vus...)
+            
+        Returns:
+            Liste de dictionnaires contenant les données des annonces
+        """
+        toutes_annonces = []
+        for annonces_page in self.iter_annonces(url, max_pages, **options):
+            toutes_annonces.extend(annonces_page)
         return toutes_annonces
     
-    def scraper_toutes_categories(self, max_pages_par_categorie: int = 5) -> Dict[str, pd.DataFrame]:
+    def scraper_categorie(
+        self,
+        nom_categorie: str,
+        max_pages: int = 5,
+        concurrence: int = 1,
+        callback_progression: Optional[Callable[[str, int, int], None]] = None,
+        incremental: bool = False,
+        enrichir_details: bool = False,
+        workers_details: int = 4,
+        reprise: Optional[PointsReprise] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Scrape une catégorie et sauvegarde son fichier CSV
+        
+        Avec des points de reprise, un scraping interrompu de la catégorie
+        (arrêt du processus, erreur réseau) reprend à la page suivant la
+        dernière page écrite : le CSV est ramené à sa taille à ce moment-là
+        et complété, les annonces déjà émises restent dédoublonnées.
+        
+        Args:
+            nom_categorie: Clé de la catégorie dans CATEGORIES
+            max_pages: Nombre maximum de pages
+            concurrence: Nombre maximum de requêtes simultanées pour la catégorie
+            callback_progression: Appelé avec (catégorie, pages faites, max_pages)
+            incremental: Ne collecter que les annonces inédites (index des
+                annonces vues dans data/index) et les ajouter au fichier CSV
+            enrichir_details: Visiter la page de détail de chaque annonce
+                (description, date de publication, vendeur, images)
+            workers_details: Pages de détail téléchargées simultanément
+            reprise: Points de reprise partagés par les catégories
+            
+        Returns:
+            DataFrame de la catégorie (annonces inédites en mode incrémental),
+            ou None si aucune donnée
+        """
+        config = CATEGORIES[nom_categorie]
+        regles = self.moteur_regles(nom_categorie)
+        index_vus = IndexAnnoncesVues(f"data/index/{nom_categorie}_ids.bin") if incremental else None
+        
+        logging.info(f"\n\n{'#'*70}")
+        logging.info(f"# CATÉGORIE: {nom_categorie.upper().replace('_', ' ')}")
+        logging.info(f"{'#'*70}\n")
+        
+        callback_page = None
+        if callback_progression:
+            callback_page = lambda page, total: callback_progression(nom_categorie, page, max_pages)
+        
+        # Les annonces sont écrites page par page : une interruption laisse
+        # sur disque tout ce qui a déjà été collecté
+        fichier_csv = f"data/nettoye/{nom_categorie}_nettoye.csv"
+        colonnes = [config['type_col'], 'prix', 'adresse', 'image_lien']
+        if enrichir_details:
+            colonnes += CHAMPS_DETAIL
+        puits = PuitsCSV(
+            fichier_csv,
+            colonnes=colonnes,
+            renommage={'type': config['type_col']},
+            ajout=incremental
+        )
+        
+        puits_parquet = None
+        if self.entrepot:
+            # En incrémental, les annonces inédites s'ajoutent à celles du jour
+            puits_parquet = self.entrepot.puits(nom_categorie, remplacer=not incremental)
+        
+        # Reprise d'un scraping interrompu, ou nouveau point de départ
+        etat_reprise = reprise.etat_categorie(nom_categorie) if reprise else None
+        dedoublonnage = DedoublonnageCrawl()
+        premiere_page = 1
+        if etat_reprise:
+            premiere_page = etat_reprise['derniere_page'] + 1
+            dedoublonnage = DedoublonnageCrawl(etat_reprise['cles'])
+            if index_vus is not None:
+                # L'index sauvegardé peut être en retard sur le point de
+                # reprise : les annonces émises jusqu'à la dernière page
+                # écrite sont vues
+                index_vus.ajouter(cle for cle in etat_reprise['cles'] if isinstance(cle, int))
+            puits.tronquer(etat_reprise['octets_csv'])
+            puits.ajout = True
+            if puits_parquet:
+                puits_parquet.tronquer(etat_reprise['derniere_page'])
+            logging.info(f"Reprise à la page {premiere_page} "
+                         f"({etat_reprise['derniere_page']} pages déjà écrites)")
+        else:
+            if reprise:
+                if incremental:
+                    puits.ouvrir()
+                reprise.commencer(nom_categorie, puits.lignes_existantes)
+            if puits_parquet:
+                puits_parquet.commencer()
+        
+        suivi = {'page': 0, 'echec': False}
+        # Toutes les pages d'un scraping forment une seule observation dans
+        # l'historique des prix (une reprise poursuit celle du scraping interrompu)
+        date_observation = etat_reprise['date_debut'] if etat_reprise else time.time()
+        
+        def callback_connues(annonces_connues: List[Dict]):
+            # Les annonces déjà vues ne sont pas réécrites, mais leur
+            # observation (dernière vue, prix) est notée dans la base
+            self.base.upsert(nom_categorie, annonces_connues, date_observation=date_observation)
+        
+        def callback_etat(page: int, etat: str, nb_annonces: Optional[int]):
+            if etat == 'extraite':
+                suivi['page'] = page
+            elif etat == 'echec':
+                suivi['echec'] = True
+            if reprise:
+                reprise.marquer(nom_categorie, page, etat, nb_annonces)
+        
+        if reprise and index_vus is not None:
+            # L'index n'est sauvegardé qu'avec les points de reprise : après un
+            # arrêt brutal, il ne contient pas les pages qui seront re-collectées
+            reprise.au_enregistrement(nom_categorie, index_vus.sauvegarder)
+        
+        # Scraper la catégorie (par pages)
+        enrichisseur = EnrichisseurDetails(self, workers=workers_details) if enrichir_details else None
+        try:
+            for annonces_page in self.iter_annonces(
+                config['url'], max_pages, concurrence=concurrence,
+                callback_page=callback_page, index_vus=index_vus, regles=regles,
+                premiere_page=premiere_page, dedoublonnage=dedoublonnage,
+                callback_etat=callback_etat, callback_connues=callback_connues if self.base else None,
+                sauvegarder_index=reprise is None
+            ):
+                if enrichisseur:
+                    annonces_page = enrichisseur.enrichir(annonces_page)
+                puits.ecrire(annonces_page)
+                if puits_parquet:
+                    puits_parquet.ecrire(annonces_page, suivi['page'])
+                if self.base:
+                    self.base.upsert(nom_categorie, annonces_page, date_observation=date_observation)
+                if reprise:
+                    reprise.page_ecrite(
+                        nom_categorie, suivi['page'], len(annonces_page),
+                        puits.octets, dedoublonnage.extraire_nouvelles()
+                    )
+        except BaseException:
+            if reprise:
+                reprise.enregistrer()
+                reprise.au_enregistrement(nom_categorie, None)
+            raise
+        finally:
+            if enrichisseur:
+                enrichisseur.fermer()
+        
+        if reprise:
+            # Une catégorie arrêtée sur erreur reste à reprendre
+            if suivi['echec']:
+                reprise.enregistrer()
+            else:
+                reprise.terminer(nom_categorie)
+            reprise.au_enregistrement(nom_categorie, None)
+        
+        if os.path.exists(fichier_csv):
+            entree = manifeste.mettre_a_jour(nom_categorie, fichier_csv)
+            if self.base:
+                if not incremental and not suivi['echec']:
+                    # Scraping complet : les annonces qu'il n'a pas revues ont disparu
+                    self.base.retirer_absentes(nom_categorie, date_observation)
+                self.base.noter_source(nom_categorie, entree['octets'], entree['mtime'])
+        
+        if puits_parquet and not (reprise and suivi['echec']):
+            # Une catégorie à reprendre garde ses pages en préparation
+            chemin_parquet = puits_parquet.valider()
+            if chemin_parquet:
+                logging.info(f"Partition Parquet publiée: {chemin_parquet}")
+        
+        if callback_progression:
+            # La catégorie est terminée, même si elle s'est arrêtée avant max_pages
+            callback_progression(nom_categorie, max_pages, max_pages)
+        
+        lignes_ignorees = etat_reprise['lignes_debut'] if etat_reprise else None
+        if not puits.lignes_ecrites:
+            if etat_reprise:
+                logging.info(f"Aucune nouvelle annonce depuis la reprise de {nom_categorie}")
+                return puits.relire(lignes_ignorees)
+            logging.warning(f"Aucune donnée collectée pour {nom_categorie}")
+            return None
+        
+        logging.info(f"Fichier sauvegardé: {fichier_csv}")
+        logging.info(f"Statistiques:")
+        logging.info(f"  - Annonces totales: {puits.lignes_ecrites}")
+        logging.info(f"  - Colonnes: {', '.join(puits.colonnes)}")
+        
+        # Statistiques sur les données manquantes
+        total = puits.lignes_ecrites
+        logging.info(f"  - Prix disponibles: {puits.prix_disponibles}/{total} ({puits.prix_disponibles/total*100:.1f}%)")
+        logging.info(f"  - Adresses disponibles: {puits.adresses_disponibles}/{total} ({puits.adresses_disponibles/total*100:.1f}%)")
+        
+        logging.info(f"  - Règles d'extraction:")
+        for stats_regle in regles.get_stats():
+            if stats_regle['evaluations']:
+                logging.info(f"      {stats_regle['champ']}/{stats_regle['regle']}: "
+                             f"{stats_regle['taux_correspondance']*100:.0f}% "
+                             f"({stats_regle['correspondances']}/{stats_regle['evaluations']}), "
+                             f"{stats_regle['duree_ms']} ms")
+        
+        if enrichisseur:
+            stats_details = enrichisseur.get_stats()
+            logging.info(f"  - Pages de détail: {stats_details['pages_telechargees']} téléchargées "
+                         f"({stats_details['pages_par_seconde']} pages/s), "
+                         f"{stats_details['deja_enrichies']} déjà connues, {stats_details['echecs']} échecs")
+        
+        # DataFrame des annonces de ce passage (reprises comprises), relu depuis le fichier
+        df = puits.relire(lignes_ignorees)
+        return df
+    
+    def scraper_toutes_categories(
+        self,
+        max_pages_par_categorie: int = 5,
+        workers: int = 1,
+        concurrence: int = 1,
+        categories: Optional[List[str]] = None,
+        callback_progression: Optional[Callable[[str, int, int], None]] = None,
+        incremental: bool = False,
+        enrichir_details: bool = False,
+        reprise: Optional[PointsReprise] = None
+    ) -> Dict[str, pd.DataFrame]:
         """
         Scrape toutes les catégories définies dans le projet
         
+        Les catégories sont scrapées en parallèle sur `workers` threads. Toutes
+        les requêtes vers un même hôte passent par le même seau à jetons, donc
+        le débit total vers sn.coinafrique.com reste borné quel que soit le
+        nombre de catégories simultanées.
+        
         Args:
             max_pages_par_categorie: Nombre maximum de pages par catégorie
+            workers: Nombre de catégories scrapées simultanément
+            concurrence: Nombre maximum de requêtes simultanées par catégorie
+            categories: Clés de CATEGORIES à scraper (toutes par défaut)
+            callback_progression: Appelé avec (catégorie, pages faites, max_pages),
+                depuis les threads de travail
+            incremental: Ne collecter que les annonces inédites de chaque catégorie
+            enrichir_details: Compléter les annonces avec leur page de détail
+            reprise: Points de reprise (reprend les catégories interrompues)
             
         Returns:
             Dictionnaire avec les DataFrames de chaque catégorie
         """
-        # Définir les URLs des catégories
-        categories = {
-            'vetements_homme': {
-                'url': 'https://sn.coinafrique.com/categorie/vetements-homme',
-                'type_col': 'type_habits'
-            },
-            'chaussures_homme': {
-                'url': 'https://sn.coinafrique.com/categorie/chaussures-homme',
-                'type_col': 'type_chaussures'
-            },
-            'vetements_enfants': {
-                'url': 'https://sn.coinafrique.com/categorie/vetements-enfants',
-                'type_col': 'type_habits'
-            },
-            'chaussures_enfants': {
-                'url': 'https://sn.coinafrique.com/categorie/chaussures-enfants',
-                'type_col': 'type_chaussures'
-            }
-        }
-        
+        noms = list(categories) if categories else list(CATEGORIES)
         resultats = {}
         
-        for nom_categorie, config in categories.items():
-            logging.info(f"\n\n{'#'*70}")
-            logging.info(f"# CATÉGORIE: {nom_categorie.upper().replace('_', ' ')}")
-            logging.info(f"{'#'*70}\n")
-            
-            # Scraper la catégorie (par pages)
-            annonces = self.scraper_page(config['url'], max_pages_par_categorie)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                nom: pool.submit(
+                    self.scraper_categorie, nom, max_pages_par_categorie,
+                    concurrence, callback_progression, incremental, enrichir_details,
+                    reprise=reprise
+                )
+                for nom in noms
+            }
             
-            # Convertir en DataFrame
-            if annonces:
-                df = pd.DataFrame(annonces)
-                
-                # Renommer la colonne 'type' selon la catégorie
-                df.rename(columns={'type': config['type_col']}, inplace=True)
-                
-                # Réorganiser les colonnes dans l'ordre souhaité
-                colonnes = [config['type_col'], 'prix', 'adresse', 'image_lien']
-                df = df[colonnes]
-                
-                resultats[nom_categorie] = df
-                
-                # Sauvegarder dans un fichier CSV
-                import os
-                os.makedirs('data/nettoye', exist_ok=True)
-                fichier_csv = f"data/nettoye/{nom_categorie}_nettoye.csv"
-                df.to_csv(fichier_csv, index=False, encoding='utf-8-sig')
-                
-                logging.info(f"Fichier sauvegardé: {fichier_csv}")
-                logging.info(f"Statistiques:")
-                logging.info(f"  - Annonces totales: {len(df)}")
-                logging.info(f"  - Colonnes: {', '.join(df.columns)}")
-                
-                # Statistiques sur les données manquantes
-                prix_dispo = len(df[df['prix'] != 'Prix non disponible'])
-                adresse_dispo = len(df[df['adresse'] != 'Adresse non disponible'])
-                logging.info(f"  - Prix disponibles: {prix_dispo}/{len(df)} ({prix_dispo/len(df)*100:.1f}%)")
-                logging.info(f"  - Adresses disponibles: {adresse_dispo}/{len(df)} ({adresse_dispo/len(df)*100:.1f}%)")
-            else:
-                logging.warning(f"Aucune donnée collectée pour {nom_categorie}")
+            # Résultats dans l'ordre des catégories
+            for nom, future in futures.items():
+                try:
+                    df = future.result()
+                except Exception as e:
+                    logging.error(f"Erreur lors du scraping de {nom}: {str(e)}")
+                    continue
+                if df is not None:
+                    resultats[nom] = df
         
         return resultats
 
@@ -335,8 +1111,11 @@ def main():
     
     scraper = CoinAfriqueScraper()
     
-    # Scraper toutes les catégories (3 pages par catégorie)
-    resultats = scraper.scraper_toutes_categories(max_pages_par_categorie=3)
+    # Scraper toutes les catégories en parallèle (3 pages par catégorie)
+    resultats = scraper.scraper_toutes_categories(
+        max_pages_par_categorie=3,
+        workers=len(CATEGORIES)
+    )
     
     # Afficher un résumé
     print("\n" + "="*70)
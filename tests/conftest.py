@@ -0,0 +1,11 @@
+"""
+Configuration commune des tests
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import os
+import sys
+
+# Les modules du projet sont à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
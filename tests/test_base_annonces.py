@@ -0,0 +1,84 @@
+"""
+Tests de la base des annonces : retraits et historique des prix
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import pytest
+
+from base_annonces import BaseAnnonces
+
+JOUR = 86400.0
+# Lundi 5 janvier 2026, puis deux semaines plus tard
+LUNDI = 1767571200.0
+
+
+def annonce(id_annonce: int, prix: str, type_produit: str = 'Robe') -> dict:
+    return {
+        'id_annonce': id_annonce,
+        'type': type_produit,
+        'prix': prix,
+        'adresse': 'Dakar, Sénégal',
+        'image_lien': f'https://images.coinafrique.com/{id_annonce}.jpg'
+    }
+
+
+def scraping_complet(base: BaseAnnonces, annonces: list, date_observation: float):
+    """Observation d'un scraping complet, comme scraper_categorie"""
+    base.upsert('vetements', annonces, date_observation=date_observation)
+    base.retirer_absentes('vetements', date_observation)
+
+
+@pytest.fixture
+def base(tmp_path):
+    base = BaseAnnonces(str(tmp_path / 'annonces.sqlite'))
+    yield base
+    base.fermer()
+
+
+def test_changement_de_prix_garde_apres_retrait(base):
+    scraping_complet(base, [annonce(1, '10 000 CFA'), annonce(2, '5 000 CFA')], LUNDI)
+    scraping_complet(base, [annonce(1, '8 000 CFA'), annonce(2, '5 000 CFA')], LUNDI + 7 * JOUR)
+    # L'annonce 1 n'est plus en ligne au scraping suivant
+    scraping_complet(base, [annonce(2, '5 000 CFA')], LUNDI + 14 * JOUR)
+
+    trajectoire = base.trajectoire_prix('vetements', 1)
+    assert list(trajectoire['prix_num']) == [10000, 8000]
+
+    baisses = base.baisses_prix('vetements')
+    assert list(baisses['id_annonce']) == [1]
+    assert list(baisses['ancien_prix']) == [10000]
+    assert list(baisses['nouveau_prix']) == [8000]
+
+    durees = base.durees_en_ligne('vetements')
+    assert sorted(durees) == [7.0, 14.0]
+
+    medianes = base.mediane_hebdomadaire('vetements')
+    premiere_semaine = medianes[medianes['semaine'] == medianes['semaine'].min()]
+    assert list(premiere_semaine['annonces']) == [2]
+    assert list(premiere_semaine['mediane']) == [7500.0]
+
+    volume = base.volume_historique('vetements')
+    assert volume == {'annonces': 2, 'retirees': 1, 'changements': 3}
+
+
+def test_agregations_limitees_aux_annonces_actives(base):
+    scraping_complet(base, [annonce(1, '10 000 CFA'), annonce(2, '5 000 CFA')], LUNDI)
+    scraping_complet(base, [annonce(2, '5 000 CFA')], LUNDI + JOUR)
+
+    resume = base.resume_prix('vetements')
+    assert resume['annonces'] == 1
+    assert resume['moyenne'] == 5000
+    assert base.compter('vetements') == 1
+    assert list(base.lire('vetements')['prix']) == ['5 000 CFA']
+    assert base.get_stats()['annonces'] == 1
+
+
+def test_annonce_retiree_revue_redevient_active(base):
+    scraping_complet(base, [annonce(1, '10 000 CFA')], LUNDI)
+    scraping_complet(base, [annonce(2, '5 000 CFA')], LUNDI + JOUR)
+    assert base.compter('vetements') == 1
+
+    scraping_complet(base, [annonce(1, '9 000 CFA'), annonce(2, '5 000 CFA')], LUNDI + 2 * JOUR)
+    assert base.compter('vetements') == 2
+    assert list(base.trajectoire_prix('vetements', 1)['prix_num']) == [10000, 9000]
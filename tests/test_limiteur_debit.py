@@ -0,0 +1,77 @@
+"""
+Tests du rythme adaptatif : réessais et budget de l'hôte
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import pytest
+import requests
+
+from scraper_coinafrique import CoinAfriqueScraper
+
+URL = 'https://sn.coinafrique.com/categorie/vetements-homme'
+
+
+class SessionFactice:
+    """Session HTTP qui répond 429 aux `nb_refus` premières demandes de chaque page, puis 200"""
+
+    def __init__(self, nb_refus: int = 1):
+        self.nb_refus = nb_refus
+        self.demandes = {}
+
+    def get(self, url, timeout=None, headers=None):
+        self.demandes[url] = self.demandes.get(url, 0) + 1
+        response = requests.Response()
+        response.url = url
+        if self.demandes[url] <= self.nb_refus:
+            response.status_code = 429
+        else:
+            response.status_code = 200
+            response._content = b'<html></html>'
+        return response
+
+
+def scraper(session: SessionFactice, **options_rythme) -> CoinAfriqueScraper:
+    scraper = CoinAfriqueScraper(intervalle_min=0, options_rythme={'delai_base': 0.0, **options_rythme})
+    scraper.session = session
+    return scraper
+
+
+def test_reessai_apres_429():
+    session = SessionFactice(nb_refus=1)
+    s = scraper(session)
+
+    assert s._requete(URL).status_code == 200
+    stats = s.limiteurs.rythme(URL).get_stats()
+    assert session.demandes[URL] == 2
+    assert (stats['surcharges'], stats['reessais'], stats['succes']) == (1, 1, 1)
+
+
+def test_budget_recharge_par_les_succes():
+    # Chaque page essuie un 429 : sans recharge, le budget de 3 réessais
+    # serait épuisé à la quatrième page
+    session = SessionFactice(nb_refus=1)
+    s = scraper(session, budget_reessais=3, recharge_reessais=1.0)
+
+    for page in range(1, 21):
+        assert s._requete(f'{URL}?page={page}').status_code == 200
+    stats = s.limiteurs.rythme(URL).get_stats()
+    assert stats['reessais'] == 20
+    assert stats['abandons'] == 0
+
+
+def test_budget_epuise_par_des_echecs_consecutifs():
+    session = SessionFactice(nb_refus=2)
+    s = scraper(session, budget_reessais=3, recharge_reessais=0.5)
+
+    assert s._requete(f'{URL}?page=1').status_code == 200
+    # 1,5 jeton (3 - 2 réessais + 0,5 rendu par le succès) :
+    # le second 429 de la page 2 n'est pas réessayé
+    with pytest.raises(requests.exceptions.HTTPError):
+        s._requete(f'{URL}?page=2')
+    stats = s.limiteurs.rythme(URL).get_stats()
+    assert (stats['reessais'], stats['abandons'], stats['reessais_disponibles']) == (3, 1, 0)
+
+    # La page répond de nouveau : le succès rend un jeton de réessai
+    assert s._requete(f'{URL}?page=2').status_code == 200
+    assert s.limiteurs.rythme(URL).get_stats()['reessais_disponibles'] == 1
@@ -0,0 +1,125 @@
+"""
+Tests du nettoyage : moteurs apply et vectorisé, partitions parallèles
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import logging
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import nettoyage_donnees
+from benchmarks.bench_nettoyage import generer_export
+from nettoyage_donnees import NettoyeurDonnees
+
+MAPPING = {'type': 'Titre', 'prix': 'Prix', 'adresse': 'Localisation', 'image': 'Image'}
+ESPACES = ['', ' ', '  ', '\t', '\n', '\xa0', ' \xa0 ']
+VALEURS_LIBRES = [
+    None, np.nan, '', ' ', 0, 15000, 2500.0, '0', '007 CFA', '1.500 F', '15\xa0000 F CFA', '12\t000',
+    'Prix sur demande', 'PRIX SUR DEMANDE', 'Prix négociable', 'Appeler le vendeur', '٣٤ CFA',
+    'dakar ,  SENEGAL', 'Thiès,Sénégal', 'saint-louis , senegal', 'a,,b,', ',', 'ǆemal, ǳx',
+    '/img/1.jpg', '//cdn.example.com/2.jpg', 'http://a', '  /x.jpg ', 'ftp://c', 'Jo', 'T-shirt', 'Boubou brodé',
+]
+
+
+def export_melange(nb_lignes: int = 3000, graine: int = 7) -> pd.DataFrame:
+    """Export Web Scraper synthétique, abîmé : espaces, NaN, nombres, Unicode"""
+    rng = random.Random(graine)
+    df = generer_export(nb_lignes // 2, graine).astype(object)
+    lignes = df.to_dict('records')
+    while len(lignes) < nb_lignes:
+        modele = dict(rng.choice(lignes))
+        for colonne in MAPPING.values():
+            tirage = rng.random()
+            if tirage < 0.25:
+                modele[colonne] = rng.choice(VALEURS_LIBRES)
+            elif tirage < 0.5 and isinstance(modele[colonne], str):
+                modele[colonne] = rng.choice(ESPACES) + modele[colonne] + rng.choice(ESPACES)
+        lignes.append(modele)
+    return pd.DataFrame(lignes)
+
+
+def nettoyage_reference(df: pd.DataFrame, categorie: str):
+    """nettoyer_dataframe d'origine : fonctions scalaires ligne par ligne, colonnes objet"""
+    col_type = 'type_habits' if categorie == 'vetements' else 'type_chaussures'
+    resultat = pd.DataFrame({
+        col_type: df[MAPPING['type']].apply(NettoyeurDonnees.nettoyer_texte).astype(object),
+        'prix': df[MAPPING['prix']].apply(NettoyeurDonnees.nettoyer_prix).astype(object),
+        'adresse': df[MAPPING['adresse']].apply(NettoyeurDonnees.nettoyer_adresse).astype(object),
+        'image_lien': df[MAPPING['image']].apply(NettoyeurDonnees.nettoyer_image_lien).astype(object),
+    })
+    avant_doublons = len(resultat)
+    resultat = resultat.drop_duplicates()
+    doublons = avant_doublons - len(resultat)
+    avant_invalides = len(resultat)
+    resultat = resultat[(resultat[col_type].str.len() > 3) & (resultat[col_type] != "Non disponible")]
+    stats = {
+        'lignes_initiales': len(df),
+        'doublons_supprimes': doublons,
+        'lignes_invalides': avant_invalides - len(resultat),
+        'lignes_finales': len(resultat)
+    }
+    return resultat.reset_index(drop=True), stats
+
+
+@pytest.fixture(scope='module')
+def export():
+    logging.disable(logging.INFO)
+    yield export_melange()
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize('moteur, workers', [('apply', 1), ('vectorise', 1), ('vectorise', 2), ('apply', 2)])
+def test_nettoyage_identique_a_la_reference(export, monkeypatch, moteur, workers):
+    # Partitions assez petites pour que 3 000 lignes passent par le pool de processus
+    monkeypatch.setattr(nettoyage_donnees, 'LIGNES_MIN_PARTITION', 500)
+    reference, stats_reference = nettoyage_reference(export, 'vetements')
+
+    nettoyeur = NettoyeurDonnees()
+    resultat = nettoyeur.nettoyer_dataframe(export, 'vetements', dict(MAPPING), moteur=moteur, workers=workers)
+
+    assert stats_reference['doublons_supprimes'] > 0 and stats_reference['lignes_invalides'] > 0
+    pd.testing.assert_frame_equal(resultat.astype(object), reference)
+    assert nettoyeur.get_stats() == stats_reference
+    for colonne in ('type_habits', 'prix', 'adresse'):
+        assert isinstance(resultat[colonne].dtype, pd.CategoricalDtype)
+        assert set(resultat[colonne].cat.categories) == set(reference[colonne])
+
+
+def test_moteurs_identiques_par_colonne(export):
+    # Avant dédoublonnage : chaque valeur, y compris des lignes retirées ensuite
+    for fonction, colonne_vectorisee, colonne in [
+        (NettoyeurDonnees.nettoyer_texte, NettoyeurDonnees.nettoyer_texte_colonne, 'Titre'),
+        (NettoyeurDonnees.nettoyer_prix, NettoyeurDonnees.nettoyer_prix_colonne, 'Prix'),
+        (NettoyeurDonnees.nettoyer_adresse, NettoyeurDonnees.nettoyer_adresse_colonne, 'Localisation'),
+        (NettoyeurDonnees.nettoyer_image_lien, NettoyeurDonnees.nettoyer_image_lien_colonne, 'Image'),
+    ]:
+        attendu = export[colonne].apply(fonction).astype(object)
+        obtenu = colonne_vectorisee(export[colonne]).astype(object)
+        pd.testing.assert_series_equal(obtenu, attendu, obj=fonction.__name__)
+
+
+@pytest.mark.parametrize('fonction, valeur, attendu', [
+    ('nettoyer_prix', '15 000 F CFA', '15000 CFA'),
+    ('nettoyer_prix', '12\xa0000 CFA', '12000 CFA'),
+    ('nettoyer_prix', 15000, '15000 CFA'),
+    ('nettoyer_prix', 'Prix négociable', 'Prix sur demande'),
+    ('nettoyer_prix', np.nan, 'Prix sur demande'),
+    ('nettoyer_texte', '  T-shirt   Nike\n', 'T-shirt Nike'),
+    ('nettoyer_texte', '\tJean\xa0Levis ', 'Jean Levis'),
+    ('nettoyer_texte', None, ''),
+    ('nettoyer_adresse', 'dakar ,  SENEGAL', 'Dakar, Sénégal'),
+    ('nettoyer_adresse', ' pikine , senegal', 'Pikine, Sénégal'),
+    ('nettoyer_adresse', 'rufisque', 'rufisque'),
+    ('nettoyer_adresse', None, 'Adresse non disponible'),
+    ('nettoyer_image_lien', '/img/1.jpg', 'https://sn.coinafrique.com/img/1.jpg'),
+    ('nettoyer_image_lien', '//cdn.example.com/3.jpg', 'https://cdn.example.com/3.jpg'),
+    ('nettoyer_image_lien', None, ''),
+])
+def test_valeurs_nettoyees(fonction, valeur, attendu):
+    assert getattr(NettoyeurDonnees, fonction)(valeur) == attendu
+    colonne = pd.Series([valeur, valeur], dtype=object)
+    assert list(getattr(NettoyeurDonnees, f'{fonction}_colonne')(colonne).astype(object)) == [attendu, attendu]
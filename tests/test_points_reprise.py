@@ -0,0 +1,109 @@
+"""
+Tests de la reprise d'un scraping interrompu
+Auteur: Eudoxie - DIT Master AI
+Date: Janvier 2026
+"""
+
+import multiprocessing
+import os
+
+import pytest
+import requests
+
+import scraper_coinafrique
+from benchmarks.generateur_pages import generer_page
+from points_reprise import PointsReprise
+from scraper_coinafrique import CoinAfriqueScraper
+
+CATEGORIE = 'test_reprise'
+NB_PAGES = 10
+TAILLE_LOT = 3
+# Pages écrites après le dernier point de reprise au moment de l'arrêt
+PAGES_PERDUES = 2
+
+PAGES = {
+    numero: generer_page(20, graine=numero, premier_id=5_000_000 + numero * 100).encode('utf-8')
+    for numero in range(1, NB_PAGES + 1)
+}
+
+
+class SessionFactice:
+    """Session HTTP servant les pages synthétiques ; peut tuer le processus"""
+
+    def __init__(self, page_arret: int = None):
+        self.page_arret = page_arret
+        self.pages_demandees = []
+
+    def get(self, url, timeout=None, headers=None):
+        numero = int(url.split('page=')[1]) if 'page=' in url else 1
+        if numero == self.page_arret:
+            # Arrêt brutal : ni exception, ni enregistrement du lot en attente
+            os._exit(1)
+        self.pages_demandees.append(numero)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = PAGES[numero]
+        return response
+
+
+def scraper(session: SessionFactice) -> CoinAfriqueScraper:
+    scraper = CoinAfriqueScraper(intervalle_min=0)
+    scraper.session = session
+    return scraper
+
+
+def points_reprise() -> PointsReprise:
+    return PointsReprise('data/cache/reprise.sqlite', taille_lot=TAILLE_LOT, delai_max=3600)
+
+
+def scraping_interrompu(incremental: bool):
+    scraper(SessionFactice(page_arret=TAILLE_LOT + PAGES_PERDUES + 1)).scraper_categorie(
+        CATEGORIE, NB_PAGES, incremental=incremental, reprise=points_reprise()
+    )
+
+
+@pytest.fixture
+def dossier(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(scraper_coinafrique.CATEGORIES, CATEGORIE, {
+        'nom': 'Test reprise', 'url': 'https://sn.coinafrique.com/categorie/test', 'type_col': 'type_test'
+    })
+    return tmp_path
+
+
+def lire_csv() -> bytes:
+    with open(f'data/nettoye/{CATEGORIE}_nettoye.csv', 'rb') as f:
+        return f.read()
+
+
+def effacer_sorties():
+    for chemin in (f'data/nettoye/{CATEGORIE}_nettoye.csv', f'data/index/{CATEGORIE}_ids.bin'):
+        if os.path.exists(chemin):
+            os.remove(chemin)
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_reprise_apres_arret_brutal(dossier, incremental):
+    # Référence : le même scraping sans interruption
+    scraper(SessionFactice()).scraper_categorie(CATEGORIE, NB_PAGES, incremental=incremental)
+    reference = lire_csv()
+    effacer_sorties()
+
+    processus = multiprocessing.get_context('fork').Process(target=scraping_interrompu, args=(incremental,))
+    processus.start()
+    processus.join()
+    assert processus.exitcode == 1
+
+    reprise = points_reprise()
+    etat = reprise.etat_categorie(CATEGORIE)
+    assert etat['derniere_page'] == TAILLE_LOT
+
+    session = SessionFactice()
+    scraper(session).scraper_categorie(CATEGORIE, NB_PAGES, incremental=incremental, reprise=reprise)
+    reprise.fermer()
+
+    # Les pages du point de reprise ne sont pas re-téléchargées, les pages
+    # perdues le sont et aucune ligne n'est perdue ni dupliquée
+    assert session.pages_demandees == list(range(TAILLE_LOT + 1, NB_PAGES + 1))
+    assert lire_csv() == reference